@@ -12,7 +12,10 @@ from ..config import (
     is_production,
 )
 from ..context import Context
+from ..packages.aide_server.src.aide_server.act_pools import blocking
 from ..packages.aide_server.src.aide_server.helpers import (
+    BlockingPublishProgressFn,
+    BlockingPublishResultFn,
     construct_and_publish,
     PublishProgressFn,
     PublishResultFn,
@@ -38,10 +41,12 @@ async def products_today(
     )
 
 
-async def _construct_raw_result(
+# the client of httpx is sync
+@blocking
+def _construct_raw_result(
     task: Task,
-    publish_progress: PublishProgressFn,
-    publish_result: PublishResultFn,
+    publish_progress: BlockingPublishProgressFn,
+    publish_result: BlockingPublishResultFn,
     start_progress: NonNegativeFloat,
     stop_progress: NonNegativeFloat,
 ):
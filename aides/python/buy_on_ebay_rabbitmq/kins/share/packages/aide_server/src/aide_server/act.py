@@ -1,7 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from .act_pools import ActExecutor
+from .admission import ActAdmission
+from .concurrency import ActConcurrency
 from .helpers import unwrap_multilang_text, unwrap_multilang_text_list
+from .progress_throttle import ActProgress
+from .result_cache import ActCache
 
 
 class Act(BaseModel):
@@ -13,7 +18,13 @@ class Act(BaseModel):
 
     @property
     def paths(self):
-        return [self.path, self.path_request_progress, self.path_request_result]
+        return [
+            self.path,
+            self.path_request_progress,
+            self.path_request_result,
+            self.path_events,
+            self.path_batch,
+        ]
 
     # CALL ACT or TASK (send task to Brain)
     @property
@@ -135,12 +146,114 @@ class Act(BaseModel):
     def tags_response_result(self):
         return self.tags + [{"en": "result"}, {"en": "response"}]
 
+    # EVENTS (stream of progress and result from appearance)
+    @property
+    def path_events(self):
+        return f"{self.path}/events/" "{uid_task}"
+
+    @property
+    def name_events(self):
+        return {"en": f"Events for {self.name['en']}"}
+
+    @property
+    def summary_events(self):
+        return {"en": f"Stream of progress and result for {self.name['en']}."}
+
+    @property
+    def description_events(self):
+        return {
+            "en": f"Server-Sent Events with progress for {self.name['en']}."
+            " The stream ends with the result."
+        }
+
+    @property
+    def tags_events(self):
+        return self.tags + [{"en": "progress"}, {"en": "result"}, {"en": "events"}]
+
+    # BATCH (send many tasks to Brain)
+    @property
+    def path_batch(self):
+        return f"{self.path}/batch"
+
+    @property
+    def name_batch(self):
+        return {"en": f"Batch for {self.name['en']}"}
+
+    @property
+    def summary_batch(self):
+        return {"en": f"Call {self.name['en']} for many contexts."}
+
+    @property
+    def description_batch(self):
+        return {
+            "en": f"Call {self.name['en']} once per context override."
+            " Returns the UIDs of tasks and the UID of batch."
+        }
+
+    @property
+    def tags_batch(self):
+        return self.tags + [{"en": "batch"}]
+
+    # BATCH PROGRESS (aggregate progress from appearance memory)
+    @property
+    def path_batch_progress(self):
+        return f"{self.path}/batch/" "{uid_batch}"
+
+    @property
+    def name_batch_progress(self):
+        return {"en": f"Batch progress for {self.name['en']}"}
+
+    @property
+    def summary_batch_progress(self):
+        return {"en": f"Progress of batch for {self.name['en']}."}
+
+    @property
+    def description_batch_progress(self):
+        return {
+            "en": f"Average progress in percentage of batch for {self.name['en']}."
+            " Range: [0.0; 100.0]."
+        }
+
+    @property
+    def tags_batch_progress(self):
+        return self.tags + [{"en": "batch"}, {"en": "progress"}]
+
     version: str = Field(
         default="0.1.0",
         title="Version",
         description="Version of act aide.",
     )
 
+    cache: Optional[ActCache] = Field(
+        default=None,
+        title="Cache",
+        description="Cache the results for equal contexts. Only for deterministic acts.",
+    )
+
+    admission: Optional[ActAdmission] = Field(
+        default=None,
+        title="Admission",
+        description="Reject the tasks while Brain can't keep up with them.",
+    )
+
+    concurrency: Optional[ActConcurrency] = Field(
+        default=None,
+        title="Concurrency",
+        description="The limits of running tasks on one Brain. Without limits when `None`.",
+    )
+
+    executor: Optional[ActExecutor] = Field(
+        default=None,
+        title="Executor",
+        description="The pools for the blocking stages of act, see `blocking()`.",
+    )
+
+    progress: Optional[ActProgress] = Field(
+        default=None,
+        title="Progress",
+        description="How often the progress of act is published.",
+    )
+
     def brief_unwrapped_multilang_texts(self, lang: str) -> Dict[str, Any]:
         u = self.unwrapped_multilang_texts(lang)
         r: Dict[str, Any] = {}
@@ -0,0 +1,144 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import functools
+from pydantic import BaseModel, Field, PositiveInt
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .log import logger
+
+
+class ActExecutor(BaseModel):
+    """
+    The pools for the blocking stages of act, see `blocking()`.
+    """
+
+    max_threads: PositiveInt = Field(
+        default=4,
+        title="Max Threads",
+        description="The size of thread pool for the blocking stages.",
+    )
+
+    max_processes: PositiveInt = Field(
+        default=1,
+        title="Max Processes",
+        description="The size of process pool for the CPU-bound stages.",
+    )
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def blocking(fn: Optional[F] = None, *, cpu_bound: bool = False):
+    """
+    Declares a sync run or construct stage which blocks: `construct_and_publish`
+    and Brain call it on the thread pool of act, or on the process pool when
+    `cpu_bound`. A CPU-bound stage should be declared on the module level.
+    A run can't be CPU-bound: a process can't publish its result.
+
+        @blocking
+        def _construct_raw_result(task, publish_progress, ...):
+            ...
+    """
+
+    def mark(fn: F) -> F:
+        fn.__aide_blocking__ = "process" if cpu_bound else "thread"  # type: ignore[attr-defined]
+        return fn
+
+    return mark(fn) if fn is not None else mark
+
+
+def is_blocking(fn: Callable[..., Any]) -> bool:
+    return hasattr(fn, "__aide_blocking__")
+
+
+def is_cpu_bound(fn: Callable[..., Any]) -> bool:
+    return getattr(fn, "__aide_blocking__", None) == "process"
+
+
+# The publishers for a blocking `fn`, see `BlockingPublishProgressFn` and
+# `BlockingPublishResultFn`: they block the worker thread until the publish
+# is done on `loop`. A process can't reach the loop, the CPU-bound stages
+# don't publish.
+def blocking_publishers(
+    fn: Callable[..., Any],
+    loop: asyncio.AbstractEventLoop,
+    *publishers: Callable[..., Awaitable[Any]],
+) -> List[Callable[..., Any]]:
+    if is_cpu_bound(fn):
+        return [_skip_publish for _ in publishers]
+
+    def threadsafe(publish: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+        def publish_from_thread(*args: Any) -> Any:
+            return asyncio.run_coroutine_threadsafe(publish(*args), loop).result()
+
+        return publish_from_thread
+
+    return [threadsafe(publish) for publish in publishers]
+
+
+def _skip_publish(*args: Any) -> None:
+    return None
+
+
+class ActPools:
+    """
+    A thread pool and a process pool per act, created on first use.
+    The blocking stages of one act don't take the workers of other act
+    and never freeze the loop of Brain.
+    """
+
+    def __init__(self):
+        self.name = type(self).__name__
+
+        self._settings: Dict[str, ActExecutor] = {}
+        self._threads: Dict[str, ThreadPoolExecutor] = {}
+        self._processes: Dict[str, ProcessPoolExecutor] = {}
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of pools. Set by class.",
+    )
+
+    def configure(self, acts: List[Any]):
+        for act in acts:
+            if act.executor:
+                self._settings[act.hid] = act.executor
+
+    def executor(self, hid_act: str, cpu_bound: bool = False) -> Executor:
+        settings = self._settings.get(hid_act) or ActExecutor()
+        if cpu_bound:
+            pool = self._processes.get(hid_act)
+            if pool is None:
+                pool = self._processes[hid_act] = ProcessPoolExecutor(
+                    max_workers=settings.max_processes
+                )
+            return pool
+
+        pool = self._threads.get(hid_act)
+        if pool is None:
+            pool = self._threads[hid_act] = ThreadPoolExecutor(
+                max_workers=settings.max_threads,
+                thread_name_prefix=f"act-{hid_act}",
+            )
+        return pool
+
+    async def run(self, hid_act: str, fn: Callable[..., Any], *args: Any) -> Any:
+        executor = self.executor(hid_act, cpu_bound=is_cpu_bound(fn))
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(executor, functools.partial(fn, *args))
+
+    def shutdown(self):
+        logger.info(f"🏁 Shutting down `{self.name}`...")
+        for pool in [*self._threads.values(), *self._processes.values()]:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._threads.clear()
+        self._processes.clear()
+
+    def __str__(self):
+        return self.name
+
+
+# shared by `construct_and_publish()` and Brain, configured by Brain
+act_pools = ActPools()
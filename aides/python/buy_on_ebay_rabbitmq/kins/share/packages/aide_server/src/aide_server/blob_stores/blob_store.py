@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+from pydantic import Field
+from typing import Iterator, List, Tuple
+
+
+class BlobStore(ABC):
+    """
+    Content-addressed storage of bytes: the ref of blob is the hash of its
+    content, so the equal blobs are stored once.
+    """
+
+    def __init__(self):
+        self.name = type(self).__name__
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """
+        Returns the ref of `data`. Doesn't write a present blob again,
+        only touches it.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, ref: str) -> bytes:
+        """
+        Raises `KeyError` when the blob is absent.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, ref: str) -> None:
+        """
+        Raises `KeyError` when the blob is absent.
+        """
+        pass
+
+    # (ref, touched_at) of every blob, for the retention of `ClaimCheck`
+    def scan(self) -> Iterator[Tuple[str, float]]:
+        raise NotImplementedError(f"`{self.name}` can't scan the blobs.")
+
+    # Releases the resources of store: handles, connections, etc.
+    def close(self) -> None:
+        pass
+
+    # The async contract for callers that live on the event loop, see
+    # the same for `MemoBroker`.
+
+    async def aput(self, data: bytes) -> str:
+        return await asyncio.to_thread(self.put, data)
+
+    async def aget(self, ref: str) -> bytes:
+        return await asyncio.to_thread(self.get, ref)
+
+    async def adelete(self, ref: str) -> None:
+        return await asyncio.to_thread(self.delete, ref)
+
+    async def ascan(self) -> List[Tuple[str, float]]:
+        return await asyncio.to_thread(lambda: list(self.scan()))
+
+    async def aclose(self) -> None:
+        return await asyncio.to_thread(self.close)
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name for blob store. Set by class.",
+    )
+
+    def __str__(self):
+        return self.name
+
+
+def blob_ref(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
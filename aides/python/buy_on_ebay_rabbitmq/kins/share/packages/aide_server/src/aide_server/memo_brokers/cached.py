@@ -0,0 +1,272 @@
+import asyncio
+from collections import OrderedDict
+import json
+from pydantic import Field, NonNegativeFloat, PositiveInt
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..log import logger
+from ..memo_brokers.memo_broker import MemoBroker
+
+
+class CachedMemoBroker(MemoBroker):
+    """
+    LRU cache in front of other broker.
+    Writes go through to the `broker` and replace the cached value.
+    An entry lives `ttl` seconds or the time from `ttls` for the first
+    suffix matching its key. TTL 0 means the key is never cached.
+    A value read from `broker` isn't cached when the key was written
+    during the read: the read can return the value before the write.
+    An async miss or write of a cached key goes to a thread: the size
+    of its value is measured by JSON.
+    """
+
+    def __init__(
+        self,
+        broker: MemoBroker,
+        max_entries: PositiveInt = 1024,
+        max_bytes: PositiveInt = 64 * 1024 * 1024,
+        ttl: NonNegativeFloat = 60.0,
+        ttls: Optional[Dict[str, NonNegativeFloat]] = None,
+    ):
+        super().__init__()
+
+        self.broker = broker
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = ttls or {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key: (value, size, expires_at)
+        self._entries: OrderedDict[str, Tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # the count of writes, see `_remember()`
+        self._stamp = 0
+        # key: stamp of its last write, the latest `max_entries` writes
+        self._written: OrderedDict[str, int] = OrderedDict()
+        # the newest stamp dropped from `_written`
+        self._forgotten_stamp = 0
+
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` for `{self.broker}`"
+            f" with {self.max_entries} entries and {self.max_bytes} bytes."
+        )
+
+    broker: MemoBroker = Field(
+        ...,
+        title="Memo Broker",
+        description="The cached broker.",
+    )
+
+    max_entries: PositiveInt = Field(
+        default=1024,
+        title="Max Entries",
+        description="The count of cached keys.",
+    )
+
+    max_bytes: PositiveInt = Field(
+        default=64 * 1024 * 1024,
+        title="Max Bytes",
+        description="The size of cached values, in bytes of JSON.",
+    )
+
+    ttl: NonNegativeFloat = Field(
+        default=60.0,
+        title="TTL",
+        description="Time to live for a cached value, in seconds.",
+    )
+
+    ttls: Dict[str, NonNegativeFloat] = Field(
+        default={},
+        title="TTLs",
+        description="Time to live for the keys with suffix, in seconds. For example, `{'.response_progress': 1.0}`.",
+    )
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def get(self, key: str) -> Any:
+        found, value = self._cached(key)
+        if found:
+            return value
+
+        return self._load(key, read_at=self._read_stamp())
+
+    def put(self, key: str, value: Any):
+        self.broker.put(key, value)
+        self._remember(key, value)
+
+    def delete(self, key: str):
+        self._forget(key)
+        self.broker.delete(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        r: Dict[str, Any] = {}
+        absent = []
+        for key in keys:
+            found, value = self._cached(key)
+            if found:
+                r[key] = value
+            else:
+                absent.append(key)
+
+        if absent:
+            read_at = self._read_stamp()
+            loaded = self.broker.get_many(absent)
+            for key, value in loaded.items():
+                self._remember(key, value, read_at=read_at)
+            r.update(loaded)
+
+        return r
+
+    def put_many(self, values: Dict[str, Any]):
+        self.broker.put_many(values)
+        for key, value in values.items():
+            self._remember(key, value)
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        return self.broker.scan()
+
+    def close(self):
+        logger.info(f"`{self.name}` stats: {self.stats}")
+        self.broker.close()
+
+    # A hit doesn't need a thread.
+    async def aget(self, key: str) -> Any:
+        found, value = self._cached(key)
+        if found:
+            return value
+
+        if self._ttl(key) <= 0:
+            return await self.broker.aget(key)
+
+        return await asyncio.to_thread(self._load, key, self._read_stamp())
+
+    async def aput(self, key: str, value: Any):
+        if self._ttl(key) <= 0:
+            await self.broker.aput(key, value)
+            self._remember(key, value)
+            return
+
+        await asyncio.to_thread(self.put, key, value)
+
+    async def adelete(self, key: str):
+        self._forget(key)
+        await self.broker.adelete(key)
+
+    async def astart(self):
+        await self.broker.astart()
+
+    async def aclose(self):
+        logger.info(f"`{self.name}` stats: {self.stats}")
+        await self.broker.aclose()
+
+    def _load(self, key: str, read_at: int) -> Any:
+        value = self.broker.get(key)
+        self._remember(key, value, read_at=read_at)
+
+        return value
+
+    def _ttl(self, key: str) -> float:
+        for suffix, ttl in self.ttls.items():
+            if key.endswith(suffix):
+                return ttl
+
+        return self.ttl
+
+    def _cached(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return True, entry[0]
+
+    def _read_stamp(self) -> int:
+        with self._lock:
+            return self._stamp
+
+    # The value is written now when `read_at` is None, otherwise it's
+    # read from `broker` since the stamp `read_at`.
+    def _remember(self, key: str, value: Any, read_at: Optional[int] = None):
+        ttl = self._ttl(key)
+        size = _size(value) if ttl > 0 else None
+        with self._lock:
+            if read_at is None:
+                self._stamp_write(key)
+            elif self._written_since(key, read_at):
+                # can be older than the cached value
+                return
+
+            if key in self._entries:
+                self._drop(key)
+
+            if ttl <= 0 or size is None or size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self._bytes += size
+
+            while (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._stamp_write(key)
+            if key in self._entries:
+                self._drop(key)
+
+    # call under lock
+    def _stamp_write(self, key: str):
+        self._stamp += 1
+        self._written.pop(key, None)
+        self._written[key] = self._stamp
+        while len(self._written) > self.max_entries:
+            _, self._forgotten_stamp = self._written.popitem(last=False)
+
+    # call under lock
+    def _written_since(self, key: str, stamp: int) -> bool:
+        # a forgotten write can be of this key
+        return self._written.get(key, 0) > stamp or self._forgotten_stamp > stamp
+
+    # call under lock
+    def _drop(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __str__(self):
+        return f"{self.name} : {self.broker}"
+
+
+def _size(value: Any) -> Optional[int]:
+    try:
+        return len(json.dumps(value))
+    except (TypeError, ValueError):
+        return None
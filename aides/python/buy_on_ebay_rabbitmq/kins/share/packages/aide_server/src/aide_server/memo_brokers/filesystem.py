@@ -1,25 +1,51 @@
-import json
+import asyncio
+import hashlib
 import os
-from pydantic import Field
+from pydantic import Field, NonNegativeInt, PositiveInt
 from sanitize_filename import sanitize
 import shutil
-from typing import Any
+import threading
+from typing import Any, Iterator, List, Optional, Set, Tuple
 
 from ..log import logger
+from ..memo_brokers.codecs import Codec, default_codec, unpack
 from ..memo_brokers.memo_broker import MemoBroker
 
 
 class FilesystemMemoBroker(MemoBroker):
+    """
+    One JSON file per key.
+
+    With `shard_levels` the files are spread over the subdirectories named by
+    the hash of key: `ab/cd/{key}.json` for 2 levels of width 2. The files
+    left in the flat layout are still readable and are moved into the shards
+    in background when the broker starts, see `reshard()`.
+
+    The values are written by `codec`, a file keeps the tag of its codec,
+    so the files of other codec are still readable.
+    """
+
     def __init__(
         self,
         path_prefix: str,
         clear: bool = False,
+        shard_levels: NonNegativeInt = 0,
+        shard_width: PositiveInt = 2,
+        codec: Optional[Codec] = None,
     ):
         assert path_prefix
+        assert 0 <= shard_levels <= 3
+        assert shard_width > 0
 
         super().__init__(clear=clear)
 
         self.path_prefix = path_prefix
+        self.shard_levels = shard_levels
+        self.shard_width = shard_width
+        self.codec = codec or default_codec()
+
+        self._known_dirs: Set[str] = set()
+        self._resharding: Optional[asyncio.Task] = None
 
         if clear and os.path.exists(self.path_prefix):
             logger.info(f"🔥 Purging the storage `{self}`...")
@@ -28,7 +54,10 @@ class FilesystemMemoBroker(MemoBroker):
 
         os.makedirs(self.path_prefix, exist_ok=True)
 
-        logger.info(f"🏳️‍🌈 Initialized `{self.name}` with path `{self.path_prefix}`.")
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` with path `{self.path_prefix}`"
+            f" and codec `{self.codec}`."
+        )
 
     path_prefix: str = Field(
         ...,
@@ -36,19 +65,155 @@ class FilesystemMemoBroker(MemoBroker):
         description="The path to storage into a filesystem.",
     )
 
+    shard_levels: NonNegativeInt = Field(
+        default=0,
+        title="Shard Levels",
+        description="The count of levels of hash-prefix subdirectories. The flat layout when 0.",
+    )
+
+    shard_width: PositiveInt = Field(
+        default=2,
+        title="Shard Width",
+        description="The count of hex chars of hash for a name of subdirectory.",
+    )
+
+    codec: Codec = Field(
+        ...,
+        title="Codec",
+        description="The serializer of values. The fastest JSON by default.",
+    )
+
     def path(self, filename: str):
+        withoutExt = os.path.join(self.path_prefix, *self._shards(filename), filename)
+        return f"{withoutExt}.json"
+
+    def flat_path(self, filename: str):
         withoutExt = os.path.join(self.path_prefix, filename)
         return f"{withoutExt}.json"
 
     def get(self, key: str) -> Any:
         filename = sanitize(key)
-        with open(self.path(filename), "r") as file:
-            return json.loads(file.read())
+        for path in self._paths(filename):
+            try:
+                with open(path, "rb") as file:
+                    return unpack(file.read())
+            except FileNotFoundError:
+                pass
+
+        raise KeyError(key)
 
     def put(self, key: str, value: Any):
         filename = sanitize(key)
-        with open(self.path(filename), "w") as file:
-            json.dump(value, file)
+        path = self.path(filename)
+        self._ensure_dir(os.path.dirname(path))
+        # write to a temporary file and swap it, so a reader from other
+        # thread never sees a half-written value
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = self.codec.pack(value)
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def delete(self, key: str):
+        filename = sanitize(key)
+        deleted = False
+        for path in self._paths(filename):
+            try:
+                os.remove(path)
+                deleted = True
+            except FileNotFoundError:
+                pass
+
+        if not deleted:
+            raise KeyError(key)
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # deleted or resharded meanwhile
+                continue
+            yield os.path.basename(path)[: -len(".json")], stat.st_mtime, stat.st_size
+
+    def reshard(self) -> int:
+        """
+        Moves the files to the paths of current layout. Safe to run while
+        the broker serves: a file written by `put()` into the new path
+        is never overwritten by an old one.
+        Returns a count of moved files.
+        """
+        logger.info(f"🔀 Resharding the storage `{self}`...")
+
+        n = 0
+        for old_path in self._files():
+            filename = os.path.basename(old_path)[: -len(".json")]
+            new_path = self.path(filename)
+            if old_path == new_path:
+                continue
+
+            self._ensure_dir(os.path.dirname(new_path))
+            try:
+                # doesn't replace an existing file unlike `os.replace()`
+                os.link(old_path, new_path)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                continue
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                # deleted meanwhile
+                pass
+            n += 1
+
+        logger.info(f"🔀 Resharded the storage `{self}`: moved {n} file(s).")
+
+        return n
+
+    async def astart(self):
+        if self.shard_levels and self._has_flat_files():
+            self._resharding = asyncio.get_running_loop().create_task(
+                asyncio.to_thread(self.reshard)
+            )
+
+    async def aclose(self):
+        if self._resharding is not None and not self._resharding.done():
+            # the thread can't be interrupted, let it finish
+            await self._resharding
+
+        await super().aclose()
+
+    def _shards(self, filename: str) -> List[str]:
+        if not self.shard_levels:
+            return []
+
+        h = hashlib.sha1(filename.encode("utf-8")).hexdigest()
+        w = self.shard_width
+        return [h[i * w : (i + 1) * w] for i in range(self.shard_levels)]
+
+    # The current path first, then the path of flat layout.
+    def _paths(self, filename: str) -> List[str]:
+        path = self.path(filename)
+        flat_path = self.flat_path(filename)
+        return [path] if path == flat_path else [path, flat_path]
+
+    def _files(self) -> Iterator[str]:
+        for root, _, filenames in os.walk(self.path_prefix):
+            for filename in filenames:
+                if filename.endswith(".json"):
+                    yield os.path.join(root, filename)
+
+    def _has_flat_files(self) -> bool:
+        with os.scandir(self.path_prefix) as entries:
+            return any(
+                entry.is_file() and entry.name.endswith(".json") for entry in entries
+            )
+
+    def _ensure_dir(self, path: str):
+        if path not in self._known_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._known_dirs.add(path)
 
     def __str__(self):
         return f"{self.name} : {self.path_prefix}"
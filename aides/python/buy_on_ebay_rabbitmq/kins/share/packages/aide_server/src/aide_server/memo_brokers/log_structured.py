@@ -0,0 +1,443 @@
+import asyncio
+import json
+import mmap
+import os
+from pydantic import Field, PositiveFloat, PositiveInt
+import re
+import shutil
+import struct
+import threading
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Set, Tuple
+
+from ..log import logger
+from ..memo_brokers.codecs import Codec, default_codec, unpack
+from ..memo_brokers.memo_broker import MemoBroker
+
+
+# crc32, flags, key length, value length
+_HEADER = struct.Struct("<IBII")
+_FLAG_TOMBSTONE = 1
+_SEGMENT = re.compile(r"^segment-(\d{8})\.log$")
+
+
+class _Segment:
+    def __init__(self, id: int, path: str):
+        self.id = id
+        self.path = path
+        self.size = 0
+        self.live = 0
+        # the keys of records as its hint lists them, live or superseded
+        self.keys: Set[str] = set()
+        self.tombstones: Set[str] = set()
+        self.sealed = False
+
+    @property
+    def hint_path(self):
+        return f"{self.path}.hint"
+
+
+# (segment id, offset of value, length of value, size of record)
+_Location = Tuple[int, int, int, int]
+
+
+# See the Bitcask paper: https://riak.com/assets/bitcask-intro.pdf
+class LogStructuredMemoBroker(MemoBroker):
+    """
+    Appends the values to segment files and keeps an index
+    key -> (segment, offset, length) in memory. Reads go through `mmap`.
+
+    A segment is sealed when it grows over `segment_size` or the broker
+    closes: a hint file with its index is written next to it, so a restart
+    reads the hints and scans only the segment that wasn't sealed.
+
+    The compactor rewrites the live records of sealed segments that have
+    more than `compact_garbage_ratio` of superseded data and drops them.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str,
+        clear: bool = False,
+        segment_size: PositiveInt = 64 * 1024 * 1024,
+        compact_interval: PositiveFloat = 60.0,
+        compact_garbage_ratio: PositiveFloat = 0.5,
+        codec: Optional[Codec] = None,
+    ):
+        assert path_prefix
+        assert 0 < compact_garbage_ratio <= 1
+
+        super().__init__(clear=clear)
+
+        self.path_prefix = path_prefix
+        self.segment_size = segment_size
+        self.compact_interval = compact_interval
+        self.compact_garbage_ratio = compact_garbage_ratio
+        self.codec = codec or default_codec()
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, _Location] = {}
+        self._segments: Dict[int, _Segment] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._active: Optional[_Segment] = None
+        self._active_file: Optional[BinaryIO] = None
+        self._compactor: Optional[asyncio.Task] = None
+        self._closed = False
+
+        if clear and os.path.exists(self.path_prefix):
+            logger.info(f"🔥 Purging the storage `{self}`...")
+            shutil.rmtree(self.path_prefix)
+            logger.info(f"🔥 Purged the storage `{self}`.")
+
+        os.makedirs(self.path_prefix, exist_ok=True)
+
+        self._recover()
+        self._roll()
+
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` with path `{self.path_prefix}`,"
+            f" {len(self._index)} key(s) in {len(self._segments)} segment(s)."
+        )
+
+    path_prefix: str = Field(
+        ...,
+        title="Path Prefix",
+        description="The path to segments.",
+    )
+
+    segment_size: PositiveInt = Field(
+        default=64 * 1024 * 1024,
+        title="Segment Size",
+        description="The size of segment when it's sealed, in bytes.",
+    )
+
+    compact_interval: PositiveFloat = Field(
+        default=60.0,
+        title="Compact Interval",
+        description="How often the compactor looks at segments, in seconds.",
+    )
+
+    compact_garbage_ratio: PositiveFloat = Field(
+        default=0.5,
+        title="Compact Garbage Ratio",
+        description="The part of superseded data in segment when it's compacted.",
+    )
+
+    codec: Codec = Field(
+        ...,
+        title="Codec",
+        description="The serializer of values. The fastest JSON by default.",
+    )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                raise KeyError(key)
+            data = self._read(location)
+
+        return unpack(data)
+
+    def put(self, key: str, value: Any):
+        data = self.codec.pack(value)
+        with self._lock:
+            self._append(key, data)
+
+    def delete(self, key: str):
+        with self._lock:
+            if key not in self._index:
+                raise KeyError(key)
+            self._append(key, None)
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        with self._lock:
+            mtimes = {
+                id: os.path.getmtime(segment.path)
+                for id, segment in self._segments.items()
+            }
+            entries = [
+                (key, mtimes[location[0]], location[2])
+                for key, location in self._index.items()
+            ]
+
+        return iter(entries)
+
+    def compact(self) -> int:
+        """
+        Compacts the sealed segments with too much garbage.
+        Returns a count of dropped segments.
+        """
+        with self._lock:
+            candidates = [
+                segment
+                for segment in self._segments.values()
+                if segment.sealed
+                and segment.size
+                and 1 - segment.live / segment.size >= self.compact_garbage_ratio
+            ]
+
+        n = 0
+        for segment in candidates:
+            # the lock is taken per segment, so the writers wait not long
+            with self._lock:
+                if self._closed:
+                    break
+                self._compact_segment(segment)
+            n += 1
+
+        if n:
+            logger.info(f"🧹 `{self.name}`: compacted {n} segment(s).")
+
+        return n
+
+    def close(self):
+        with self._lock:
+            # a running compaction stops before its next segment
+            self._closed = True
+            if self._active is not None:
+                if self._active.size:
+                    self._seal()
+                else:
+                    # nothing was written, don't keep an empty segment
+                    self._active_file.close()  # type: ignore
+                    self._active_file = None
+                    self._drop(self._active)
+                self._active = None
+            for m in self._maps.values():
+                m.close()
+            self._maps.clear()
+        logger.info(f"🏁 Closed the storage `{self}`.")
+
+    async def astart(self):
+        self._compactor = asyncio.get_running_loop().create_task(
+            self._compact_periodically()
+        )
+
+    async def aclose(self):
+        if self._compactor is not None:
+            self._compactor.cancel()
+            try:
+                await self._compactor
+            except asyncio.CancelledError:
+                pass
+            self._compactor = None
+
+        await super().aclose()
+
+    async def _compact_periodically(self):
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                await asyncio.to_thread(self.compact)
+            except Exception as ex:
+                logger.error(f"`{self.name}`: the compaction failed: {ex}")
+
+    # call under lock
+    def _append(self, key: str, data: Optional[bytes]):
+        assert self._active is not None and self._active_file is not None
+
+        segment = self._active
+        record = _record(key, data)
+        offset = segment.size
+        self._active_file.write(record)
+        segment.size += len(record)
+
+        self._forget(key)
+        if data is None:
+            segment.tombstones.add(key)
+        else:
+            segment.tombstones.discard(key)
+            segment.keys.add(key)
+            value_offset = offset + len(record) - len(data)
+            self._index[key] = (segment.id, value_offset, len(data), len(record))
+            segment.live += len(record)
+
+        if segment.size >= self.segment_size:
+            self._seal()
+            self._roll()
+
+    # call under lock
+    def _forget(self, key: str):
+        location = self._index.pop(key, None)
+        if location is not None:
+            self._segments[location[0]].live -= location[3]
+
+    # call under lock
+    def _read(self, location: _Location) -> bytes:
+        id, offset, length, _ = location
+        m = self._maps.get(id)
+        if m is None or len(m) < offset + length:
+            # the active segment grows, map it again
+            if m is not None:
+                m.close()
+            with open(self._segments[id].path, "rb") as file:
+                m = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[id] = m
+
+        return m[offset : offset + length]
+
+    # call under lock
+    def _compact_segment(self, segment: _Segment):
+        if segment.id not in self._segments:
+            return
+
+        older = [s for id, s in self._segments.items() if id < segment.id]
+        moved = 0
+        for key, location in list(self._index.items()):
+            if location[0] == segment.id:
+                self._append(key, self._read(location))
+                moved += 1
+
+        # the tombstone still hides a record of older segment,
+        # otherwise it isn't needed anymore
+        for key in segment.tombstones:
+            if key not in self._index and any(key in s.keys for s in older):
+                self._append(key, None)
+
+        self._drop(segment)
+        logger.info(
+            f"`{self.name}`: moved {moved} live record(s)"
+            f" from segment {segment.id}."
+        )
+
+    # call under lock
+    def _drop(self, segment: _Segment):
+        m = self._maps.pop(segment.id, None)
+        if m is not None:
+            m.close()
+        del self._segments[segment.id]
+        os.remove(segment.path)
+        if os.path.exists(segment.hint_path):
+            os.remove(segment.hint_path)
+
+    # call under lock
+    def _seal(self):
+        assert self._active is not None and self._active_file is not None
+
+        segment = self._active
+        self._active_file.flush()
+        os.fsync(self._active_file.fileno())
+        self._active_file.close()
+        self._active_file = None
+
+        segment.keys = _write_hint(segment, self._index)
+        segment.sealed = True
+
+    # call under lock
+    def _roll(self):
+        id = max(self._segments, default=0) + 1
+        segment = _Segment(id, self._segment_path(id))
+        self._segments[id] = segment
+        # unbuffered, so `mmap` sees every appended record
+        self._active_file = open(segment.path, "ab", buffering=0)  # type: ignore
+        self._active = segment
+
+    def _recover(self):
+        ids = sorted(
+            int(match.group(1))
+            for match in map(_SEGMENT.match, os.listdir(self.path_prefix))
+            if match
+        )
+        for id in ids:
+            segment = _Segment(id, self._segment_path(id))
+            segment.size = os.path.getsize(segment.path)
+            self._segments[id] = segment
+
+            if os.path.exists(segment.hint_path):
+                records, tombstones = _read_hint(segment)
+            else:
+                logger.info(f"`{self.name}`: scanning unsealed segment {id}...")
+                records, tombstones = _scan_segment(segment)
+                segment.size = os.path.getsize(segment.path)
+
+            for key in tombstones:
+                self._forget(key)
+            for key, (offset, length, size) in records.items():
+                self._forget(key)
+                self._index[key] = (id, offset, length, size)
+                segment.live += size
+            segment.keys = set(records)
+            segment.tombstones = tombstones
+
+            if not segment.sealed:
+                segment.keys = _write_hint(segment, self._index)
+                segment.sealed = True
+
+    def _segment_path(self, id: int):
+        return os.path.join(self.path_prefix, f"segment-{id:08d}.log")
+
+    def __str__(self):
+        return f"{self.name} : {self.path_prefix}"
+
+
+def _record(key: str, data: Optional[bytes]) -> bytes:
+    k = key.encode("utf-8")
+    v = data or b""
+    flags = _FLAG_TOMBSTONE if data is None else 0
+    body = struct.pack("<BII", flags, len(k), len(v)) + k + v
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+# Returns the keys of records in hint.
+def _write_hint(segment: _Segment, index: Dict[str, _Location]) -> Set[str]:
+    hint = {
+        "records": {
+            key: [location[1], location[2], location[3]]
+            for key, location in index.items()
+            if location[0] == segment.id
+        },
+        "tombstones": sorted(segment.tombstones),
+    }
+    temp_path = f"{segment.hint_path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(hint, file)
+    os.replace(temp_path, segment.hint_path)
+
+    return set(hint["records"])
+
+
+def _read_hint(
+    segment: _Segment,
+) -> Tuple[Dict[str, Tuple[int, int, int]], Set[str]]:
+    with open(segment.hint_path, "r") as file:
+        hint = json.load(file)
+    segment.sealed = True
+
+    records = {key: tuple(location) for key, location in hint["records"].items()}
+    return records, set(hint["tombstones"])  # type: ignore[return-value]
+
+
+# Reads the records one by one and cuts a torn tail after a crash.
+def _scan_segment(
+    segment: _Segment,
+) -> Tuple[Dict[str, Tuple[int, int, int]], Set[str]]:
+    records: Dict[str, Tuple[int, int, int]] = {}
+    tombstones: Set[str] = set()
+    offset = 0
+    with open(segment.path, "r+b") as file:
+        data = file.read()
+        while offset + _HEADER.size <= len(data):
+            crc, flags, key_length, value_length = _HEADER.unpack_from(data, offset)
+            size = _HEADER.size + key_length + value_length
+            body = data[offset + 4 : offset + size]
+            if offset + size > len(data) or zlib.crc32(body) != crc:
+                break
+
+            key_offset = offset + _HEADER.size
+            key = data[key_offset : key_offset + key_length].decode("utf-8")
+            if flags & _FLAG_TOMBSTONE:
+                records.pop(key, None)
+                tombstones.add(key)
+            else:
+                tombstones.discard(key)
+                records[key] = (key_offset + key_length, value_length, size)
+            offset += size
+
+        if offset < len(data):
+            logger.warning(
+                f"Cut {len(data) - offset} byte(s) of torn tail"
+                f" from segment `{segment.path}`."
+            )
+            file.truncate(offset)
+
+    return records, tombstones
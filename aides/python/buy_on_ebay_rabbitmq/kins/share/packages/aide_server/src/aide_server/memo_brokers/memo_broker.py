@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+import asyncio
 from pydantic import Field
-from typing import Any
+from typing import Any, Dict, Iterator, List, Tuple
 
 from ..log import logger
 
@@ -12,12 +13,76 @@ class MemoBroker(ABC):
 
     @abstractmethod
     def get(self, key: str) -> Any:
+        """
+        Raises `KeyError` when the key is absent.
+        """
         pass
 
     @abstractmethod
     def put(self, key: str, value: Any) -> None:
         pass
 
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Raises `KeyError` when the key is absent.
+        """
+        pass
+
+    # Returns the values of present keys only.
+    # Override when the storage can do it at once.
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        r: Dict[str, Any] = {}
+        for key in keys:
+            try:
+                r[key] = self.get(key)
+            except KeyError:
+                pass
+
+        return r
+
+    def put_many(self, values: Dict[str, Any]) -> None:
+        for key, value in values.items():
+            self.put(key, value)
+
+    # Lists the stored keys as (key, created_at, size in bytes).
+    # Can be slow: use it once, for example, to build an index on startup.
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        raise NotImplementedError(f"`{self.name}` can't scan the keys.")
+
+    # Releases the resources of broker: handles, connections, etc.
+    def close(self) -> None:
+        pass
+
+    # The async contract for callers that live on the event loop: catchers
+    # and endpoints of sides. By default the blocking methods above are
+    # offloaded to a thread, override for a native async storage.
+
+    async def aget(self, key: str) -> Any:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: Any) -> None:
+        return await asyncio.to_thread(self.put, key, value)
+
+    async def adelete(self, key: str) -> None:
+        return await asyncio.to_thread(self.delete, key)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aput_many(self, values: Dict[str, Any]) -> None:
+        return await asyncio.to_thread(self.put_many, values)
+
+    async def ascan(self) -> List[Tuple[str, float, int]]:
+        return await asyncio.to_thread(lambda: list(self.scan()))
+
+    # Called when the server starts: a place for background jobs.
+    async def astart(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        return await asyncio.to_thread(self.close)
+
     name: str = Field(
         ...,
         title="Name",
@@ -38,3 +103,22 @@ class NoneMemoBroker(MemoBroker):
 
     def put(self, key: str, value: Any):
         logger.info(f"🟡 Put value to `{self.name}`.")
+
+    def delete(self, key: str):
+        logger.info(f"🟡 Delete value from `{self.name}`.")
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        return iter([])
+
+    # nothing to offload
+    async def aget(self, key: str) -> Any:
+        return self.get(key)
+
+    async def aput(self, key: str, value: Any):
+        return self.put(key, value)
+
+    async def adelete(self, key: str):
+        return self.delete(key)
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,245 @@
+import asyncio
+from collections import OrderedDict
+import json
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..log import logger
+from ..memo_brokers.memo_broker import MemoBroker
+
+
+class RetentionPolicy(BaseModel):
+    max_age: Optional[PositiveFloat] = Field(
+        default=None,
+        title="Max Age",
+        description="Delete the keys created earlier, in seconds.",
+    )
+
+    max_count: Optional[PositiveInt] = Field(
+        default=None,
+        title="Max Count",
+        description="Keep no more keys, delete the least recently used ones.",
+    )
+
+    max_bytes: Optional[PositiveInt] = Field(
+        default=None,
+        title="Max Bytes",
+        description="Keep no more bytes of values, delete the least recently used keys.",
+    )
+
+    sweep_interval: PositiveFloat = Field(
+        default=60.0,
+        title="Sweep Interval",
+        description="How often the policy is enforced, in seconds.",
+    )
+
+
+class RetentionMemoBroker(MemoBroker):
+    """
+    Enforces `policy` for other broker with a background sweeper.
+    The index of creation time and access order lives in memory, so
+    a sweep touches only the keys it deletes. The index is built by one
+    `scan()` of the broker when the sweeper starts.
+    """
+
+    def __init__(
+        self,
+        broker: MemoBroker,
+        policy: RetentionPolicy,
+    ):
+        super().__init__()
+
+        self.broker = broker
+        self.policy = policy
+
+        # key: created_at, in order of creation
+        self._created: OrderedDict[str, float] = OrderedDict()
+        # key: size, in order of access
+        self._accessed: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sweeper: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` for `{self.broker}`"
+            f" with policy `{self.policy}`."
+        )
+
+    broker: MemoBroker = Field(
+        ...,
+        title="Memo Broker",
+        description="The broker under retention.",
+    )
+
+    policy: RetentionPolicy = Field(
+        ...,
+        title="Retention Policy",
+        description="Limits for the keys of broker.",
+    )
+
+    def get(self, key: str) -> Any:
+        value = self.broker.get(key)
+        self._touch(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        self.broker.put(key, value)
+        self._track(key, value)
+
+    def delete(self, key: str):
+        self._untrack(key)
+        self.broker.delete(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        r = self.broker.get_many(keys)
+        for key in r:
+            self._touch(key)
+        return r
+
+    def put_many(self, values: Dict[str, Any]):
+        self.broker.put_many(values)
+        for key, value in values.items():
+            self._track(key, value)
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        return self.broker.scan()
+
+    def close(self):
+        self.broker.close()
+
+    async def aget(self, key: str) -> Any:
+        value = await self.broker.aget(key)
+        self._touch(key)
+        return value
+
+    # The size of value is measured in the thread that writes it.
+    async def aput(self, key: str, value: Any):
+        if self.policy.max_bytes:
+            return await asyncio.to_thread(self.put, key, value)
+
+        await self.broker.aput(key, value)
+        self._track(key, value)
+
+    async def adelete(self, key: str):
+        self._untrack(key)
+        await self.broker.adelete(key)
+
+    async def astart(self):
+        await self.broker.astart()
+
+        try:
+            entries = await self.broker.ascan()
+        except NotImplementedError as ex:
+            logger.warning(f"`{self.name}`: {ex} Only new keys are retained.")
+            entries = []
+
+        with self._lock:
+            # the keys put before scan are already tracked and newer,
+            # so the scanned keys go to the head, the oldest first
+            for key, created_at, size in sorted(
+                entries, key=lambda e: e[1], reverse=True
+            ):
+                if key not in self._created:
+                    self._created[key] = created_at
+                    self._created.move_to_end(key, last=False)
+                    self._accessed[key] = size
+                    self._accessed.move_to_end(key, last=False)
+                    self._bytes += size
+        logger.info(f"`{self.name}`: indexed {len(entries)} key(s).")
+
+        self._sweeper = asyncio.get_running_loop().create_task(
+            self._sweep_periodically()
+        )
+
+    async def aclose(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+        await self.broker.aclose()
+
+    async def sweep(self) -> int:
+        """
+        Deletes the keys beyond the policy. Returns a count of deleted keys.
+        """
+        keys = self._expired()
+        for key in keys:
+            try:
+                await self.broker.adelete(key)
+            except KeyError:
+                pass
+
+        if keys:
+            logger.info(f"🧹 `{self.name}`: deleted {len(keys)} key(s).")
+
+        return len(keys)
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.policy.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as ex:
+                logger.error(f"`{self.name}`: the sweep failed: {ex}")
+
+    # Takes the keys to delete out of index.
+    def _expired(self) -> List[str]:
+        r = []
+        with self._lock:
+            if self.policy.max_age:
+                created_before = time.time() - self.policy.max_age
+                while self._created:
+                    key, created_at = next(iter(self._created.items()))
+                    if created_at >= created_before:
+                        break
+                    self._drop(key)
+                    r.append(key)
+
+            while self._accessed and (
+                (self.policy.max_count and len(self._accessed) > self.policy.max_count)
+                or (self.policy.max_bytes and self._bytes > self.policy.max_bytes)
+            ):
+                key = next(iter(self._accessed))
+                self._drop(key)
+                r.append(key)
+
+        return r
+
+    def _track(self, key: str, value: Any):
+        size = _size(value) if self.policy.max_bytes else 0
+        with self._lock:
+            if key not in self._created:
+                self._created[key] = time.time()
+            self._bytes += size - self._accessed.pop(key, 0)
+            self._accessed[key] = size
+
+    def _touch(self, key: str):
+        with self._lock:
+            if key in self._accessed:
+                self._accessed.move_to_end(key)
+
+    def _untrack(self, key: str):
+        with self._lock:
+            if key in self._created:
+                self._drop(key)
+
+    # call under lock
+    def _drop(self, key: str):
+        del self._created[key]
+        self._bytes -= self._accessed.pop(key)
+
+    def __str__(self):
+        return f"{self.name} : {self.broker}"
+
+
+def _size(value: Any) -> int:
+    try:
+        return len(json.dumps(value))
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+import os
+from pydantic import Field, PositiveInt
+import queue
+import shutil
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..log import logger
+from ..memo_brokers.codecs import Codec, default_codec, unpack
+from ..memo_brokers.memo_broker import MemoBroker
+
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS memo (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+_SELECT = "SELECT value FROM memo WHERE key = ?"
+_SELECT_IN = "SELECT key, value FROM memo WHERE key IN ({})"
+# SQLITE_MAX_VARIABLE_NUMBER of SQLite before 3.32
+_MAX_VARIABLES = 999
+_UPSERT = """
+INSERT INTO memo (key, value, created_at, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+"""
+_DELETE = "DELETE FROM memo WHERE key = ?"
+_SELECT_ALL = "SELECT key, created_at, length(value) FROM memo"
+
+
+# Use https://www.sqlite.org/wal.html
+class SqliteMemoBroker(MemoBroker):
+    """
+    Keeps all keys in one table of SQLite database in WAL mode.
+    The connections are taken from a pool of `pool_size`, so the threads
+    of `aget` / `aput` can read at the same time.
+
+    The values are written by `codec` as BLOBs. The old TEXT values
+    are read as JSON.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str,
+        filename: str = "storage.sqlite3",
+        clear: bool = False,
+        pool_size: PositiveInt = 1,
+        codec: Optional[Codec] = None,
+    ):
+        assert path_prefix
+        assert filename
+        assert pool_size > 0
+
+        super().__init__(clear=clear)
+
+        self.path_prefix = path_prefix
+        self.filename = filename
+        self.pool_size = pool_size
+        self.codec = codec or default_codec()
+
+        if clear and os.path.exists(self.path_prefix):
+            logger.info(f"🔥 Purging the storage `{self}`...")
+            shutil.rmtree(self.path_prefix)
+            logger.info(f"🔥 Purged the storage `{self}`.")
+
+        os.makedirs(self.path_prefix, exist_ok=True)
+
+        # None after close
+        self._pool: queue.Queue[Optional[sqlite3.Connection]] = queue.Queue()
+        for _ in range(self.pool_size):
+            self._pool.put(self._connect())
+
+        with self._connection() as connection:
+            connection.execute(_CREATE_TABLE)
+
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` with path `{self.path_prefix}`"
+            f", {self.pool_size} connection(s) and codec `{self.codec}`."
+        )
+
+    path_prefix: str = Field(
+        ...,
+        title="Path Prefix",
+        description="The path to storage.",
+    )
+
+    filename: str = Field(
+        ...,
+        title="Filename",
+        description="The filename of database.",
+    )
+
+    pool_size: PositiveInt = Field(
+        default=1,
+        title="Pool Size",
+        description="The count of open connections to database.",
+    )
+
+    codec: Codec = Field(
+        ...,
+        title="Codec",
+        description="The serializer of values. The fastest JSON by default.",
+    )
+
+    @property
+    def storage(self):
+        return os.path.join(self.path_prefix, self.filename)
+
+    def get(self, key: str) -> Any:
+        with self._connection() as connection:
+            row = connection.execute(_SELECT, (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+
+        return unpack(row[0])
+
+    def put(self, key: str, value: Any):
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(_UPSERT, (key, self.codec.pack(value), now, now))
+
+    def delete(self, key: str):
+        with self._connection() as connection:
+            deleted = connection.execute(_DELETE, (key,)).rowcount
+        if not deleted:
+            raise KeyError(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        r: Dict[str, Any] = {}
+        with self._connection() as connection:
+            for i in range(0, len(keys), _MAX_VARIABLES):
+                chunk = keys[i : i + _MAX_VARIABLES]
+                select = _SELECT_IN.format(", ".join("?" * len(chunk)))
+                for key, value in connection.execute(select, chunk):
+                    r[key] = unpack(value)
+
+        return r
+
+    # one transaction for all values
+    def put_many(self, values: Dict[str, Any]):
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                _UPSERT,
+                (
+                    (key, self.codec.pack(value), now, now)
+                    for key, value in values.items()
+                ),
+            )
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        with self._connection() as connection:
+            rows = connection.execute(_SELECT_ALL).fetchall()
+
+        return iter(rows)
+
+    # Waits for the connections in use.
+    def close(self):
+        for _ in range(self.pool_size):
+            connection = self._pool.get()
+            if connection is None:
+                # already closed
+                self._pool.put(None)
+                return
+            connection.close()
+        # wakes up the callers after close, see `_connection()`
+        self._pool.put(None)
+        logger.info(f"🏁 Closed the storage `{self}`.")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.storage, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+
+        return connection
+
+    # Takes a connection from pool and commits on exit.
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        if connection is None:
+            self._pool.put(None)
+            raise Exception(f"The storage `{self}` is closed.")
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._pool.put(connection)
+
+    def __str__(self):
+        return f"{self.name} : {self.storage}"
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+import json
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .context_snapshots import context_hash
+from .log import logger
+
+
+class ActCache(BaseModel):
+    """
+    Opt-in caching of results for a deterministic act, see `Act.cache`.
+    """
+
+    ttl: PositiveFloat = Field(
+        default=24 * 60 * 60,
+        title="TTL",
+        description="Time to live for a cached result, in seconds.",
+    )
+
+    max_result_bytes: PositiveInt = Field(
+        default=1024 * 1024,
+        title="Max Result Bytes",
+        description="The bigger results aren't cached, in bytes of JSON.",
+    )
+
+
+class ResultCache:
+    """
+    Maps `hid_act` + hash of context + version of act to the uid of task
+    with the known result. The results stay in the inner memo: the cache
+    limits how many of them and how many bytes can be served again.
+    """
+
+    def __init__(
+        self,
+        max_entries: PositiveInt = 10000,
+        max_bytes: PositiveInt = 256 * 1024 * 1024,
+    ):
+        self.name = type(self).__name__
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # key: (uid_task, size, expires_at)
+        self._entries: OrderedDict[str, Tuple[str, int, float]] = OrderedDict()
+        self._bytes = 0
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of cache. Set by class.",
+    )
+
+    max_entries: PositiveInt = Field(
+        default=10000,
+        title="Max Entries",
+        description="The count of cached results.",
+    )
+
+    max_bytes: PositiveInt = Field(
+        default=256 * 1024 * 1024,
+        title="Max Bytes",
+        description="The size of cached results, in bytes of JSON.",
+    )
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] < time.monotonic():
+            self.forget(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return entry[0]
+
+    def put(self, key: str, uid_task: str, value: Any, cache: ActCache):
+        size = _size(value)
+        if size is None or size > min(cache.max_result_bytes, self.max_bytes):
+            return
+
+        self.forget(key)
+        self._entries[key] = (uid_task, size, time.monotonic() + cache.ttl)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self.forget(oldest)
+
+    def forget(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def __str__(self):
+        return self.name
+
+
+def result_key(hid_act: str, version: str, context: Dict[str, Any]) -> str:
+    """
+    The same for equal contexts regardless of the order of keys.
+    """
+    return f"{hid_act}:{version}:{context_hash(context)}"
+
+
+def _size(value: Any) -> Optional[int]:
+    try:
+        return len(json.dumps(value))
+    except (TypeError, ValueError):
+        logger.warning("Can't cache a result: it isn't JSON.")
+        return None
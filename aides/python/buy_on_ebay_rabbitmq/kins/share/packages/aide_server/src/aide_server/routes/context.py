@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Request
 import json
 
+from .etag import RenderedResponses
+
 from ..context_memo import ContextMemo
 
 
 def add_routes(router: APIRouter, context_memo: ContextMemo):
+    rendered = RenderedResponses()
+
+    # the schema changes only with the class of context
     @router.get("/schema")
-    def schema():
-        return json.loads(context_memo.context.schema_json())
+    def schema(request: Request):
+        context = context_memo.context
+        return rendered.respond(
+            request,
+            key=type(context),
+            render=lambda: json.loads(context.schema_json()),
+        )
 
     @router.get(
         "/get-context",
@@ -1,12 +1,13 @@
 from faststream.rabbit import (
     ExchangeType,
+    RabbitBroker,
     RabbitExchange,
     RabbitQueue,
     fastapi,
 )
 from pydantic import Field
 import time
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from kins.share.packages.aide_server.src.aide_server.sides.type_side import TypeSide
 
@@ -33,6 +34,9 @@ class SavantRouter(fastapi.RabbitRouter):
         self.sidename_server = sidename_server
         self.acts = acts
 
+        # prefetch count: broker, see `prefetchBroker()`
+        self._prefetch_brokers: Dict[int, RabbitBroker] = {}
+
     hid_server: str = Field(
         ...,
         title="HID Server",
@@ -65,12 +69,43 @@ class SavantRouter(fastapi.RabbitRouter):
         pusher_side: TypeSide,
         catcher_side: TypeSide,
     ):
+        admission = next(
+            (act.admission for act in self.acts if act.hid == hid_act), None
+        )
+        arguments = (
+            admission.queue_arguments(
+                dead_letter_exchange=self.exchange().name,
+                dead_letter_routing_key=self.droppedTaskKey(hid_act),
+            )
+            if admission
+            else None
+        )
         return queue(
             type=TypeQueue.TASK,
             hid_act=hid_act,
             hid_server=self.hid_server,
             pusher_side=pusher_side,
             catcher_side=catcher_side,
+            arguments=arguments,
+        )
+
+    # The tasks dropped from the full task queue, see `ActAdmission.overflow`.
+    def droppedTaskQueue(self, hid_act: str, catcher_side: TypeSide):
+        return queue(
+            type=TypeQueue.DROPPED_TASK,
+            hid_act=hid_act,
+            hid_server=self.hid_server,
+            pusher_side=TypeSide.BRAIN,
+            catcher_side=catcher_side,
+            routing_key=self.droppedTaskKey(hid_act),
+        )
+
+    def droppedTaskKey(self, hid_act: str) -> str:
+        return pusher_key(
+            type=TypeQueue.DROPPED_TASK,
+            hid_act=hid_act,
+            hid_server=self.hid_server,
+            pusher_side=TypeSide.BRAIN,
         )
 
     def progressQueue(
@@ -85,6 +120,7 @@ class SavantRouter(fastapi.RabbitRouter):
             hid_server=self.hid_server,
             pusher_side=pusher_side,
             catcher_side=catcher_side,
+            routing_key=self.progressKey(hid_act, pusher_side=pusher_side),
         )
 
     def resultQueue(
@@ -99,6 +135,26 @@ class SavantRouter(fastapi.RabbitRouter):
             hid_server=self.hid_server,
             pusher_side=pusher_side,
             catcher_side=catcher_side,
+            routing_key=self.resultKey(hid_act, pusher_side=pusher_side),
+        )
+
+    # The progress and result queues of all catchers are bound to the same
+    # key of pusher, so one publish reaches them all. Other observers can
+    # bind own queues to the exchange, for example, by `progress.#`.
+    def progressKey(self, hid_act: str, pusher_side: TypeSide) -> str:
+        return pusher_key(
+            type=TypeQueue.PROGRESS,
+            hid_act=hid_act,
+            hid_server=self.hid_server,
+            pusher_side=pusher_side,
+        )
+
+    def resultKey(self, hid_act: str, pusher_side: TypeSide) -> str:
+        return pusher_key(
+            type=TypeQueue.RESULT,
+            hid_act=hid_act,
+            hid_server=self.hid_server,
+            pusher_side=pusher_side,
         )
 
     def requestProgressQueue(
@@ -161,6 +217,31 @@ class SavantRouter(fastapi.RabbitRouter):
             catcher_side=catcher_side,
         )
 
+    def prefetchBroker(self, count: int) -> RabbitBroker:
+        """
+        The broker for the catchers limited to `count` unacked messages each.
+        It has own connection and channel with the QoS set once, so
+        the QoS of other catchers isn't touched and a reconnect restores it.
+        Started and closed with the server, see `start_prefetch_brokers()`.
+        """
+        broker = self._prefetch_brokers.get(count)
+        if broker is None:
+            broker = self._prefetch_brokers[count] = RabbitBroker(
+                self.broker.url,
+                max_consumers=count,
+            )
+
+        return broker
+
+    async def start_prefetch_brokers(self):
+        for count, broker in self._prefetch_brokers.items():
+            await broker.start()
+            logger.info(f"🌱 Started the catchers with prefetch {count}.")
+
+    async def close_prefetch_brokers(self):
+        for broker in self._prefetch_brokers.values():
+            await broker.close()
+
     async def declare_exchange(self):
         declare = self.broker.declare_exchange
         ex = self.exchange()
@@ -168,9 +249,15 @@ class SavantRouter(fastapi.RabbitRouter):
         logger.info(f"🌱 Created exchange `{ex.name}` with type `{ex.type.upper()}`.")
 
     async def declare_queue(self, queue: RabbitQueue):
-        await self.broker.declare_queue(queue)
+        declared = await self.broker.declare_queue(queue)
         logger.info(f"\t🌱 Created queue `{queue.name}`.   ")
 
+        # a fan-out queue gets the messages even before its catcher starts
+        if queue.routing_key:
+            exchange = await self.broker.declare_exchange(self.exchange())
+            await declared.bind(exchange, routing_key=queue.routing_key)
+            logger.info(f"\t🌱 Bound queue `{queue.name}` to `{queue.routing_key}`.")
+
     async def declare_service_queues(self):
         logger.info(f"🌱 Declaring services queues...")
 
@@ -283,6 +370,12 @@ class SavantRouter(fastapi.RabbitRouter):
             )
             n += 1
 
+            if act.admission and act.admission.drops_tasks:
+                await self.declare_queue(
+                    self.droppedTaskQueue(act.hid, catcher_side=TypeSide.APPEARANCE)
+                )
+                n += 1
+
             time.sleep(0.2)
 
             logger.info(f"🌱 Declared {n} queue(s) for act `{act.name['en']}`.")
@@ -296,6 +389,8 @@ def queue(
     pusher_side: TypeSide,
     catcher_side: TypeSide,
     hid_act: str = "",
+    arguments: Optional[Dict[str, Any]] = None,
+    routing_key: str = "",
 ):
     keys = [
         type.name.lower(),
@@ -306,4 +401,26 @@ def queue(
     ]
     name = ".".join(filter(None, keys))
 
-    return RabbitQueue(name, auto_delete=True)
+    return RabbitQueue(
+        name,
+        auto_delete=True,
+        arguments=arguments,
+        routing_key=routing_key,
+    )
+
+
+# Like the name of queue without the catcher side.
+def pusher_key(
+    type: TypeQueue,
+    hid_server: str,
+    pusher_side: TypeSide,
+    hid_act: str = "",
+) -> str:
+    keys = [
+        type.name.lower(),
+        hid_act,
+        pusher_side.name.lower(),
+        hid_server,
+    ]
+
+    return ".".join(filter(None, keys))
@@ -2,19 +2,27 @@ from fastapi import APIRouter, FastAPI, routing
 import logging
 import os
 from pydantic import Field
-from typing import Callable, List
+from typing import Callable, List, Optional
 
+from .act_pools import act_pools
+from .blob_stores.local import LocalBlobStore
+from .claim_check import ClaimCheck
 from .configure import Configure
 from .context_memo import ContextMemo, NoneContextMemo
+from .context_snapshots import ContextSnapshots
 from .helpers import unwrap_multilang_text_list, skip_check_route
 from .inner_memo import InnerMemo, NoneInnerMemo
 from .log import logger
+from .memo_brokers.cached import CachedMemoBroker
 from .memo_brokers.filesystem import FilesystemMemoBroker
+from .memo_brokers.retention import RetentionMemoBroker, RetentionPolicy
+from .memo_hub import MemoHub
 from .savant_router import SavantRouter
 from .sides.appearance_side import AppearanceSide
 from .sides.brain_side import BrainSide
 from .sides.keeper_side import KeeperSide
 from .sides.side import Side
+from .write_behind_inner_memo import WriteBehindInnerMemo
 
 
 class AideServer(FastAPI):
@@ -27,8 +35,16 @@ class AideServer(FastAPI):
         *,
         path_to_configure: str = "kins/share/configure.json",
         brain_runs: List[Callable] = [],
+        strict_brain_runs: bool = True,
         context_memo: ContextMemo = NoneContextMemo(),
         inner_memo: InnerMemo = NoneInnerMemo(),
+        cache_inner_memo: bool = False,
+        inner_memo_retention: Optional[RetentionPolicy] = RetentionPolicy(
+            max_age=7 * 24 * 60 * 60,
+        ),
+        context_snapshots_path: Optional[str] = None,
+        blob_store_path: Optional[str] = None,
+        claim_check_threshold: int = 64 * 1024,
         language: str = "en",
         debug_level: int = logging.INFO,
     ):
@@ -80,12 +96,20 @@ class AideServer(FastAPI):
         self.tags = tags
         self.configure = configure
         self.brain_runs = brain_runs
+        self.strict_brain_runs = strict_brain_runs
         self.inner_memo = inner_memo
+        self.cache_inner_memo = cache_inner_memo
+        self.inner_memo_retention = inner_memo_retention
         self.context_memo = context_memo
+        self.context_snapshots_path = context_snapshots_path
+        self.context_snapshots: Optional[ContextSnapshots] = None
+        self.blob_store_path = blob_store_path
+        self.claim_check_threshold = claim_check_threshold
         self.savant_router = savant_router
 
         self.register_side()
         self.declare_channels()
+        self.declare_lifespan()
 
     def register_side(self):
         logger.info(f"🏳️‍🌈 Initializing the side `{self.sidename}`...")
@@ -113,6 +137,7 @@ class AideServer(FastAPI):
             await self.savant_router.declare_exchange()
             await self.savant_router.declare_service_queues()
             await self.savant_router.declare_acts_queues()
+            await self.savant_router.start_prefetch_brokers()
 
             message = (
                 f"🚩 `{self.sidename}` `{self.hid}` started"
@@ -151,18 +176,64 @@ class AideServer(FastAPI):
 
         logger.info("🌱 Declared the channels.")
 
+    def declare_lifespan(self):
+        @self.savant_router.after_startup
+        async def memo_started(app: AideServer):
+            await self.side.inner_memo.astart()
+            await self.context_memo.astart()
+            if self.context_snapshots:
+                await self.context_snapshots.astart()
+            if self.side.claim_check:
+                await self.side.claim_check.astart()
+
+        # runs before the connection to Savant is closed
+        async def app_shutdown():
+            await self.savant_router.close_prefetch_brokers()
+            await self.side.inner_memo.aclose()
+            await self.context_memo.aclose()
+            if self.context_snapshots:
+                await self.context_snapshots.aclose()
+            if self.side.claim_check:
+                await self.side.claim_check.aclose()
+            await self.side.aclose()
+            if self.sidename == "brain":
+                act_pools.shutdown()
+            logger.info(f"🏁 `{self.sidename}` `{self.hid}` stopped.")
+
+        self.savant_router.add_event_handler("shutdown", app_shutdown)
+
     def build_side(self, router: APIRouter) -> Side:
         path_inner_memo = os.path.join("memo", f"{self.sidename}_inner_memo")
-        default_inner_memo = InnerMemo(
-            FilesystemMemoBroker(path_inner_memo),
-            # ShelveMemoBroker(name_inner_memo),
-        )
+        # the files of flat layout stay readable and are moved into the shards
+        # in background when the memo starts, see `FilesystemMemoBroker.reshard()`
+        default_broker = FilesystemMemoBroker(path_inner_memo, shard_levels=2)
+        # default_broker = ShelveMemoBroker(path_inner_memo, persistent=True)
+        # default_broker = SqliteMemoBroker(path_inner_memo, pool_size=4)
+        # default_broker = LogStructuredMemoBroker(path_inner_memo)
+        if self.cache_inner_memo:
+            # progresses change too often to be cached
+            default_broker = CachedMemoBroker(
+                default_broker,
+                ttls={".progress": 0.0, ".response_progress": 0.0},
+            )
+        if self.inner_memo_retention:
+            default_broker = RetentionMemoBroker(
+                default_broker,
+                policy=self.inner_memo_retention,
+            )
+        default_hub = MemoHub()
+        # default_hub = UnixSocketMemoHub(os.path.join("memo", f"{self.sidename}_hub"))
+        default_inner_memo = WriteBehindInnerMemo(default_broker, hub=default_hub)
         side_inner_memo = (
             default_inner_memo
             if isinstance(self.inner_memo, NoneInnerMemo)
             else self.inner_memo
         )
 
+        if self.context_snapshots_path and self.sidename in ("appearance", "brain"):
+            self.context_snapshots = self.build_context_snapshots()
+        claim_check = self.build_claim_check()
+
         if self.sidename == "appearance":
             return AppearanceSide(
                 router,
@@ -170,6 +241,8 @@ class AideServer(FastAPI):
                 savant_router=self.savant_router,
                 context_memo=self.context_memo,
                 inner_memo=side_inner_memo,
+                context_snapshots=self.context_snapshots,
+                claim_check=claim_check,
             )
 
         if self.sidename == "brain":
@@ -178,6 +251,9 @@ class AideServer(FastAPI):
                 savant_router=self.savant_router,
                 acts=self.configure.acts,
                 runs=self.brain_runs,
+                strict_runs=self.strict_brain_runs,
+                context_snapshots=self.context_snapshots,
+                claim_check=claim_check,
             )
 
         if self.sidename == "keeper":
@@ -186,10 +262,36 @@ class AideServer(FastAPI):
                 savant_router=self.savant_router,
                 acts=self.configure.acts,
                 inner_memo=side_inner_memo,
+                claim_check=claim_check,
             )
 
         raise Exception(f"Undeclared side `{self.sidename}`.")
 
+    def build_context_snapshots(self) -> ContextSnapshots:
+        assert self.context_snapshots_path
+        broker = FilesystemMemoBroker(self.context_snapshots_path, shard_levels=2)
+        if self.sidename == "brain":
+            # the snapshots never change
+            broker = CachedMemoBroker(broker, ttl=60 * 60)
+        elif self.inner_memo_retention:
+            broker = RetentionMemoBroker(broker, policy=self.inner_memo_retention)
+
+        return ContextSnapshots(broker)
+
+    def build_claim_check(self) -> Optional[ClaimCheck]:
+        if not self.blob_store_path:
+            return None
+
+        store = LocalBlobStore(self.blob_store_path)
+        # Keeper answers with the refs while it keeps the results
+        max_age = self.inner_memo_retention and self.inner_memo_retention.max_age
+
+        return ClaimCheck(
+            store,
+            threshold=self.claim_check_threshold,
+            max_age=max_age or 7 * 24 * 60 * 60,
+        )
+
     # properties
 
     language: str = Field(
@@ -238,6 +340,48 @@ class AideServer(FastAPI):
         description="The runs for Brain server. Each runs should be defined into `configure.json` with same name.",
     )
 
+    strict_brain_runs: bool = Field(
+        default=True,
+        title="Strict Brain Runs",
+        description="The Brain fails to start when an act has no run.",
+    )
+
+    cache_inner_memo: bool = Field(
+        default=False,
+        title="Cache Inner Memo",
+        description="Put an LRU cache in front of the broker of default inner memo.",
+    )
+
+    inner_memo_retention: Optional[RetentionPolicy] = Field(
+        default=None,
+        title="Inner Memo Retention",
+        description="The retention policy for keys of default inner memo. Without limits when `None`.",
+    )
+
+    context_snapshots_path: Optional[str] = Field(
+        default=None,
+        title="Context Snapshots Path",
+        description="Appearance publishes tasks with `context_ref` to `ContextSnapshots` by this path, Brain resolves the refs. The path should be shared by Appearance and Brain, e.g. a volume mounted on both hosts. Off when `None`.",
+    )
+
+    context_snapshots: Optional[ContextSnapshots] = Field(
+        default=None,
+        title="Context Snapshots",
+        description="The snapshots of contexts for Appearance and Brain. Set by `context_snapshots_path`.",
+    )
+
+    blob_store_path: Optional[str] = Field(
+        default=None,
+        title="Blob Store Path",
+        description="The values of big results are moved to `ClaimCheck` by this path. The path should be shared by all sides, e.g. a volume mounted on all hosts. Off when `None`.",
+    )
+
+    claim_check_threshold: int = Field(
+        default=64 * 1024,
+        title="Claim Check Threshold",
+        description="The values of results bigger than it are moved to the blob store, in bytes of JSON.",
+    )
+
     savant_router: SavantRouter = Field(
         ...,
         title="Savant Router",
@@ -1,16 +1,38 @@
-from fastapi import APIRouter
-from pydantic import Field
+import aio_pika
+import asyncio
+from collections import OrderedDict
+from fastapi import APIRouter, Body, HTTPException, Response, WebSocket
+from fastapi.responses import StreamingResponse
+from pydantic import (
+    Field,
+    NonNegativeFloat,
+    PositiveFloat,
+    PositiveInt,
+    ValidationError,
+)
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import uuid
 
 from .side import Side
+from .task_events import TaskEvents
+from .task_socket import TaskSocket
 from .type_side import TypeSide
 
 from ..act import Act
+from ..admission import QueueDepths
+from ..claim_check import ClaimCheck
 from ..configure import Configure
 from ..context_memo import ContextMemo, NoneContextMemo
+from ..context_snapshots import ContextSnapshots
 from ..inner_memo import InnerMemo
-from ..helpers import unwrap_multilang_text_list
+from ..helpers import (
+    construct_answer,
+    is_error_answer,
+    unwrap_multilang_text_list,
+)
 from ..log import logger
+from ..result_cache import ResultCache, result_key
 from ..routes import about, context
 from ..savant_router import SavantRouter
 from ..task_progress_result import Progress, Result, Task
@@ -28,6 +50,17 @@ class AppearanceSide(Side):
         context_memo: ContextMemo,
         catch_progress: bool = True,
         catch_result: bool = True,
+        max_wait: PositiveFloat = 60.0,
+        events_keepalive: PositiveFloat = 15.0,
+        socket_max_subscriptions: PositiveInt = 1024,
+        socket_batch_interval: PositiveFloat = 0.1,
+        max_batch: PositiveInt = 1000,
+        result_cache: Optional[ResultCache] = None,
+        coalesce_tasks: bool = True,
+        in_flight_ttl: PositiveFloat = 120.0,
+        context_snapshots: Optional[ContextSnapshots] = None,
+        claim_check: Optional[ClaimCheck] = None,
+        queue_depths_interval: PositiveFloat = 1.0,
     ):
         assert not isinstance(
             context_memo, NoneContextMemo
@@ -38,11 +71,33 @@ class AppearanceSide(Side):
             savant_router=savant_router,
             acts=configure.acts,
             inner_memo=inner_memo,
+            claim_check=claim_check,
         )
 
         self.context_memo = context_memo
         self.catch_progress = catch_progress
         self.catch_result = catch_result
+        self.max_wait = max_wait
+        self.events_keepalive = events_keepalive
+        self.socket_max_subscriptions = socket_max_subscriptions
+        self.socket_batch_interval = socket_batch_interval
+        self.max_batch = max_batch
+        self.result_cache = result_cache or ResultCache()
+        self.coalesce_tasks = coalesce_tasks
+        self.in_flight_ttl = in_flight_ttl
+        self.context_snapshots = context_snapshots
+        self.task_events = TaskEvents()
+        self.queue_depths = QueueDepths(
+            savant_router.broker,
+            interval=queue_depths_interval,
+        )
+
+        # uid_task: the futures of result, see `_publish_task_and_wait()`
+        self._waiting_results: Dict[str, List[asyncio.Future]] = {}
+        # uid_task: (act, key), the published tasks waiting for result
+        self._published: OrderedDict[str, Tuple[Act, str]] = OrderedDict()
+        # key: (uid_task, seen_at), see `coalesce_tasks`
+        self._in_flight: Dict[str, Tuple[str, float]] = {}
 
         self._register_catchers_and_endpoints(configure)
 
@@ -69,6 +124,75 @@ class AppearanceSide(Side):
         description="Catch result from Savant and save it to inner memory without additional request to Keeper.",
     )
 
+    max_wait: PositiveFloat = Field(
+        ...,
+        title="Max Wait",
+        description="The limit for `wait` of task and response endpoints, in seconds.",
+    )
+
+    events_keepalive: PositiveFloat = Field(
+        ...,
+        title="Events Keepalive",
+        description="How often an idle stream of events sends a comment, in seconds.",
+    )
+
+    socket_max_subscriptions: PositiveInt = Field(
+        ...,
+        title="Socket Max Subscriptions",
+        description="The count of tasks one WebSocket connection can subscribe to.",
+    )
+
+    socket_batch_interval: PositiveFloat = Field(
+        ...,
+        title="Socket Batch Interval",
+        description="How long the events are collected into one WebSocket frame, in seconds.",
+    )
+
+    max_batch: PositiveInt = Field(
+        ...,
+        title="Max Batch",
+        description="The count of tasks in one batch.",
+    )
+
+    result_cache: ResultCache = Field(
+        ...,
+        title="Result Cache",
+        description="The uids of tasks with known results for the acts with `cache`.",
+    )
+
+    coalesce_tasks: bool = Field(
+        ...,
+        title="Coalesce Tasks",
+        description="A task with the same act and context as a task without result yet gets the uid of that task.",
+    )
+
+    in_flight_ttl: PositiveFloat = Field(
+        ...,
+        title="In-flight TTL",
+        description="A task without progress and result for longer isn't coalesced with: its run could crash or its messages could be lost. In seconds.",
+    )
+
+    context_snapshots: Optional[ContextSnapshots] = Field(
+        default=None,
+        title="Context Snapshots",
+        description="The published tasks carry `context_ref` instead of context when set. Brain should resolve the refs from the same snapshots.",
+    )
+
+    task_events: TaskEvents = Field(
+        ...,
+        title="Task Events",
+        description="Fan-out of caught progresses and results to the streams.",
+    )
+
+    queue_depths: QueueDepths = Field(
+        ...,
+        title="Queue Depths",
+        description="The depths of task queues for `Act.admission`.",
+    )
+
+    async def aclose(self) -> None:
+        await self.queue_depths.aclose()
+
     def _register_catchers_and_endpoints(self, configure: Configure):
         logger.info(
             f"🪶 Registering the catchers and client endpoint(s)"
@@ -87,6 +211,10 @@ class AppearanceSide(Side):
         context.add_routes(self.router, context_memo=self.context_memo)
         logger.info("🪶🍁 Added the routes for `Context`.")
 
+        # add task events route for all acts
+        self._events_register_socket()
+        logger.info("🪶🍁 Added the route for `Events`.")
+
         # add acts routes
         for act in self.acts:
             self._act_register_catchers_and_endpoints(act)
@@ -108,6 +236,9 @@ class AppearanceSide(Side):
         self._task_act_register_endpoint(act)
         n += 1
 
+        self._batch_act_register_endpoints(act)
+        n += 2
+
         self._request_progress_act_register_endpoint(act)
         n += 1
         self._response_progress_register_catcher_and_endpoint(act)
@@ -118,6 +249,9 @@ class AppearanceSide(Side):
         self._response_result_register_catcher_and_endpoint(act)
         n += 1
 
+        self._events_register_endpoint(act)
+        n += 1
+
         if self.catch_progress:
 
             @self.progressCatcher(
@@ -142,6 +276,14 @@ class AppearanceSide(Side):
 
             n += 1
 
+        if act.admission and act.admission.drops_tasks:
+
+            @self.droppedTaskCatcher(act.hid, catcher_side=TypeSide.APPEARANCE)
+            async def dropped_task_catcher(task: Task):
+                await self._catch_dropped_task(task)
+
+            n += 1
+
         logger.info(
             f"🪶 Registered {n} catchers and endpoints"
             f" for `{act.paths}`"
@@ -160,29 +302,333 @@ class AppearanceSide(Side):
             tags=unwrap_multilang_text_list(act.tags, "en"),  # type: ignore[override]
             # operation_id=act.hid,
         )
-        async def task_endpoint():
+        async def task_endpoint(response: Response, wait: NonNegativeFloat = 0):
             logger.info(f"Call endpoint `{act.path}` for act `{act.hid}`.")
+            if wait:
+                return await self._publish_task_and_wait(act, wait, response)
             return await self._publish_task(act)
 
-    async def _publish_task(self, act: Act):
-        uid = str(uuid.uuid4())
+    # Returns the uid of other task when the act has `cache` and
+    # the result for the same context is known, or when the same
+    # task is in flight, see `coalesce_tasks`.
+    async def _publish_task(self, act: Act, uid: Optional[str] = None):
+        uid = uid or str(uuid.uuid4())
+        context = self.context_memo.context.dict()
+        key = result_key(act.hid, act.version, context)
+
+        uid_attached = await self._attach(act, key, uid)
+        if uid_attached:
+            return uid_attached
+
         logger.info(f"Publish task `{uid}` with context `{self.context_memo.context}`.")
-        task = Task(
-            uid=uid,
-            hid_act=act.hid,
-            context=self.context_memo.context.dict(),
+        queue = self._task_queue(act)
+        try:
+            await self._admit(act)
+            task = await self._task(act, uid, context)
+            logger.info(
+                f"Publish a task `{short_json(task)}` to Savant:"
+                f" queue `{queue.name}`."
+            )
+            await self.push(task, queue=queue)
+        except aio_pika.exceptions.DeliveryError:
+            # the task queue is full, see `ActAdmission.max_length`
+            self._in_flight.pop(key, None)
+            raise self._too_many_tasks(act)
+        except Exception:
+            self._in_flight.pop(key, None)
+            raise
+
+        self._track_published(act, task.uid, key)
+
+        return task.uid
+
+    # Returns the uid of task with known result or in flight for `key`.
+    # Otherwise the task `uid` goes in flight, so a concurrent call
+    # attaches to it.
+    async def _attach(self, act: Act, key: str, uid: str) -> Optional[str]:
+        if act.cache:
+            uid_cached = await self._cached_uid(key)
+            if uid_cached:
+                logger.info(f"🎯 Found the result of task `{uid_cached}` in cache.")
+                return uid_cached
+
+        if self.coalesce_tasks:
+            uid_in_flight = self._uid_in_flight(key)
+            if uid_in_flight:
+                logger.info(f"🎯 Attached to the task `{uid_in_flight}` in flight.")
+                return uid_in_flight
+            self._in_flight[key] = (uid, time.monotonic())
+
+        return None
+
+    def _track_published(self, act: Act, uid: str, key: str):
+        if act.cache or self.coalesce_tasks:
+            self._published[uid] = (act, key)
+            # the results can be lost, don't wait for them forever
+            while len(self._published) > self.result_cache.max_entries:
+                _, (_, lost) = self._published.popitem(last=False)
+                self._in_flight.pop(lost, None)
+
+    async def _task(self, act: Act, uid: str, context: Dict[str, Any]) -> Task:
+        if self.context_snapshots is None:
+            return Task(uid=uid, hid_act=act.hid, context=context)
+
+        ref = await self.context_snapshots.aput(context)
+
+        return Task(uid=uid, hid_act=act.hid, context_ref=ref)
+
+    # Raises 429 when the task queue of act has no room for `count` tasks.
+    async def _admit(self, act: Act, count: int = 1):
+        if act.admission is None:
+            return
+
+        depth = await self.queue_depths.depth(self._task_queue(act))
+        if depth is None:
+            # don't reject the tasks while the broker can't tell
+            return
+
+        messages, consumers = depth
+        if act.admission.room(messages, consumers) < count:
+            logger.warning(
+                f"🚦 Rejected {count} task(s) of act `{act.hid}`:"
+                f" {messages} message(s) for {consumers} consumer(s)."
+            )
+            raise self._too_many_tasks(act)
+
+    def _too_many_tasks(self, act: Act) -> HTTPException:
+        retry_after = act.admission.retry_after if act.admission else 5
+        return HTTPException(
+            status_code=429,
+            detail=f"Too many tasks for act `{act.hid}`, retry later.",
+            headers={"Retry-After": str(retry_after)},
         )
-        queue = self.savant_router.taskQueue(
+
+    def _uid_in_flight(self, key: str) -> Optional[str]:
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            return None
+
+        uid, seen_at = in_flight
+        if time.monotonic() - seen_at > self.in_flight_ttl:
+            del self._in_flight[key]
+            return None
+
+        return uid
+
+    # The result of cached task can be already swept from the inner memo.
+    async def _cached_uid(self, key: str) -> Optional[str]:
+        uid = self.result_cache.get(key)
+        if uid is None:
+            return None
+
+        found = await self.inner_memo.aget_many([f"{uid}.response_result"])
+        if not found:
+            self.result_cache.forget(key)
+            return None
+
+        return uid
+
+    def _task_queue(self, act: Act):
+        return self.savant_router.taskQueue(
             act.hid,
             pusher_side=self.type,
             catcher_side=TypeSide.BRAIN,
         )
-        logger.info(
-            f"Publish a task `{short_json(task)}` to Savant:" f" queue `{queue.name}`."
+
+    # Returns the result when it's caught in `wait` seconds,
+    # otherwise the uid of task with status 202.
+    async def _publish_task_and_wait(
+        self,
+        act: Act,
+        wait: float,
+        response: Response,
+    ):
+        if not self.catch_result:
+            logger.warning("Can't wait for a result: the results aren't caught.")
+            response.status_code = 202
+            return await self._publish_task(act)
+
+        uid = str(uuid.uuid4())
+        # before the publish, so a fast result isn't missed
+        future = self._wait_result(uid)
+        try:
+            uid_published = await self._publish_task(act, uid=uid)
+            if uid_published != uid:
+                # cached or in flight
+                self._unwait_result(uid, future)
+                uid = uid_published
+                future = self._wait_result(uid)
+                key = f"{uid}.response_result"
+                found = await self.inner_memo.aget_many([key])
+                if found:
+                    return found[key]
+
+            return await asyncio.wait_for(future, timeout=min(wait, self.max_wait))
+        except asyncio.TimeoutError:
+            logger.info(f"The result of task `{uid}` didn't arrive in {wait}s.")
+            response.status_code = 202
+            return uid
+        finally:
+            self._unwait_result(uid, future)
+
+    def _wait_result(self, uid: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._waiting_results.setdefault(uid, []).append(future)
+
+        return future
+
+    def _unwait_result(self, uid: str, future: asyncio.Future):
+        futures = self._waiting_results.get(uid)
+        if futures is None:
+            return
+
+        if future in futures:
+            futures.remove(future)
+        if not futures:
+            del self._waiting_results[uid]
+
+    # BATCH
+    def _batch_act_register_endpoints(self, act: Act):
+        # publish tasks
+        # catcher: Brain
+        @self.router.post(
+            path=act.path_batch,
+            name=act.name_batch["en"],
+            summary=act.summary_batch["en"],
+            description=act.description_batch["en"],
+            tags=unwrap_multilang_text_list(act.tags_batch, "en"),  # type: ignore[override]
+            # operation_id=act.hid,
+        )
+        async def batch_endpoint(contexts: List[Dict[str, Any]] = Body(...)):
+            logger.info(f"Call endpoint `{act.path_batch}` for act `{act.hid}`.")
+            if not contexts or len(contexts) > self.max_batch:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Expected from 1 to {self.max_batch} contexts.",
+                )
+            return await self._publish_batch(act, contexts)
+
+        # aggregate progress of batch
+        # from inner memory
+        @self.router.get(
+            path=act.path_batch_progress,
+            name=act.name_batch_progress["en"],
+            summary=act.summary_batch_progress["en"],
+            description=act.description_batch_progress["en"],
+            tags=unwrap_multilang_text_list(act.tags_batch_progress, "en"),  # type: ignore[override]
+            # operation_id=act.hid,
         )
-        await self.push(task, queue=queue)
+        async def batch_progress_endpoint(uid_batch: str):
+            path = act.path_batch_progress.replace("{uid_batch}", uid_batch)
+            logger.info(f"Call the endpoint `{path}`.")
+            return await self._batch_progress(uid_batch)
+
+    # Every context overrides the current context for its task.
+    # A context with known result or in flight gets the uid of that task
+    # like `_publish_task()` does.
+    async def _publish_batch(self, act: Act, contexts: List[Dict[str, Any]]):
+        merged = self._merge_contexts(contexts)
+
+        uids = []
+        # (uid, key, context) of the tasks to publish
+        new: List[Tuple[str, str, Dict[str, Any]]] = []
+        for context in merged:
+            uid = str(uuid.uuid4())
+            key = result_key(act.hid, act.version, context)
+            uid_attached = await self._attach(act, key, uid)
+            if uid_attached:
+                uids.append(uid_attached)
+                continue
+            uids.append(uid)
+            new.append((uid, key, context))
+
+        uid_batch = str(uuid.uuid4())
+        queue = self._task_queue(act)
+        try:
+            await self._admit(act, count=len(new))
+            tasks = await asyncio.gather(
+                *(self._task(act, uid, context) for uid, _, context in new)
+            )
+            # before the publish, so the progress of batch is known right away
+            await self.inner_memo.aput(f"{uid_batch}.batch", uids)
 
-        return task.uid
+            logger.info(
+                f"Publish a batch `{uid_batch}` of {len(tasks)} task(s) to Savant:"
+                f" queue `{queue.name}`."
+            )
+            await self.push_many(tasks, queue=queue)
+        except aio_pika.exceptions.DeliveryError:
+            # the task queue is full, a part of batch can be published
+            self._land(new)
+            raise self._too_many_tasks(act)
+        except Exception:
+            self._land(new)
+            raise
+
+        for uid, key, _ in new:
+            self._track_published(act, uid, key)
+
+        return {"uid_batch": uid_batch, "uids": uids}
+
+    # The tasks aren't in flight when their publish failed.
+    def _land(self, tasks: List[Tuple[str, str, Dict[str, Any]]]):
+        for uid, key, _ in tasks:
+            if self._in_flight.get(key, ("",))[0] == uid:
+                del self._in_flight[key]
+
+    # Validates the merged contexts as the class of current context,
+    # none of tasks is published when any context is invalid.
+    def _merge_contexts(
+        self,
+        contexts: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        current = self.context_memo.context
+        context = current.dict()
+
+        merged = []
+        invalid = []
+        for i, override in enumerate(contexts):
+            try:
+                valid = type(current).model_validate({**context, **override})
+                merged.append(valid.model_dump())
+            except ValidationError as ex:
+                invalid.append(
+                    {
+                        "index": i,
+                        "errors": ex.errors(include_url=False, include_context=False),
+                    }
+                )
+
+        if invalid:
+            raise HTTPException(status_code=422, detail=invalid)
+
+        return merged
+
+    # A task with result is 100 %, a task without progress is 0 %.
+    async def _batch_progress(self, uid_batch: str):
+        uids = await self.inner_memo.aget(f"{uid_batch}.batch")
+        if not uids:
+            raise HTTPException(status_code=404, detail="Batch not found.")
+
+        keys = [f"{uid}.response_progress" for uid in uids] + [
+            f"{uid}.response_result" for uid in uids
+        ]
+        values = await self.inner_memo.aget_many(keys)
+
+        done = sum(f"{uid}.response_result" in values for uid in uids)
+        progresses = [
+            100.0
+            if f"{uid}.response_result" in values
+            else float(values.get(f"{uid}.response_progress") or 0.0)
+            for uid in uids
+        ]
+
+        return {
+            "uid_batch": uid_batch,
+            "progress": sum(progresses) / len(progresses),
+            "done": done,
+            "total": len(uids),
+        }
 
     # PROGRESS
     def _request_progress_act_register_endpoint(self, act: Act):
@@ -236,20 +682,43 @@ class AppearanceSide(Side):
             tags=unwrap_multilang_text_list(act.tags_response_progress, "en"),  # type: ignore[override]
             # operation_id=act.hid,
         )
-        async def response_progress_endpoint(uid_task: str):
+        async def response_progress_endpoint(uid_task: str, wait: NonNegativeFloat = 0):
             path = act.path_response_progress.replace("{uid_task}", uid_task)
             logger.info(f"Call the endpoint `{path}`.")
 
             key = f"{uid_task}.response_progress"
 
-            return self.inner_memo.get(key)
+            return await self._memo_value(key, wait=wait)
+
+    # Waits up to `wait` seconds for an absent value.
+    async def _memo_value(self, key: str, wait: float):
+        if not wait:
+            return await self.inner_memo.aget(key)
+
+        try:
+            return await self.inner_memo.wait_for(key, timeout=min(wait, self.max_wait))
+        except asyncio.TimeoutError:
+            logger.info(f"The key `{key}` didn't arrive in {wait}s.")
+            return ""
 
     async def _catch_progress(self, progress: Progress):
         logger.info(f"Catched a response progress `{progress}`.")
         if isinstance(progress, dict):
             progress = Progress.model_validate(progress)
         key = f"{progress.uid_task}.response_progress"
-        self.inner_memo.put(key, progress.value)
+        await self.inner_memo.aput(key, progress.value)
+        self.task_events.publish(progress)
+        self._touch_in_flight(progress.uid_task)
+
+    # The task in flight is alive while its progress comes.
+    def _touch_in_flight(self, uid_task: str):
+        published = self._published.get(uid_task)
+        if published is None:
+            return
+
+        _, key = published
+        if self._in_flight.get(key, ("",))[0] == uid_task:
+            self._in_flight[key] = (uid_task, time.monotonic())
 
     # RESULT
     def _request_result_act_register_endpoint(self, act: Act):
@@ -290,7 +759,7 @@ class AppearanceSide(Side):
             catcher_side=TypeSide.APPEARANCE,
         )
         async def response_result_catcher(result: Result):
-            await self._catch_result(result)
+            await self._catch_response_result(result)
 
         # response result endpoint
         # returns a result value after call a request_result_endpoint and
@@ -303,17 +772,119 @@ class AppearanceSide(Side):
             tags=unwrap_multilang_text_list(act.tags_response_result, "en"),  # type: ignore[override]
             # operation_id=act.hid,
         )
-        async def response_result_endpoint(uid_task: str):
+        async def response_result_endpoint(uid_task: str, wait: NonNegativeFloat = 0):
             path = act.path_response_result.replace("{uid_task}", uid_task)
             logger.info(f"Call the endpoint `{path}`.")
 
             key = f"{uid_task}.response_result"
 
-            return self.inner_memo.get(key)
+            return await self._memo_value(key, wait=wait)
+
+    # Keeper answers "" while the task has no result.
+    async def _catch_response_result(self, result: Result):
+        if isinstance(result, dict):
+            result = Result.model_validate(result)
+        if result.value_ref is None and result.value in (None, ""):
+            logger.info(f"Catched no result of task `{result.uid_task}` yet.")
+            return
+
+        await self._catch_result(result)
 
     async def _catch_result(self, result: Result):
         logger.info(f"Catched a response result `{short_json(result)}`.")
         if isinstance(result, dict):
             result = Result.model_validate(result)
+        try:
+            result = await self.check_out(result)
+        except KeyError:
+            # answer anyway, so the task doesn't stay in flight
+            error = Exception(
+                f"Not found a value `{result.value_ref}` of `{result.uid_task}`."
+            )
+            result = Result(uid_task=result.uid_task, value=construct_answer(error=error))
         key = f"{result.uid_task}.response_result"
-        self.inner_memo.put(key, result.value)
+        await self.inner_memo.aput(key, result.value)
+        self.task_events.publish(result)
+
+        for future in self._waiting_results.pop(result.uid_task, []):
+            if not future.done():
+                future.set_result(result.value)
+
+        published = self._published.pop(result.uid_task, None)
+        if published is not None:
+            act, key = published
+            if self._in_flight.get(key, ("",))[0] == result.uid_task:
+                del self._in_flight[key]
+            # a failure can be transient, don't serve it again
+            if act.cache and not is_error_answer(result.value):
+                self.result_cache.put(key, result.uid_task, result.value, act.cache)
+
+    # The task queue was full and the task was dropped, answer it
+    # to all sides like Brain does.
+    async def _catch_dropped_task(self, task: Task):
+        if isinstance(task, dict):
+            task = Task.model_validate(task)
+        ts = short_json(task, exclude={"context"})
+        logger.warning(f"🚮 Dropped the task `{ts}`: the task queue is full.")
+
+        error = Exception(f"The task queue of `{task.hid_act}` is full.")
+        result = Result(uid_task=task.uid, value=construct_answer(error=error))
+        key = self.savant_router.resultKey(task.hid_act, pusher_side=TypeSide.BRAIN)
+        await self.push(result, queue=key)
+
+    # EVENTS
+    def _events_register_endpoint(self, act: Act):
+        # stream of progress and result
+        # fed by catchers above
+        @self.router.get(
+            path=act.path_events,
+            name=act.name_events["en"],
+            summary=act.summary_events["en"],
+            description=act.description_events["en"],
+            tags=unwrap_multilang_text_list(act.tags_events, "en"),  # type: ignore[override]
+            response_class=StreamingResponse,
+            # operation_id=act.hid,
+        )
+        async def events_endpoint(uid_task: str):
+            path = act.path_events.replace("{uid_task}", uid_task)
+            logger.info(f"Call the endpoint `{path}`.")
+
+            return StreamingResponse(
+                self._events(uid_task),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+    # subscribe to many tasks in one connection, see `TaskSocket`
+    def _events_register_socket(self):
+        @self.router.websocket("/events")
+        async def events_socket(websocket: WebSocket):
+            await TaskSocket(
+                websocket,
+                task_events=self.task_events,
+                max_subscriptions=self.socket_max_subscriptions,
+                batch_interval=self.socket_batch_interval,
+            ).serve()
+
+    # See https://html.spec.whatwg.org/multipage/server-sent-events.html
+    async def _events(self, uid_task: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.task_events.listen(uid_task, queue.put_nowait)
+        logger.info(f"📡 Streaming the events of task `{uid_task}`...")
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=self.events_keepalive
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                kind = "result" if isinstance(event, Result) else "progress"
+                yield f"event: {kind}\ndata: {event.model_dump_json()}\n\n"
+                if kind == "result":
+                    break
+        finally:
+            self.task_events.unlisten(uid_task, queue.put_nowait)
+            logger.info(f"📡 Stopped streaming the events of task `{uid_task}`.")
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from pydantic import Field, PositiveInt
+from typing import Callable, Dict, List, Union
+
+from ..log import logger
+from ..task_progress_result import Progress, Result
+
+
+TaskEvent = Union[Progress, Result]
+Listener = Callable[[TaskEvent], None]
+
+
+class TaskEvents:
+    """
+    In-process fan-out of the caught progresses and results of tasks
+    to their listeners. The last event of `keep_last` recent tasks is
+    replayed to a new listener, so it doesn't miss a finished task.
+    """
+
+    def __init__(self, keep_last: PositiveInt = 1024):
+        self.name = type(self).__name__
+        self.keep_last = keep_last
+
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._last: OrderedDict[str, TaskEvent] = OrderedDict()
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of fan-out. Set by class.",
+    )
+
+    keep_last: PositiveInt = Field(
+        default=1024,
+        title="Keep Last",
+        description="The count of tasks with the remembered last event.",
+    )
+
+    @property
+    def listeners_count(self) -> int:
+        return sum(len(listeners) for listeners in self._listeners.values())
+
+    def listen(self, uid_task: str, listener: Listener):
+        self._listeners.setdefault(uid_task, []).append(listener)
+
+        last = self._last.get(uid_task)
+        if last is not None:
+            listener(last)
+
+    def unlisten(self, uid_task: str, listener: Listener):
+        listeners = self._listeners.get(uid_task)
+        if listeners is None:
+            return
+
+        try:
+            listeners.remove(listener)
+        except ValueError:
+            pass
+        if not listeners:
+            del self._listeners[uid_task]
+
+    # Call from the event loop.
+    def publish(self, event: TaskEvent):
+        uid_task = event.uid_task
+        self._last[uid_task] = event
+        self._last.move_to_end(uid_task)
+        while len(self._last) > self.keep_last:
+            self._last.popitem(last=False)
+
+        for listener in list(self._listeners.get(uid_task, ())):
+            try:
+                listener(event)
+            except Exception as ex:
+                logger.error(f"`{self.name}`: the listener of `{uid_task}` failed: {ex}")
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,143 @@
+import asyncio
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import Field, PositiveFloat, PositiveInt
+from typing import Any, Dict, List, Optional, Set
+
+from .task_events import TaskEvent, TaskEvents
+
+from ..log import logger
+from ..task_progress_result import Result
+
+
+class TaskSocket:
+    """
+    One WebSocket connection subscribed to many tasks.
+
+    The client sends `{"subscribe": [uid_task, ...]}` and
+    `{"unsubscribe": [uid_task, ...]}`, the server sends
+    `{"events": [{"type": "progress" | "result", "uid_task": ..., "value": ...}]}`
+    batched every `batch_interval` seconds.
+
+    While the client is slow, only the latest event per task waits to be sent,
+    so the memory of connection is bounded by `max_subscriptions`.
+    A task is unsubscribed after its result.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        task_events: TaskEvents,
+        max_subscriptions: PositiveInt = 1024,
+        batch_interval: PositiveFloat = 0.1,
+    ):
+        self.websocket = websocket
+        self.task_events = task_events
+        self.max_subscriptions = max_subscriptions
+        self.batch_interval = batch_interval
+
+        self._subscriptions: Set[str] = set()
+        self._pending: Dict[str, TaskEvent] = {}
+        self._ready = asyncio.Event()
+
+    websocket: WebSocket = Field(
+        ...,
+        title="WebSocket",
+        description="The connection with client.",
+    )
+
+    task_events: TaskEvents = Field(
+        ...,
+        title="Task Events",
+        description="Fan-out of caught progresses and results.",
+    )
+
+    max_subscriptions: PositiveInt = Field(
+        default=1024,
+        title="Max Subscriptions",
+        description="The count of tasks the connection can subscribe to.",
+    )
+
+    batch_interval: PositiveFloat = Field(
+        default=0.1,
+        title="Batch Interval",
+        description="How long the events are collected into one frame, in seconds.",
+    )
+
+    async def serve(self):
+        await self.websocket.accept()
+        logger.info("🔌 Accepted a connection for task events.")
+
+        sender = asyncio.get_running_loop().create_task(self._send_batches())
+        try:
+            while True:
+                message = await self.websocket.receive_json()
+                error = self._handle(message)
+                if error:
+                    await self.websocket.send_json({"error": error})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            for uid_task in list(self._subscriptions):
+                self._unsubscribe(uid_task)
+            logger.info("🔌 Closed a connection for task events.")
+
+    def _handle(self, message: Any) -> Optional[str]:
+        if not isinstance(message, dict):
+            return "Expected an object."
+
+        subscribe = message.get("subscribe", [])
+        unsubscribe = message.get("unsubscribe", [])
+        if not isinstance(subscribe, list) or not isinstance(unsubscribe, list):
+            return "Expected lists of `uid_task`."
+
+        for uid_task in unsubscribe:
+            self._unsubscribe(str(uid_task))
+
+        new = [
+            uid_task
+            for uid_task in dict.fromkeys(str(uid_task) for uid_task in subscribe)
+            if uid_task not in self._subscriptions
+        ]
+        if len(self._subscriptions) + len(new) > self.max_subscriptions:
+            return f"Can't subscribe to more than {self.max_subscriptions} tasks."
+
+        for uid_task in new:
+            self._subscriptions.add(uid_task)
+            self.task_events.listen(uid_task, self._catch)
+
+        return None
+
+    def _unsubscribe(self, uid_task: str):
+        if uid_task in self._subscriptions:
+            self._subscriptions.discard(uid_task)
+            self.task_events.unlisten(uid_task, self._catch)
+
+    def _catch(self, event: TaskEvent):
+        pending = self._pending.get(event.uid_task)
+        # a result is final, a late progress doesn't replace it
+        if not isinstance(pending, Result):
+            self._pending[event.uid_task] = event
+        if isinstance(event, Result):
+            self._unsubscribe(event.uid_task)
+
+        self._ready.set()
+
+    async def _send_batches(self):
+        while True:
+            await self._ready.wait()
+            await asyncio.sleep(self.batch_interval)
+            self._ready.clear()
+
+            events, self._pending = self._pending, {}
+            await self.websocket.send_json({"events": _frames(events.values())})
+
+
+def _frames(events) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": "result" if isinstance(event, Result) else "progress",
+            **event.model_dump(mode="json"),
+        }
+        for event in events
+    ]
@@ -0,0 +1,165 @@
+import asyncio
+from pydantic import Field, PositiveFloat
+from typing import Any, Dict, List, Optional, Tuple
+
+from .inner_memo import InnerMemo
+from .log import logger
+from .memo_brokers.memo_broker import MemoBroker
+from .memo_hub import MemoHub
+
+
+class WriteBehindInnerMemo(InnerMemo):
+    """
+    Keeps the latest value per key in memory and writes the dirty keys
+    to the broker on an interval or when a key with one of `flush_suffixes`
+    arrives: the many progress values of a task become one write.
+    """
+
+    def __init__(
+        self,
+        broker: MemoBroker,
+        flush_interval: PositiveFloat = 1.0,
+        flush_suffixes: Tuple[str, ...] = (
+            ".result",
+            ".result_ref",
+            ".response_result",
+        ),
+        hub: Optional[MemoHub] = None,
+    ):
+        super().__init__(broker=broker, hub=hub)
+
+        self.flush_interval = flush_interval
+        self.flush_suffixes = flush_suffixes
+
+        self._dirty: Dict[str, Any] = {}
+        self._flushing: Dict[str, Any] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` with broker `{self.broker}`"
+            f" and flush interval {self.flush_interval}s."
+        )
+
+    flush_interval: PositiveFloat = Field(
+        ...,
+        title="Flush Interval",
+        description="How often the dirty keys are written to the broker, in seconds.",
+    )
+
+    flush_suffixes: Tuple[str, ...] = Field(
+        ...,
+        title="Flush Suffixes",
+        description="The keys with these suffixes flush all dirty keys of their task right away.",
+    )
+
+    def get(self, key: str) -> Any:
+        if key in self._dirty:
+            return self._dirty[key]
+        if key in self._flushing:
+            return self._flushing[key]
+        return super().get(key)
+
+    # write-through: the sync callers don't live on the event loop
+    def put(self, key: str, value: Any) -> None:
+        self._dirty.pop(key, None)
+        return super().put(key, value)
+
+    def delete(self, key: str) -> None:
+        self._dirty.pop(key, None)
+        return super().delete(key)
+
+    async def aput(self, key: str, value: Any) -> None:
+        self._dirty[key] = value
+        self._ensure_flusher()
+
+        if key.endswith(self.flush_suffixes):
+            await self.flush(_task_prefix(key))
+
+        # after the flush, so other processes can read it from the broker
+        self.hub.notify(key, value)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        r: Dict[str, Any] = {}
+        absent = []
+        for key in keys:
+            if key in self._dirty:
+                r[key] = self._dirty[key]
+            elif key in self._flushing:
+                r[key] = self._flushing[key]
+            else:
+                absent.append(key)
+
+        if absent:
+            r.update(await super().aget_many(absent))
+
+        return r
+
+    async def adelete(self, key: str) -> None:
+        self._dirty.pop(key, None)
+        return await super().adelete(key)
+
+    async def flush(self, prefix: str = "") -> None:
+        """
+        Writes the dirty keys started with `prefix` to the broker.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            keys = [key for key in self._dirty if key.startswith(prefix)]
+            for key in keys:
+                self._flushing[key] = self._dirty.pop(key)
+
+            try:
+                for key in keys:
+                    try:
+                        await self.broker.aput(key, self._flushing[key])
+                    except Exception as ex:
+                        logger.error(
+                            f"`{self.name}`: can't flush the key `{key}`: {ex}"
+                        )
+                        # don't lose a value that wasn't overwritten meanwhile
+                        self._dirty.setdefault(key, self._flushing[key])
+                    del self._flushing[key]
+            finally:
+                # the flush was cancelled, the keys not written are dirty again
+                for key in keys:
+                    if key in self._flushing:
+                        self._dirty.setdefault(key, self._flushing.pop(key))
+
+    async def aclose(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await super().aclose()
+
+    async def _aget(self, key: str) -> Any:
+        if key in self._dirty:
+            return self._dirty[key]
+        if key in self._flushing:
+            return self._flushing[key]
+        return await super()._aget(key)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(
+                self._flush_periodically()
+            )
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._dirty:
+                await self.flush()
+
+
+# "{uid_task}.progress" -> "{uid_task}."
+def _task_prefix(key: str) -> str:
+    return f"{key.rsplit('.', 1)[0]}."
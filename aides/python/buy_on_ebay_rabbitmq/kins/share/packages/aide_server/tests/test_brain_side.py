@@ -0,0 +1,176 @@
+import asyncio
+from fastapi import APIRouter
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.act_pools import blocking
+from ..src.aide_server.helpers import act_run, is_error_answer
+from ..src.aide_server.savant_router import SavantRouter
+from ..src.aide_server.sides.brain_side import BrainSide, _dispatch_table
+from ..src.aide_server.task_progress_result import Progress, Result, Task
+
+
+def _act(hid: str) -> Act:
+    return Act(
+        hid=hid,
+        name={"en": hid},
+        summary={"en": hid},
+        description={"en": hid},
+        tags=[],
+    )
+
+
+async def first(task, publish_progress, publish_result):
+    pass
+
+
+async def second(task, publish_progress, publish_result):
+    pass
+
+
+class TestDispatchTable(unittest.TestCase):
+    def test_run_by_name(self):
+        acts = [_act("first"), _act("second")]
+        dispatch = _dispatch_table(acts, [first, second], strict=True)
+
+        self.assertEqual({"first": first, "second": second}, dispatch)
+
+    def test_registered_run_first(self):
+        @act_run("first")
+        async def explicit(task, publish_progress, publish_result):
+            pass
+
+        dispatch = _dispatch_table([_act("first")], [first, explicit], strict=True)
+
+        self.assertIs(explicit, dispatch["first"])
+
+    def test_ambiguous_runs(self):
+        @act_run("first")
+        async def one(task, publish_progress, publish_result):
+            pass
+
+        @act_run("first")
+        async def other(task, publish_progress, publish_result):
+            pass
+
+        with self.assertRaises(Exception) as raised:
+            _dispatch_table([_act("first")], [one, other], strict=True)
+        self.assertIn("several runs", str(raised.exception))
+
+    def test_no_substring_match(self):
+        async def first_extended(task, publish_progress, publish_result):
+            pass
+
+        with self.assertRaises(Exception):
+            _dispatch_table([_act("first")], [first_extended], strict=True)
+
+    def test_absent_run(self):
+        acts = [_act("first"), _act("third")]
+        with self.assertRaises(Exception):
+            _dispatch_table(acts, [first], strict=True)
+
+        dispatch = _dispatch_table(acts, [first], strict=False)
+        self.assertEqual({"first": first}, dispatch)
+
+    def test_cpu_bound_run(self):
+        @act_run("first")
+        @blocking(cpu_bound=True)
+        def heavy(task, publish_progress, publish_result):
+            pass
+
+        with self.assertRaises(Exception):
+            _dispatch_table([_act("first")], [heavy], strict=True)
+
+
+class TestBrainCoalescing(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = []
+        self.finish = asyncio.Event()
+        self.fail = False
+
+        async def act(task, publish_progress, publish_result):
+            self.calls.append(task.uid)
+            await publish_progress(task, 0)
+            await self.finish.wait()
+            if self.fail:
+                raise Exception("The run failed.")
+            await publish_result(task, {"raw_result": task.uid})
+
+        acts = [_act("act")]
+        self.brain = BrainSide(
+            APIRouter(),
+            SavantRouter("amqp://localhost", "test", "brain", acts),
+            acts,
+            [act],
+        )
+
+        self.results = {}
+        self.on_result = None
+
+        async def push(message, queue):
+            if isinstance(message, Result):
+                self.results.setdefault(message.uid_task, []).append(message.value)
+                if self.on_result is not None:
+                    on_result, self.on_result = self.on_result, None
+                    await on_result()
+            else:
+                self.assertIsInstance(message, Progress)
+
+        self.brain.push = push  # type: ignore[method-assign]
+
+    def _task(self, uid: str) -> Task:
+        return Task(uid=uid, hid_act="act", context={"text": "same"})
+
+    async def test_follower_gets_result_of_leader(self):
+        leader = asyncio.create_task(self.brain._run_task(self._task("a")))
+        await asyncio.sleep(0)
+        await self.brain._run_task(self._task("b"))
+
+        self.finish.set()
+        await leader
+
+        self.assertEqual(["a"], self.calls)
+        self.assertEqual([{"raw_result": "a"}], self.results["a"])
+        self.assertEqual([{"raw_result": "a"}], self.results["b"])
+        self.assertEqual({}, self.brain._in_flight)
+
+    async def test_task_caught_while_result_is_published_runs_again(self):
+        late = []
+
+        async def catch_late_task():
+            late.append(asyncio.create_task(self.brain._run_task(self._task("c"))))
+            await asyncio.sleep(0)
+
+        self.on_result = catch_late_task
+
+        leader = asyncio.create_task(self.brain._run_task(self._task("a")))
+        await asyncio.sleep(0)
+        await self.brain._run_task(self._task("b"))
+
+        self.finish.set()
+        await leader
+        await late[0]
+
+        self.assertEqual(["a", "c"], self.calls)
+        self.assertEqual(1, len(self.results["b"]))
+        self.assertEqual([{"raw_result": "c"}], self.results["c"])
+        self.assertEqual({}, self.brain._in_flight)
+
+    async def test_followers_get_error_of_leader(self):
+        self.fail = True
+
+        leader = asyncio.create_task(self.brain._run_task(self._task("a")))
+        await asyncio.sleep(0)
+        await self.brain._run_task(self._task("b"))
+
+        self.finish.set()
+        with self.assertRaises(Exception):
+            await leader
+
+        self.assertTrue(is_error_answer(self.results["a"][0]))
+        self.assertTrue(is_error_answer(self.results["b"][0]))
+        self.assertEqual({}, self.brain._in_flight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+from fastapi import APIRouter
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.concurrency import ActConcurrency
+from ..src.aide_server.savant_router import SavantRouter
+from ..src.aide_server.sides.brain_side import BrainSide
+from ..src.aide_server.sides.concurrency_limits import ConcurrencyLimits
+from ..src.aide_server.task_progress_result import Task
+
+
+def _act(hid: str, **kwargs) -> Act:
+    return Act(
+        hid=hid,
+        name={"en": hid},
+        summary={"en": hid},
+        description={"en": hid},
+        tags=[],
+        **kwargs,
+    )
+
+
+class TestConcurrencyLimits(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.limits = ConcurrencyLimits(
+            [_act("limited", concurrency=ActConcurrency(max_running=2)), _act("free")]
+        )
+        self.release = asyncio.Event()
+
+    async def _hold(self, hid_act: str):
+        async with self.limits.slot(hid_act):
+            await self.release.wait()
+
+    async def test_limit(self):
+        holders = [asyncio.create_task(self._hold("limited")) for _ in range(4)]
+        holders += [asyncio.create_task(self._hold("free")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(
+            {
+                "limited": {"running": 2, "waiting": 2, "limit": 2},
+                "free": {"running": 3, "waiting": 0, "limit": None},
+            },
+            self.limits.stats,
+        )
+
+        self.release.set()
+        await asyncio.gather(*holders)
+        self.assertEqual(0, self.limits.stats["limited"]["running"])
+        self.assertEqual(0, self.limits.stats["limited"]["waiting"])
+
+    async def test_cancelled_waiter_isnt_counted(self):
+        holders = [asyncio.create_task(self._hold("limited")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        holders[2].cancel()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(0, self.limits.stats["limited"]["waiting"])
+
+        self.release.set()
+        await asyncio.gather(*holders[:2])
+        self.assertEqual(0, self.limits.stats["limited"]["running"])
+
+    def test_prefetch(self):
+        self.assertEqual(6, ActConcurrency(max_running=3).prefetch_count)
+        self.assertEqual(4, ActConcurrency(max_running=3, prefetch=4).prefetch_count)
+
+        router = SavantRouter("amqp://localhost", "test", "brain", [])
+        self.assertIs(router.prefetchBroker(4), router.prefetchBroker(4))
+        self.assertIsNot(router.prefetchBroker(4), router.prefetchBroker(6))
+
+
+class TestBrainConcurrency(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_are_limited(self):
+        running = 0
+        most = 0
+
+        async def act(task, publish_progress, publish_result):
+            nonlocal running, most
+            running += 1
+            most = max(most, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            await publish_result(task, {"raw_result": task.uid})
+
+        acts = [_act("act", concurrency=ActConcurrency(max_running=2))]
+        brain = BrainSide(
+            APIRouter(),
+            SavantRouter("amqp://localhost", "test", "brain", acts),
+            acts,
+            [act],
+        )
+
+        async def push(message, queue):
+            pass
+
+        brain.push = push  # type: ignore[method-assign]
+
+        await asyncio.gather(
+            *(
+                brain._run_task(Task(uid=str(i), hid_act="act", context={"i": i}))
+                for i in range(6)
+            )
+        )
+
+        self.assertEqual(2, most)
+        self.assertEqual(0, brain.concurrency_limits.stats["act"]["running"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from fastapi import APIRouter
+from typing import Any, Dict, List
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.context_snapshots import ContextSnapshots
+from ..src.aide_server.helpers import is_error_answer
+from ..src.aide_server.memo_brokers.memo_broker import MemoBroker
+from ..src.aide_server.savant_router import SavantRouter
+from ..src.aide_server.sides.brain_side import BrainSide
+from ..src.aide_server.task_progress_result import Result, Task
+
+
+class _DictMemoBroker(MemoBroker):
+    def __init__(self):
+        super().__init__()
+        self.values: Dict[str, Any] = {}
+        self.writes: List[str] = []
+
+    def get(self, key: str) -> Any:
+        return self.values[key]
+
+    def put(self, key: str, value: Any):
+        self.writes.append(key)
+        self.values[key] = value
+
+    def delete(self, key: str):
+        del self.values[key]
+
+
+class TestContextSnapshots(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.broker = _DictMemoBroker()
+        self.snapshots = ContextSnapshots(self.broker)
+
+    async def test_snapshot_is_stored_once(self):
+        ref = await self.snapshots.aput({"a": 1, "b": "тест"})
+
+        self.assertEqual(ref, await self.snapshots.aput({"b": "тест", "a": 1}))
+        self.assertEqual([ref], self.broker.writes)
+        self.assertEqual({"a": 1, "b": "тест"}, await self.snapshots.aget(ref))
+
+    async def test_known_snapshot_is_written_again_after_ttl(self):
+        snapshots = ContextSnapshots(self.broker, known_ttl=1e-9)
+        ref = await snapshots.aput({"a": 1})
+        await snapshots.aput({"a": 1})
+
+        self.assertEqual([ref, ref], self.broker.writes)
+
+    async def test_resolve(self):
+        ref = await self.snapshots.aput({"a": 1})
+
+        task = await self.snapshots.aresolve(
+            Task(uid="task", hid_act="act", context_ref=ref)
+        )
+        self.assertEqual({"a": 1}, task.context)
+
+        with self.assertRaises(KeyError):
+            await self.snapshots.aresolve(
+                Task(uid="task", hid_act="act", context_ref="absent")
+            )
+
+
+class TestBrainContextSnapshots(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.snapshots = ContextSnapshots(_DictMemoBroker())
+        self.contexts = []
+
+        async def act(task, publish_progress, publish_result):
+            self.contexts.append(task.context)
+            await publish_result(task, {"raw_result": "done"})
+
+        acts = [
+            Act(
+                hid="act",
+                name={"en": "act"},
+                summary={"en": "act"},
+                description={"en": "act"},
+                tags=[],
+            )
+        ]
+        self.brain = BrainSide(
+            APIRouter(),
+            SavantRouter("amqp://localhost", "test", "brain", acts),
+            acts,
+            [act],
+            context_snapshots=self.snapshots,
+        )
+
+        self.results = []
+
+        async def push(message, queue):
+            if isinstance(message, Result):
+                self.results.append(message.value)
+
+        self.brain.push = push  # type: ignore[method-assign]
+
+    async def test_context_is_resolved(self):
+        ref = await self.snapshots.aput({"text": "same"})
+        await self.brain._run_task(Task(uid="task", hid_act="act", context_ref=ref))
+
+        self.assertEqual([{"text": "same"}], self.contexts)
+        self.assertFalse(is_error_answer(self.results[0]))
+
+    async def test_absent_snapshot_is_answered(self):
+        await self.brain._run_task(
+            Task(uid="task", hid_act="act", context_ref="absent")
+        )
+
+        self.assertEqual([], self.contexts)
+        self.assertTrue(is_error_answer(self.results[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
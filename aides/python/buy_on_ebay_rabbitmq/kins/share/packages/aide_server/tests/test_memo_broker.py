@@ -0,0 +1,52 @@
+import threading
+from typing import Any, Dict
+import unittest
+
+from ..src.aide_server.inner_memo import InnerMemo
+from ..src.aide_server.memo_brokers.memo_broker import MemoBroker
+
+
+class _DictMemoBroker(MemoBroker):
+    def __init__(self):
+        super().__init__()
+        self.values: Dict[str, Any] = {}
+        self.threads = set()
+
+    def get(self, key: str) -> Any:
+        self.threads.add(threading.get_ident())
+        return self.values[key]
+
+    def put(self, key: str, value: Any):
+        self.threads.add(threading.get_ident())
+        self.values[key] = value
+
+    def delete(self, key: str):
+        self.threads.add(threading.get_ident())
+        del self.values[key]
+
+
+class TestAsyncMemoBroker(unittest.IsolatedAsyncioTestCase):
+    async def test_blocking_methods_are_offloaded(self):
+        broker = _DictMemoBroker()
+
+        await broker.aput("a", 1)
+        await broker.aput_many({"b": 2, "c": 3})
+        self.assertEqual(1, await broker.aget("a"))
+        self.assertEqual({"a": 1, "c": 3}, await broker.aget_many(["a", "c", "x"]))
+        await broker.adelete("a")
+        with self.assertRaises(KeyError):
+            await broker.aget("a")
+
+        self.assertNotIn(threading.get_ident(), broker.threads)
+
+    async def test_inner_memo_absent_key(self):
+        memo = InnerMemo(_DictMemoBroker())
+
+        self.assertEqual("", await memo.aget("absent"))
+        await memo.aput("present", {"value": 1})
+        self.assertEqual({"value": 1}, await memo.aget("present"))
+        await memo.adelete("absent")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.progress_throttle import ActProgress, ProgressThrottle
+from ..src.aide_server.task_progress_result import Task
+
+
+def _act(hid: str, progress: ActProgress) -> Act:
+    return Act(
+        hid=hid,
+        name={"en": hid},
+        summary={"en": hid},
+        description={"en": hid},
+        tags=[],
+        progress=progress,
+    )
+
+
+class TestProgressThrottle(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.published = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+        async def publish(task: Task, progress: float):
+            await self.release.wait()
+            self.published.append((task.uid, progress))
+
+        act = _act("act", ActProgress(min_delta=5.0, min_interval=0.05))
+        self.throttle = ProgressThrottle([act], publish=publish)
+        self.task = Task(uid="task", hid_act="act")
+
+    async def test_small_delta_is_dropped(self):
+        self.assertTrue(await self.throttle.progress(self.task, 10))
+        self.assertFalse(await self.throttle.progress(self.task, 12))
+
+        self.assertEqual([("task", 10)], self.published)
+
+    async def test_0_and_100_are_always_published(self):
+        await self.throttle.progress(self.task, 0)
+        self.assertTrue(await self.throttle.progress(self.task, 0))
+        self.assertTrue(await self.throttle.progress(self.task, 100))
+
+        self.assertEqual([("task", 0), ("task", 0), ("task", 100)], self.published)
+
+    async def test_deferred_progress_is_flushed(self):
+        await self.throttle.progress(self.task, 10)
+        self.assertFalse(await self.throttle.progress(self.task, 20))
+        # the latest progress replaces the deferred one
+        self.assertFalse(await self.throttle.progress(self.task, 30))
+        self.assertEqual([("task", 10)], self.published)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual([("task", 10), ("task", 30)], self.published)
+
+    async def test_100_cancels_deferred_progress(self):
+        await self.throttle.progress(self.task, 10)
+        await self.throttle.progress(self.task, 20)
+        await self.throttle.progress(self.task, 100)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual([("task", 10), ("task", 100)], self.published)
+
+    async def test_forget_cancels_deferred_progress(self):
+        await self.throttle.progress(self.task, 10)
+        await self.throttle.progress(self.task, 20)
+        self.throttle.forget(self.task.uid)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual([("task", 10)], self.published)
+
+    async def test_forget_cancels_flushed_progress(self):
+        await self.throttle.progress(self.task, 10)
+        await self.throttle.progress(self.task, 20)
+        self.release.clear()
+
+        # the deferred progress is being published
+        await asyncio.sleep(0.1)
+        self.throttle.forget(self.task.uid)
+        self.release.set()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual([("task", 10)], self.published)
+        self.assertEqual(set(), self.throttle._flushing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+import unittest
+
+from ..src.aide_server.memo_brokers.memo_broker import MemoBroker
+from ..src.aide_server.write_behind_inner_memo import WriteBehindInnerMemo
+
+
+class _DictMemoBroker(MemoBroker):
+    def __init__(self):
+        super().__init__()
+        self.values: Dict[str, Any] = {}
+        self.writes: List[Tuple[str, Any]] = []
+        self.blocked = asyncio.Event()
+        self.blocked.set()
+
+    def get(self, key: str) -> Any:
+        return self.values[key]
+
+    def put(self, key: str, value: Any):
+        self.values[key] = value
+
+    def delete(self, key: str):
+        del self.values[key]
+
+    async def aput(self, key: str, value: Any):
+        await self.blocked.wait()
+        self.writes.append((key, value))
+        self.put(key, value)
+
+
+class TestWriteBehindInnerMemo(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.broker = _DictMemoBroker()
+        self.memo = WriteBehindInnerMemo(self.broker, flush_interval=0.05)
+
+    async def asyncTearDown(self):
+        await self.memo.aclose()
+
+    async def test_progresses_become_one_write(self):
+        for progress in range(10):
+            await self.memo.aput("task.progress", progress)
+
+        self.assertEqual(9, await self.memo.aget("task.progress"))
+        self.assertEqual([], self.broker.writes)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual([("task.progress", 9)], self.broker.writes)
+
+    async def test_result_flushes_its_task(self):
+        await self.memo.aput("task.progress", 50)
+        await self.memo.aput("other.progress", 10)
+        await self.memo.aput("task.result", {"raw_result": "done"})
+
+        self.assertEqual(
+            {"task.progress": 50, "task.result": {"raw_result": "done"}},
+            self.broker.values,
+        )
+
+    async def test_close_writes_dirty_keys(self):
+        await self.memo.aput("task.progress", 50)
+        await self.memo.aclose()
+
+        self.assertEqual({"task.progress": 50}, self.broker.values)
+        self.assertIsNone(self.memo._flusher)
+
+    async def test_cancelled_flush_keeps_values(self):
+        await self.memo.aput("task.progress", 50)
+        await self.memo.aput("task.response_progress", 60)
+        self.broker.blocked.clear()
+
+        flush = asyncio.create_task(self.memo.flush())
+        await asyncio.sleep(0)
+        flush.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await flush
+
+        self.assertEqual({}, self.memo._flushing)
+        self.assertEqual(50, await self.memo.aget("task.progress"))
+        self.assertEqual(60, await self.memo.aget("task.response_progress"))
+
+        self.broker.blocked.set()
+        await self.memo.aclose()
+
+        self.assertEqual(
+            {"task.progress": 50, "task.response_progress": 60},
+            self.broker.values,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
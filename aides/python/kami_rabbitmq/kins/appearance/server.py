@@ -10,6 +10,7 @@ from ..share.packages.aide_server.src.aide_server.server import AideServer
 class Appearance(AideServer):
     def __init__(self):
         super().__init__(
+            cache_inner_memo=True,
             context_memo=ContextMemo(
                 test_context_registered_aides_init() if use_test_context else Context(),
                 broker=FilesystemMemoBroker("memo/appearance_context"),
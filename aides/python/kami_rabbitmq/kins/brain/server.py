@@ -7,4 +7,6 @@ class Brain(AideServer):
     def __init__(self):
         super().__init__(
             brain_runs=[who_and_how_can_help],
+            # `add_aide` and `registered_aides` don't have runs yet
+            strict_brain_runs=False,
         )
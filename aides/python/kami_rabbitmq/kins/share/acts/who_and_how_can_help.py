@@ -6,7 +6,10 @@ from typing import Any, Awaitable, Dict
 
 
 from ..config import fake_response
+from ..packages.aide_server.src.aide_server.act_pools import blocking
 from ..packages.aide_server.src.aide_server.helpers import (
+    BlockingPublishProgressFn,
+    BlockingPublishResultFn,
     construct_and_publish,
     PublishProgressFn,
     PublishResultFn,
@@ -34,10 +37,12 @@ async def who_and_how_can_help(
     )
 
 
-async def _construct_raw_result(
+# the model is loaded and generates on CPU
+@blocking(cpu_bound=True)
+def _construct_raw_result(
     task: Task,
-    publish_progress: PublishProgressFn,
-    publish_result: PublishResultFn,
+    publish_progress: BlockingPublishProgressFn,
+    publish_result: BlockingPublishResultFn,
     start_progress: NonNegativeFloat,
     stop_progress: NonNegativeFloat,
 ):
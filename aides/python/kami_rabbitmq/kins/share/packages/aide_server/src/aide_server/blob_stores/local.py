@@ -0,0 +1,114 @@
+import os
+import re
+from pydantic import Field, NonNegativeInt
+import threading
+from typing import Iterator, List, Set, Tuple
+
+from ..blob_stores.blob_store import BlobStore, blob_ref
+from ..log import logger
+
+
+# the refs come with messages, they never point outside the store
+_REF = re.compile(r"[0-9a-f]{64}")
+
+
+class LocalBlobStore(BlobStore):
+    """
+    One file per blob on the local disk: `ab/cd/{ref}` for 2 shard levels.
+    The sides share the blobs by a path on a volume mounted by all of them.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str,
+        shard_levels: NonNegativeInt = 2,
+    ):
+        assert path_prefix
+        assert 0 <= shard_levels <= 3
+
+        super().__init__()
+
+        self.path_prefix = path_prefix
+        self.shard_levels = shard_levels
+
+        self._known_dirs: Set[str] = set()
+
+        os.makedirs(self.path_prefix, exist_ok=True)
+
+        logger.info(f"🏳️‍🌈 Initialized `{self.name}` with path `{self.path_prefix}`.")
+
+    path_prefix: str = Field(
+        ...,
+        title="Path Prefix",
+        description="The path to storage into a filesystem.",
+    )
+
+    shard_levels: NonNegativeInt = Field(
+        default=2,
+        title="Shard Levels",
+        description="The count of levels of subdirectories named by 2 chars of ref.",
+    )
+
+    def path(self, ref: str) -> str:
+        return os.path.join(self.path_prefix, *self._shards(ref), ref)
+
+    def put(self, data: bytes) -> str:
+        ref = blob_ref(data)
+        path = self.path(ref)
+        try:
+            # referred again, so the retention keeps it longer
+            os.utime(path)
+            return ref
+        except FileNotFoundError:
+            pass
+
+        self._ensure_dir(os.path.dirname(path))
+        # the same content under the same name: a concurrent writer
+        # can only replace the blob with an equal one
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        if not _REF.fullmatch(ref):
+            raise KeyError(ref)
+        try:
+            with open(self.path(ref), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            raise KeyError(ref)
+
+    def delete(self, ref: str):
+        if not _REF.fullmatch(ref):
+            raise KeyError(ref)
+        try:
+            os.remove(self.path(ref))
+        except FileNotFoundError:
+            raise KeyError(ref)
+
+    def scan(self) -> Iterator[Tuple[str, float]]:
+        for dirpath, _, filenames in os.walk(self.path_prefix):
+            for filename in filenames:
+                if not _REF.fullmatch(filename):
+                    # a temporary file of `put()`
+                    continue
+                try:
+                    touched_at = os.stat(os.path.join(dirpath, filename)).st_mtime
+                except FileNotFoundError:
+                    # deleted meanwhile
+                    continue
+                yield filename, touched_at
+
+    def _shards(self, ref: str) -> List[str]:
+        return [ref[i * 2 : (i + 1) * 2] for i in range(self.shard_levels)]
+
+    def _ensure_dir(self, path: str):
+        if path not in self._known_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._known_dirs.add(path)
+
+    def __str__(self):
+        return f"{self.name} : {self.path_prefix}"
@@ -0,0 +1,147 @@
+import asyncio
+import json
+from pydantic import Field, PositiveFloat, PositiveInt
+from pydantic_core import to_json
+import time
+from typing import Any, Optional
+
+from .blob_stores.blob_store import BlobStore
+from .log import logger
+from .task_progress_result import Result
+
+
+class ClaimCheck:
+    """
+    Moves the big values of results out of messages: a value bigger than
+    `threshold` bytes of JSON goes to `store` and the message carries
+    `Result.value_ref` only. The receiver takes the value back with
+    `check_out()` when it needs the value.
+    A value can be checked out many times: Keeper answers the requests for
+    the result with the ref. So the blobs are deleted by age, see `max_age`.
+    The contexts of tasks are moved out by `ContextSnapshots`.
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        threshold: PositiveInt = 64 * 1024,
+        max_age: Optional[PositiveFloat] = 7 * 24 * 60 * 60,
+        sweep_interval: PositiveFloat = 60 * 60,
+    ):
+        self.name = type(self).__name__
+        self.store = store
+        self.threshold = threshold
+        self.max_age = max_age
+        self.sweep_interval = sweep_interval
+
+        self._sweeper: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"🏳️‍🌈 Initialized `{self.name}` with store `{self.store}`"
+            f" and threshold {self.threshold} bytes."
+        )
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of claim check. Set by class.",
+    )
+
+    store: BlobStore = Field(
+        ...,
+        title="Blob Store",
+        description="The storage of values shared by the sides.",
+    )
+
+    threshold: PositiveInt = Field(
+        default=64 * 1024,
+        title="Threshold",
+        description="The bigger values are moved to the store, in bytes of JSON.",
+    )
+
+    max_age: Optional[PositiveFloat] = Field(
+        default=7 * 24 * 60 * 60,
+        title="Max Age",
+        description="Delete the blobs put or touched earlier, in seconds. Keep it longer than the retention of results. Without limit when `None`.",
+    )
+
+    sweep_interval: PositiveFloat = Field(
+        default=60 * 60,
+        title="Sweep Interval",
+        description="How often the old blobs are deleted, in seconds.",
+    )
+
+    async def check_in(self, result: Result) -> Result:
+        if result.value_ref is not None:
+            return result
+
+        data = to_json(result.value)
+        if len(data) <= self.threshold:
+            return result
+
+        ref = await self.store.aput(data)
+        logger.info(f"🎫 Checked in {len(data)} bytes of `{result.uid_task}` as `{ref}`.")
+
+        return Result(uid_task=result.uid_task, value=None, value_ref=ref)
+
+    # Raises `KeyError` when the value is absent in the store.
+    async def check_out(self, result: Result) -> Result:
+        if result.value_ref is None:
+            return result
+
+        value: Any = json.loads(await self.store.aget(result.value_ref))
+
+        return Result(uid_task=result.uid_task, value=value)
+
+    # Called when the server starts.
+    async def astart(self) -> None:
+        if self.max_age:
+            self._sweeper = asyncio.get_running_loop().create_task(
+                self._sweep_periodically()
+            )
+
+    async def aclose(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+        await self.store.aclose()
+
+    async def sweep(self) -> int:
+        """
+        Deletes the blobs older than `max_age`. Returns a count of deleted blobs.
+        """
+        if not self.max_age:
+            return 0
+
+        touched_before = time.time() - self.max_age
+        n = 0
+        for ref, touched_at in await self.store.ascan():
+            if touched_at >= touched_before:
+                continue
+            try:
+                await self.store.adelete(ref)
+                n += 1
+            except KeyError:
+                # deleted by other side
+                pass
+
+        if n:
+            logger.info(f"🧹 `{self.name}`: deleted {n} blob(s).")
+
+        return n
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as ex:
+                logger.error(f"`{self.name}`: the sweep failed: {ex}")
+
+    def __str__(self):
+        return self.name
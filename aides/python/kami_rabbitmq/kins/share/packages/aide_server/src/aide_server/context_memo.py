@@ -28,6 +28,26 @@ class ContextMemo(Generic[C]):
     def put(self, hid: str, value: Any) -> None:
         return self.broker.put(hid, value)
 
+    # Use the methods below from the event loop.
+
+    async def aget(self, hid: str) -> str:
+        try:
+            return await self.broker.aget(hid)
+        except KeyError:
+            logger.warning(f"`{self.name}`: the HID `{hid}` is absent.")
+            return ""
+
+    async def aput(self, hid: str, value: Any) -> None:
+        return await self.broker.aput(hid, value)
+
+    # Called when the server starts.
+    async def astart(self) -> None:
+        await self.broker.astart()
+
+    # Called when the server shuts down.
+    async def aclose(self) -> None:
+        await self.broker.aclose()
+
     name: str = Field(
         ...,
         title="Name",
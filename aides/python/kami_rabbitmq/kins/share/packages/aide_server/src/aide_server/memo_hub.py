@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+from pydantic import Field, PositiveFloat, PositiveInt
+import socket
+from typing import Any, Dict, List, Optional, Set
+
+from .log import logger
+
+
+# The value was put in other process: read it from the broker.
+CHANGED = object()
+
+
+class MemoHub:
+    """
+    Delivers the values put into memo to the watchers of their keys
+    in this process.
+    """
+
+    def __init__(self):
+        self.name = type(self).__name__
+
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of hub. Set by class.",
+    )
+
+    # Call from the event loop.
+    def subscribe(self, key: str) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(key, set()).add(queue)
+
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue):
+        queues = self._watchers.get(key)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._watchers[key]
+
+    # Can be called from any thread.
+    def notify(self, key: str, value: Any):
+        self._notify_local(key, value)
+
+    def _notify_local(self, key: str, value: Any):
+        loop = self._loop
+        if loop is None or key not in self._watchers:
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            self._deliver(key, value)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, key, value)
+
+    def _deliver(self, key: str, value: Any):
+        for queue in list(self._watchers.get(key, ())):
+            queue.put_nowait(value)
+
+    # Called when the server starts.
+    async def astart(self) -> None:
+        pass
+
+    # Called when the server shuts down.
+    async def aclose(self) -> None:
+        pass
+
+    def __str__(self):
+        return self.name
+
+
+class UnixSocketMemoHub(MemoHub):
+    """
+    Also delivers the values to the processes that share the memo:
+    every process binds a datagram socket into `path` and sends the put
+    keys to the sockets of others. A value bigger than `max_inline_bytes`
+    isn't sent, the watchers read it from the broker.
+    The sockets of others are listed every `peers_interval` seconds,
+    so a new process is notified after that time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_inline_bytes: PositiveInt = 32 * 1024,
+        peers_interval: PositiveFloat = 5.0,
+    ):
+        assert path
+
+        super().__init__()
+
+        self.path = path
+        self.max_inline_bytes = max_inline_bytes
+        self.peers_interval = peers_interval
+
+        self._socket: Optional[socket.socket] = None
+        # the addresses of other processes
+        self._peers: List[str] = []
+        self._peers_lister: Optional[asyncio.Task] = None
+
+        logger.info(f"🏳️‍🌈 Initialized `{self.name}` with path `{self.path}`.")
+
+    path: str = Field(
+        ...,
+        title="Path",
+        description="The directory for sockets of processes.",
+    )
+
+    max_inline_bytes: PositiveInt = Field(
+        default=32 * 1024,
+        title="Max Inline Bytes",
+        description="The values up to this size are sent with their keys.",
+    )
+
+    peers_interval: PositiveFloat = Field(
+        default=5.0,
+        title="Peers Interval",
+        description="How often the sockets of other processes are listed, in seconds.",
+    )
+
+    @property
+    def address(self):
+        return os.path.join(self.path, f"{os.getpid()}.sock")
+
+    def notify(self, key: str, value: Any):
+        super().notify(key, value)
+        self._broadcast(key, value)
+
+    async def astart(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if os.path.exists(self.address):
+            os.remove(self.address)
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.address)
+        self._socket.setblocking(False)
+
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._socket.fileno(), self._receive)
+
+        self._peers = await asyncio.to_thread(self._list_peers)
+        self._peers_lister = self._loop.create_task(self._list_peers_periodically())
+
+        logger.info(f"`{self.name}`: listening `{self.address}`.")
+
+    async def aclose(self) -> None:
+        if self._socket is None:
+            return
+
+        if self._peers_lister is not None:
+            self._peers_lister.cancel()
+            try:
+                await self._peers_lister
+            except asyncio.CancelledError:
+                pass
+            self._peers_lister = None
+
+        if self._loop is not None:
+            self._loop.remove_reader(self._socket.fileno())
+        self._socket.close()
+        self._socket = None
+        try:
+            os.remove(self.address)
+        except FileNotFoundError:
+            pass
+
+    def _broadcast(self, key: str, value: Any):
+        peers = self._peers
+        if self._socket is None or not peers:
+            return
+
+        message = _message(key, value, self.max_inline_bytes)
+        for address in peers:
+            try:
+                self._socket.sendto(message, address)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # the process is gone
+                self._peers = [peer for peer in self._peers if peer != address]
+                try:
+                    os.remove(address)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                logger.warning(f"`{self.name}`: `{address}` is busy, dropped `{key}`.")
+
+    def _list_peers(self) -> List[str]:
+        own = os.path.basename(self.address)
+        return [
+            os.path.join(self.path, filename)
+            for filename in os.listdir(self.path)
+            if filename != own and filename.endswith(".sock")
+        ]
+
+    async def _list_peers_periodically(self):
+        while True:
+            await asyncio.sleep(self.peers_interval)
+            try:
+                self._peers = await asyncio.to_thread(self._list_peers)
+            except OSError as ex:
+                logger.error(f"`{self.name}`: the peers aren't listed: {ex}")
+
+    def _receive(self):
+        assert self._socket is not None
+
+        while True:
+            try:
+                data = self._socket.recv(self.max_inline_bytes + 1024)
+            except BlockingIOError:
+                return
+
+            message = json.loads(data)
+            self._deliver(message["key"], message.get("value", CHANGED))
+
+
+def _message(key: str, value: Any, max_inline_bytes: int) -> bytes:
+    if not _exceeds(value, max_inline_bytes):
+        try:
+            data = json.dumps({"key": key, "value": value}).encode("utf-8")
+            if len(data) <= max_inline_bytes:
+                return data
+        except (TypeError, ValueError):
+            pass
+
+    return json.dumps({"key": key}).encode("utf-8")
+
+
+# Whether the JSON of `value` is surely bigger than `limit` bytes.
+# Stops after `limit` bytes, so a big value isn't walked to its end.
+def _exceeds(value: Any, limit: int) -> bool:
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += 2 + 2 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += 2 + len(item)
+            stack.extend(item)
+        else:
+            size += 1
+        if size > limit:
+            return True
+
+    return False
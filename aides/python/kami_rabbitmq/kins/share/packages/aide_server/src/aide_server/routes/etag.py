@@ -0,0 +1,50 @@
+from fastapi import Request, Response
+import hashlib
+import json
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class RenderedResponses:
+    """
+    The JSON bodies rendered once per key with their strong ETags.
+    Use a key that changes with the source of body.
+    """
+
+    def __init__(self):
+        # key: (body, etag)
+        self._rendered: Dict[Hashable, Tuple[bytes, str]] = {}
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        render: Callable[[], Any],
+    ) -> Response:
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            body = json.dumps(render(), ensure_ascii=False).encode("utf-8")
+            rendered = self._rendered[key] = (body, _etag(body))
+
+        body, etag = rendered
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(body, media_type="application/json", headers=headers)
+
+    def invalidate(self):
+        self._rendered.clear()
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+# See https://httpwg.org/specs/rfc9110.html#field.if-none-match
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
@@ -1,16 +1,27 @@
+import asyncio
 from fastapi import APIRouter
 from pydantic import Field, NonNegativeFloat
-import time
-from typing import Any, List
-from faststream.rabbit import RabbitQueue
+from typing import Any, Dict, List, Optional, cast
 
+from .concurrency_limits import ConcurrencyLimits
 from .side import Side
 from .type_side import TypeSide
 
 from ..act import Act
-from ..helpers import RunFn
+from ..act_pools import act_pools, blocking_publishers, is_blocking, is_cpu_bound
+from ..claim_check import ClaimCheck
+from ..context_snapshots import ContextSnapshots
+from ..helpers import (
+    AsyncRunFn,
+    PublishProgressFn,
+    PublishResultFn,
+    RunFn,
+    construct_answer,
+)
 from ..inner_memo import NoneInnerMemo
 from ..log import logger
+from ..progress_throttle import ProgressThrottle
+from ..result_cache import result_key
 from ..savant_router import SavantRouter
 from ..task_progress_result import Progress, Result, Task
 
@@ -25,24 +36,39 @@ class BrainSide(Side):
         savant_router: SavantRouter,
         acts: List[Act],
         runs: List[RunFn],
+        coalesce_tasks: bool = True,
+        context_snapshots: Optional[ContextSnapshots] = None,
+        claim_check: Optional[ClaimCheck] = None,
+        strict_runs: bool = True,
     ):
         assert bool(runs), "The runs should be able, as least 1."
-        if len(runs) != len(acts):
-            logger.warn(
-                f"The count of runs ({len(runs)})"
-                f" doesn't much the count of acts ({len(acts)})."
-            )
 
         super().__init__(
             router=router,
             savant_router=savant_router,
             acts=acts,
             inner_memo=NoneInnerMemo(),
+            claim_check=claim_check,
         )
 
         self.runs = runs
+        self.strict_runs = strict_runs
+        # hid_act: run
+        self._dispatch = _dispatch_table(acts, runs, strict=strict_runs)
+        self.coalesce_tasks = coalesce_tasks
+        self.context_snapshots = context_snapshots
+        self.concurrency_limits = ConcurrencyLimits(acts)
+        self.progress_throttle = ProgressThrottle(
+            acts,
+            publish=self._publish_progress_now,
+        )
+        act_pools.configure(acts)
+
+        # key: the tasks attached to the running one, see `coalesce_tasks`
+        self._in_flight: Dict[str, List[Task]] = {}
 
         self._register_catchers_for_acts()
+        self._register_endpoints()
 
         logger.info(
             f"🏳️‍🌈 Initialized `{self.type.name}` with runs `{self.runs}`"
@@ -55,6 +81,36 @@ class BrainSide(Side):
         description="The runs for Brain server. Each runs should be defined into `configure.json` with same name.",
     )
 
+    strict_runs: bool = Field(
+        ...,
+        title="Strict Runs",
+        description="Every act should have a run. Otherwise the acts without runs are only logged.",
+    )
+
+    coalesce_tasks: bool = Field(
+        ...,
+        title="Coalesce Tasks",
+        description="A task with the same act and context as a running task gets the progress and result of that task. For the tasks from different Appearances.",
+    )
+
+    context_snapshots: Optional[ContextSnapshots] = Field(
+        default=None,
+        title="Context Snapshots",
+        description="Resolve `context_ref` of tasks. Put a cache in front of its broker.",
+    )
+
+    progress_throttle: ProgressThrottle = Field(
+        ...,
+        title="Progress Throttle",
+        description="Drops the too frequent progresses, see `Act.progress`.",
+    )
+
+    concurrency_limits: ConcurrencyLimits = Field(
+        ...,
+        title="Concurrency Limits",
+        description="The running tasks per act, see `Act.concurrency`.",
+    )
+
     def _register_catchers_for_acts(self):
         logger.info("🪶 Registering catchers for act(s)...")
 
@@ -70,6 +126,7 @@ class BrainSide(Side):
             act.hid,
             pusher_side=TypeSide.APPEARANCE,
             catcher_side=self.type,
+            prefetch=act.concurrency.prefetch_count if act.concurrency else None,
         )
         async def task_catcher(task: Task):
             ts = short_json(task, exclude={"context"})
@@ -80,117 +137,212 @@ class BrainSide(Side):
 
         logger.info(f"🪶 Registered {n} catcher for act `{act.hid}`.")
 
-    async def _run_task(self, task: Task):
-        found_run = None
-        for run in self.runs:
-            logger.info(f"Looking at act `{task.hid_act}` into run `{run.__name__}`...")
-            if task.hid_act in run.__name__:
-                logger.info(f"A run for act `{task.hid_act}` found.")
-                found_run = run
-                break
+    def _register_endpoints(self):
+        # the counts of running and waiting tasks per act
+        # for sizing the replicas of Brain
+        @self.router.get("/in-flight")
+        async def in_flight_endpoint():
+            return self.concurrency_limits.stats
 
+    async def _run_task(self, task: Task):
+        found_run = self._dispatch.get(task.hid_act)
         if not found_run:
             ts = short_json(task, exclude={"context"})
             raise Exception(f"Not found a run for task `{ts}`.")
 
-        await found_run(
-            task,
-            self.publish_progress,
-            self.publish_result,
+        if task.context_ref and not task.context:
+            try:
+                task = await self._resolve_context(task)
+            except KeyError:
+                error = Exception(f"Not found a context snapshot `{task.context_ref}`.")
+                await self._publish_error([task], error)
+                return
+
+        if not self.coalesce_tasks:
+            async with self.concurrency_limits.slot(task.hid_act):
+                await self._call_run(
+                    found_run,
+                    task,
+                    self.publish_progress,
+                    self.publish_result,
+                )
+            return
+
+        key = self._task_key(task)
+        followers = self._in_flight.get(key)
+        if followers is not None:
+            logger.info(f"🎯 Attached task `{task.uid}` to the same task in flight.")
+            followers.append(task)
+            return
+
+        followers = self._in_flight[key] = []
+
+        async def publish_progress(
+            task: Task, progress: NonNegativeFloat
+        ) -> NonNegativeFloat:
+            await self.publish_progress(task, progress)
+            for follower in list(followers):
+                await self.publish_progress(follower, progress)
+            return progress
+
+        async def publish_result(task: Task, result: Any) -> Any:
+            # a task caught from now on runs again instead of missing the result
+            self._detach(key, followers)
+            r = await self.publish_result(task, result)
+            for follower in followers:
+                await self.publish_result(follower, _for_task(result, follower))
+            return r
+
+        error: Optional[Exception] = None
+        try:
+            async with self.concurrency_limits.slot(task.hid_act):
+                await self._call_run(found_run, task, publish_progress, publish_result)
+        except Exception as ex:
+            error = ex
+            raise
+        finally:
+            # the run ended without result
+            if self._detach(key, followers):
+                message = f"The run of task `{task.uid}` ended without result."
+                await self._publish_error([task, *followers], error or Exception(message))
+
+    # Returns True when `followers` were still attached to `key`.
+    def _detach(self, key: str, followers: List[Task]) -> bool:
+        if self._in_flight.get(key) is not followers:
+            return False
+
+        del self._in_flight[key]
+
+        return True
+
+    async def _publish_error(self, tasks: List[Task], error: Exception):
+        for task in tasks:
+            await self.publish_progress(task, 99)
+            await self.publish_result(task, construct_answer(error=error))
+
+    async def _resolve_context(self, task: Task) -> Task:
+        if self.context_snapshots is None:
+            raise KeyError(task.context_ref)
+
+        return await self.context_snapshots.aresolve(task)
+
+    # A blocking run goes to the pool of act, see `blocking()`.
+    async def _call_run(
+        self,
+        run: RunFn,
+        task: Task,
+        publish_progress: PublishProgressFn,
+        publish_result: PublishResultFn,
+    ):
+        if not is_blocking(run):
+            return await cast(AsyncRunFn, run)(task, publish_progress, publish_result)
+
+        publishers = blocking_publishers(
+            run,
+            asyncio.get_running_loop(),
+            publish_progress,
+            publish_result,
+        )
+
+        return await act_pools.run(task.hid_act, run, task, *publishers)
+
+    def _task_key(self, task: Task) -> str:
+        version = next(
+            (act.version for act in self.acts if act.hid == task.hid_act), ""
         )
+        return result_key(task.hid_act, version, task.context)
 
     # catcher: Keeper, [Appearance]
+    # Throttled, see `Act.progress`.
     async def publish_progress(
         self, task: Task, progress: NonNegativeFloat
     ) -> NonNegativeFloat:
-        await self._publish_progress(
-            task=task,
-            progress=progress,
-            queue=self.savant_router.progressQueue(
-                task.hid_act,
-                pusher_side=TypeSide.BRAIN,
-                catcher_side=TypeSide.KEEPER,
-            ),
-        )
-
-        await self._publish_progress(
-            task=task,
-            progress=progress,
-            queue=self.savant_router.progressQueue(
-                task.hid_act,
-                pusher_side=TypeSide.BRAIN,
-                catcher_side=TypeSide.APPEARANCE,
-            ),
-        )
+        await self.progress_throttle.progress(task, progress)
 
         return progress
 
-    async def _publish_progress(
-        self,
-        task: Task,
-        progress: NonNegativeFloat,
-        queue: RabbitQueue,
-    ):
+    # Published once, the exchange routes it to every bound queue.
+    async def _publish_progress_now(self, task: Task, progress: NonNegativeFloat):
+        key = self.savant_router.progressKey(task.hid_act, pusher_side=self.type)
+
         ts = short_json(task, exclude={"context"})
         p = "{:.2f}".format(progress.real)
         logger.info(f"Progress for task `{ts}`: {p}%")
 
         logger.info(
             f"Publish a progress of task `{task.hid_act}` to Savant:"
-            f" queue `{queue.name}`."
+            f" routing key `{key}`."
         )
         await self.push(
             Progress(uid_task=task.uid, value=progress),
-            queue=queue,
+            queue=key,
         )
 
-        # test
-        time.sleep(0.2)
-
         return progress
 
     # catcher: Keeper, [Appearance]
     async def publish_result(self, task: Task, result: Any) -> Any:
-        await self._publish_result(
-            task=task,
-            result=result,
-            queue=self.savant_router.resultQueue(
-                task.hid_act,
-                pusher_side=TypeSide.BRAIN,
-                catcher_side=TypeSide.KEEPER,
-            ),
-        )
-
-        await self._publish_result(
-            task=task,
-            result=result,
-            queue=self.savant_router.resultQueue(
-                task.hid_act,
-                pusher_side=TypeSide.BRAIN,
-                catcher_side=TypeSide.APPEARANCE,
-            ),
-        )
+        self.progress_throttle.forget(task.uid)
 
-        return result
+        key = self.savant_router.resultKey(task.hid_act, pusher_side=self.type)
+        message = Result(uid_task=task.uid, value=result)
 
-    async def _publish_result(
-        self,
-        task: Task,
-        result: Any,
-        queue: RabbitQueue,
-    ):
         ts = short_json(task, exclude={"context"})
         logger.info(
-            f"Publish in Savant queue `{queue.name}`"
+            f"Publish in Savant routing key `{key}`"
             f"\n\tfor task `{ts}`:"
-            f"\n\tresult`{short_json(result)}`"
-        )
-        await self.push(
-            Result(uid_task=task.uid, value=result),
-            queue=queue,
+            f"\n\tresult`{short_json(message)}`"
         )
-
-        # test
-        time.sleep(0.2)
+        await self.push(message, queue=key)
 
         return result
+
+
+# The explicit registration by `act_run()` first, then the run with
+# the name of act. Raises when a run is ambiguous or, with `strict`, absent.
+def _dispatch_table(
+    acts: List[Act],
+    runs: List[RunFn],
+    strict: bool,
+) -> Dict[str, RunFn]:
+    for run in runs:
+        if is_cpu_bound(run):
+            raise Exception(
+                f"The run `{run.__name__}` can't be CPU-bound: a process can't"
+                " publish the result. Declare its stages CPU-bound instead."
+            )
+
+    registered: List[Any] = [run for run in runs if hasattr(run, "__aide_act__")]
+    named = [run for run in runs if not hasattr(run, "__aide_act__")]
+
+    dispatch: Dict[str, RunFn] = {}
+    for act in acts:
+        candidates = [run for run in registered if run.__aide_act__ == act.hid]
+        if not candidates:
+            candidates = [run for run in named if run.__name__ == act.hid]
+
+        if len(candidates) > 1:
+            names = ", ".join(f"`{run.__name__}`" for run in candidates)
+            raise Exception(f"Found several runs for act `{act.hid}`: {names}.")
+
+        if not candidates:
+            if strict:
+                raise Exception(f"Not found a run for act `{act.hid}`.")
+            logger.warning(f"Not found a run for act `{act.hid}`.")
+            continue
+
+        dispatch[act.hid] = candidates[0]
+        logger.info(f"🪶 Act `{act.hid}` runs `{candidates[0].__name__}`.")
+
+    unused = [run.__name__ for run in runs if run not in dispatch.values()]
+    if unused:
+        logger.warning(f"The runs {unused} don't match any act.")
+
+    return dispatch
+
+
+# The runs can publish a `Result` of task as the result.
+def _for_task(result: Any, task: Task) -> Any:
+    if isinstance(result, Result):
+        return result.model_copy(update={"uid_task": task.uid})
+    return result
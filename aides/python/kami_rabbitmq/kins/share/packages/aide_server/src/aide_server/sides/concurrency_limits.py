@@ -0,0 +1,74 @@
+import asyncio
+from contextlib import asynccontextmanager
+from pydantic import Field
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..act import Act
+
+
+class ConcurrencyLimits:
+    """
+    A semaphore per act with `concurrency` and the counts of running and
+    waiting tasks per act, they show how busy a Brain is.
+    """
+
+    def __init__(self, acts: List[Act]):
+        self.name = type(self).__name__
+        self.limits = {
+            act.hid: act.concurrency.max_running for act in acts if act.concurrency
+        }
+
+        self.running: Dict[str, int] = {act.hid: 0 for act in acts}
+        self.waiting: Dict[str, int] = {act.hid: 0 for act in acts}
+
+        # created on the loop of server
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of limits. Set by class.",
+    )
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Optional[int]]]:
+        return {
+            hid: {
+                "running": self.running[hid],
+                "waiting": self.waiting[hid],
+                "limit": self.limits.get(hid),
+            }
+            for hid in self.running
+        }
+
+    @asynccontextmanager
+    async def slot(self, hid_act: str) -> AsyncIterator[None]:
+        semaphore = self._semaphore(hid_act)
+        if semaphore is not None:
+            self.waiting[hid_act] = self.waiting.get(hid_act, 0) + 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self.waiting[hid_act] -= 1
+
+        self.running[hid_act] = self.running.get(hid_act, 0) + 1
+        try:
+            yield
+        finally:
+            self.running[hid_act] -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def _semaphore(self, hid_act: str) -> Optional[asyncio.Semaphore]:
+        limit = self.limits.get(hid_act)
+        if limit is None:
+            return None
+
+        semaphore = self._semaphores.get(hid_act)
+        if semaphore is None:
+            semaphore = self._semaphores[hid_act] = asyncio.Semaphore(limit)
+
+        return semaphore
+
+    def __str__(self):
+        return self.name
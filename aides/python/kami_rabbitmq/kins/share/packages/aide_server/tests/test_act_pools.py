@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from typing import List
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.act_pools import (
+    ActExecutor,
+    ActPools,
+    act_pools,
+    blocking,
+    blocking_publishers,
+    is_blocking,
+    is_cpu_bound,
+)
+from ..src.aide_server.helpers import construct_and_publish
+from ..src.aide_server.task_progress_result import Task
+
+
+@blocking(cpu_bound=True)
+def _square(x: int) -> int:
+    return x * x
+
+
+class TestBlocking(unittest.TestCase):
+    def test_marks(self):
+        @blocking
+        def stage():
+            pass
+
+        async def run():
+            pass
+
+        self.assertTrue(is_blocking(stage))
+        self.assertFalse(is_cpu_bound(stage))
+        self.assertTrue(is_blocking(_square))
+        self.assertTrue(is_cpu_bound(_square))
+        self.assertFalse(is_blocking(run))
+
+
+class TestActPools(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.pools = ActPools()
+        self.pools.configure(
+            [
+                Act(
+                    hid="act",
+                    name={"en": "act"},
+                    summary={"en": "act"},
+                    description={"en": "act"},
+                    tags=[],
+                    executor=ActExecutor(max_threads=2),
+                )
+            ]
+        )
+
+    async def asyncTearDown(self):
+        self.pools.shutdown()
+
+    async def test_run_on_thread_of_act(self):
+        @blocking
+        def stage(x: int) -> str:
+            return f"{threading.current_thread().name}:{x}"
+
+        self.assertTrue((await self.pools.run("act", stage, 1)).startswith("act-act"))
+        other = await self.pools.run("other", stage, 2)
+        self.assertTrue(other.startswith("act-other"))
+        pool = self.pools.executor("act")
+        self.assertEqual(2, pool._max_workers)  # type: ignore[attr-defined]
+        self.assertIs(self.pools.executor("act"), self.pools.executor("act"))
+
+    async def test_run_cpu_bound_on_process(self):
+        self.assertEqual(9, await self.pools.run("act", _square, 3))
+
+    async def test_shutdown(self):
+        pool = self.pools.executor("act")
+        self.pools.shutdown()
+
+        self.assertIsNot(pool, self.pools.executor("act"))
+
+
+class TestBlockingPublishers(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_from_thread(self):
+        published: List[str] = []
+
+        async def publish(value: str) -> str:
+            published.append(value)
+            return f"published {value}"
+
+        @blocking
+        def stage():
+            pass
+
+        (publish_from_thread,) = blocking_publishers(
+            stage, asyncio.get_running_loop(), publish
+        )
+
+        answer = await asyncio.to_thread(publish_from_thread, "value")
+        self.assertEqual("published value", answer)
+        self.assertEqual(["value"], published)
+
+    async def test_cpu_bound_doesnt_publish(self):
+        published: List[str] = []
+
+        async def publish(value: str):
+            published.append(value)
+
+        (skip,) = blocking_publishers(_square, asyncio.get_running_loop(), publish)
+
+        self.assertIsNone(skip("value"))
+        self.assertEqual([], published)
+
+
+class TestConstructBlocking(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        act_pools.shutdown()
+
+    async def test_blocking_stage_publishes_on_loop(self):
+        loop = asyncio.get_running_loop()
+        progresses: List[float] = []
+        results = []
+
+        async def publish_progress(task, progress):
+            self.assertIs(loop, asyncio.get_running_loop())
+            progresses.append(progress)
+            return progress
+
+        async def publish_result(task, result):
+            results.append(result)
+            return result
+
+        @blocking
+        def construct_raw_result(
+            task, publish_progress, publish_result, start_progress, stop_progress
+        ):
+            self.assertTrue(threading.current_thread().name.startswith("act-act"))
+            self.assertEqual(10, publish_progress(task, 10))
+            return {"text": task.context["text"]}
+
+        await construct_and_publish(
+            "act",
+            Task(uid="task", hid_act="act", context={"text": "тест"}),
+            publish_progress,
+            publish_result,
+            construct_raw_result,
+        )
+
+        self.assertIn(10, progresses)
+        self.assertEqual(100, progresses[-1])
+        self.assertEqual({"text": "тест"}, results[0].value["raw_result"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,455 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Response
+import os
+from pydantic import BaseModel
+import tempfile
+from typing import List
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.admission import ActAdmission
+from ..src.aide_server.blob_stores.local import LocalBlobStore
+from ..src.aide_server.claim_check import ClaimCheck
+from ..src.aide_server.configure import Configure
+from ..src.aide_server.context_memo import ContextMemo
+from ..src.aide_server.context_snapshots import ContextSnapshots
+from ..src.aide_server.helpers import construct_answer, is_error_answer
+from ..src.aide_server.inner_memo import InnerMemo
+from ..src.aide_server.memo_brokers.filesystem import FilesystemMemoBroker
+from ..src.aide_server.memo_brokers.memo_broker import NoneMemoBroker
+from ..src.aide_server.result_cache import ActCache
+from ..src.aide_server.savant_router import SavantRouter
+from ..src.aide_server.sides.appearance_side import AppearanceSide
+from ..src.aide_server.task_progress_result import Progress, Result, Task
+
+
+class _Context(BaseModel):
+    text: str = ""
+
+
+def _act(hid: str, **kwargs) -> Act:
+    return Act(
+        hid=hid,
+        name={"en": hid},
+        summary={"en": hid},
+        description={"en": hid},
+        tags=[],
+        **kwargs,
+    )
+
+
+def _appearance(path: str, act: Act, context: _Context, **kwargs) -> AppearanceSide:
+    acts = [act]
+    connector = "amqp://localhost"
+    return AppearanceSide(
+        APIRouter(),
+        configure=Configure(
+            name={"en": "test"},
+            hid="test",
+            savant_connector=connector,
+            acts=acts,
+        ),
+        savant_router=SavantRouter(connector, "test", "appearance", acts),
+        inner_memo=InnerMemo(FilesystemMemoBroker(path)),
+        context_memo=ContextMemo(context, NoneMemoBroker()),
+        **kwargs,
+    )
+
+
+class _AppearanceTestCase(unittest.IsolatedAsyncioTestCase):
+    act = _act("act")
+    kwargs = {}
+
+    async def asyncSetUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.appearance = _appearance(
+            self.temp.name,
+            self.act,
+            _Context(text="same"),
+            **self.kwargs,
+        )
+
+        self.tasks = []
+        self.pushed = asyncio.Event()
+
+        async def push(message, queue):
+            if isinstance(message, Task):
+                self.tasks.append(message)
+                self.pushed.set()
+
+        self.appearance.push = push  # type: ignore[method-assign]
+
+    async def asyncTearDown(self):
+        self.temp.cleanup()
+
+    # Publishes a task and waits for its result in background.
+    async def _wait(self, wait: float = 1.0):
+        self.pushed.clear()
+        response = Response()
+        waiter = asyncio.create_task(
+            self.appearance._publish_task_and_wait(self.act, wait, response)
+        )
+        await asyncio.wait_for(self.pushed.wait(), 1.0)
+
+        return waiter, response
+
+
+class TestAppearanceWait(_AppearanceTestCase):
+    async def test_result_is_waited(self):
+        waiter, response = await self._wait()
+        uid = self.tasks[0].uid
+        await self.appearance._catch_result(Result(uid_task=uid, value="done"))
+
+        self.assertEqual("done", await waiter)
+        self.assertNotEqual(202, response.status_code)
+        self.assertEqual({}, self.appearance._waiting_results)
+
+    async def test_no_result_from_keeper_isnt_waited(self):
+        waiter, response = await self._wait(wait=0.1)
+        uid = self.tasks[0].uid
+        await self.appearance._catch_response_result(Result(uid_task=uid, value=""))
+
+        self.assertEqual(uid, await waiter)
+        self.assertEqual(202, response.status_code)
+        found = await self.appearance.inner_memo.aget_many([f"{uid}.response_result"])
+        self.assertEqual({}, found)
+
+    async def test_result_from_keeper_is_waited(self):
+        waiter, _ = await self._wait()
+        uid = self.tasks[0].uid
+        await self.appearance._catch_response_result(Result(uid_task=uid, value="done"))
+
+        self.assertEqual("done", await waiter)
+
+    async def test_task_in_flight_is_waited(self):
+        first, _ = await self._wait()
+        second = asyncio.create_task(
+            self.appearance._publish_task_and_wait(self.act, 1.0, Response())
+        )
+        await asyncio.sleep(0.05)
+        uid = self.tasks[0].uid
+        await self.appearance._catch_result(Result(uid_task=uid, value="done"))
+
+        self.assertEqual(["done", "done"], await asyncio.gather(first, second))
+        self.assertEqual(1, len(self.tasks))
+
+
+class TestAppearanceEvents(_AppearanceTestCase):
+    kwargs = {"events_keepalive": 0.05}
+
+    # Collects the streamed events until the stream ends, without keepalives.
+    def _stream(self, uid: str) -> "asyncio.Task[List[str]]":
+        async def collect():
+            return [
+                event
+                async for event in self.appearance._events(uid)
+                if not event.startswith(":")
+            ]
+
+        return asyncio.create_task(collect())
+
+    async def test_progress_and_result(self):
+        stream = self._stream("task")
+        await asyncio.sleep(0)
+        await self.appearance._catch_progress(Progress(uid_task="task", value=50))
+        await self.appearance._catch_result(Result(uid_task="task", value="done"))
+
+        events = await asyncio.wait_for(stream, 1.0)
+        self.assertEqual(2, len(events))
+        self.assertTrue(events[0].startswith("event: progress\n"))
+        self.assertTrue(events[1].startswith("event: result\n"))
+        self.assertIn('"value":"done"', events[1])
+        self.assertEqual(0, self.appearance.task_events.listeners_count)
+
+    async def test_no_result_from_keeper_isnt_final(self):
+        stream = self._stream("task")
+        await asyncio.sleep(0)
+        await self.appearance._catch_response_result(Result(uid_task="task", value=""))
+        await self.appearance._catch_progress(Progress(uid_task="task", value=50))
+        await asyncio.sleep(0.01)
+
+        self.assertFalse(stream.done())
+        await self.appearance._catch_result(Result(uid_task="task", value="done"))
+
+        events = await asyncio.wait_for(stream, 1.0)
+        kinds = [event.split("\n")[0] for event in events]
+        self.assertEqual(["event: progress", "event: result"], kinds)
+
+    async def test_result_is_replayed_to_late_stream(self):
+        await self.appearance._catch_response_result(Result(uid_task="task", value=""))
+        await self.appearance._catch_result(Result(uid_task="task", value="done"))
+
+        events = await asyncio.wait_for(self._stream("task"), 1.0)
+        self.assertEqual(1, len(events))
+        self.assertIn('"value":"done"', events[0])
+
+    async def test_keepalive(self):
+        events = self.appearance._events("task")
+        try:
+            self.assertEqual(": keepalive\n\n", await events.__anext__())
+        finally:
+            await events.aclose()
+
+        self.assertEqual(0, self.appearance.task_events.listeners_count)
+
+
+class TestAppearanceCoalescing(_AppearanceTestCase):
+    kwargs = {"in_flight_ttl": 0.2}
+
+    async def test_same_task_in_flight_is_attached(self):
+        uid = await self.appearance._publish_task(self.act)
+
+        self.assertEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(1, len(self.tasks))
+
+    async def test_concurrent_tasks_are_published_once(self):
+        uids = await asyncio.gather(
+            *(self.appearance._publish_task(self.act) for _ in range(5))
+        )
+
+        self.assertEqual(1, len(set(uids)))
+        self.assertEqual(1, len(self.tasks))
+
+    async def test_result_ends_flight(self):
+        uid = await self.appearance._publish_task(self.act)
+        await self.appearance._catch_result(Result(uid_task=uid, value="done"))
+
+        self.assertEqual({}, self.appearance._in_flight)
+        self.assertEqual({}, self.appearance._published)
+        self.assertNotEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(2, len(self.tasks))
+
+    async def test_no_result_from_keeper_keeps_task_in_flight(self):
+        uid = await self.appearance._publish_task(self.act)
+        await self.appearance._catch_response_result(Result(uid_task=uid, value=""))
+
+        self.assertIn(uid, self.appearance._published)
+        self.assertEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(1, len(self.tasks))
+
+    async def test_progress_keeps_task_in_flight(self):
+        uid = await self.appearance._publish_task(self.act)
+        for _ in range(3):
+            await asyncio.sleep(0.1)
+            await self.appearance._catch_progress(Progress(uid_task=uid, value=10))
+
+        self.assertEqual(uid, await self.appearance._publish_task(self.act))
+
+    async def test_silent_task_in_flight_expires(self):
+        uid = await self.appearance._publish_task(self.act)
+        await asyncio.sleep(0.3)
+
+        self.assertNotEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(2, len(self.tasks))
+
+
+class TestAppearanceCache(_AppearanceTestCase):
+    act = _act("act", cache=ActCache(ttl=60))
+
+    async def test_result_is_cached(self):
+        uid = await self.appearance._publish_task(self.act)
+        await self.appearance._catch_result(
+            Result(uid_task=uid, value={"raw_result": "done"})
+        )
+
+        self.assertEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(1, len(self.tasks))
+
+    async def test_error_result_is_not_cached(self):
+        uid = await self.appearance._publish_task(self.act)
+        error = Exception("The run failed.")
+        await self.appearance._catch_result(
+            Result(uid_task=uid, value=construct_answer(error=error))
+        )
+
+        self.assertNotEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(2, len(self.tasks))
+
+    async def test_no_result_from_keeper_is_not_cached(self):
+        uid = await self.appearance._publish_task(self.act)
+        await self.appearance._catch_response_result(Result(uid_task=uid, value=""))
+
+        self.assertEqual(0, self.appearance.result_cache.stats["entries"])
+
+        await self.appearance._catch_result(
+            Result(uid_task=uid, value={"raw_result": "done"})
+        )
+        self.assertEqual(1, self.appearance.result_cache.stats["entries"])
+
+    async def test_swept_result_is_not_served(self):
+        uid = await self.appearance._publish_task(self.act)
+        await self.appearance._catch_result(
+            Result(uid_task=uid, value={"raw_result": "done"})
+        )
+        await self.appearance.inner_memo.adelete(f"{uid}.response_result")
+
+        self.assertNotEqual(uid, await self.appearance._publish_task(self.act))
+        self.assertEqual(2, len(self.tasks))
+
+
+class TestAppearanceBatch(_AppearanceTestCase):
+    act = _act("act", cache=ActCache(ttl=60))
+
+    async def test_contexts_override_current(self):
+        r = await self.appearance._publish_batch(self.act, [{}, {"text": "other"}])
+
+        self.assertEqual(2, len(r["uids"]))
+        contexts = [task.context for task in self.tasks]
+        self.assertEqual([{"text": "same"}, {"text": "other"}], contexts)
+        self.assertEqual(
+            r["uids"],
+            await self.appearance.inner_memo.aget(f"{r['uid_batch']}.batch"),
+        )
+
+    async def test_invalid_contexts_are_rejected(self):
+        with self.assertRaises(HTTPException) as raised:
+            await self.appearance._publish_batch(self.act, [{}, {"text": 1}])
+
+        self.assertEqual(422, raised.exception.status_code)
+        self.assertEqual([1], [item["index"] for item in raised.exception.detail])
+        self.assertEqual([], self.tasks)
+
+    async def test_same_contexts_are_coalesced(self):
+        uid = await self.appearance._publish_task(self.act)
+        r = await self.appearance._publish_batch(
+            self.act, [{}, {"text": "other"}, {"text": "other"}]
+        )
+
+        self.assertEqual(uid, r["uids"][0])
+        self.assertEqual(r["uids"][1], r["uids"][2])
+        self.assertEqual(2, len(self.tasks))
+        self.assertIn(r["uids"][1], self.appearance._published)
+
+    async def test_cached_result_is_served(self):
+        uid = await self.appearance._publish_task(self.act)
+        await self.appearance._catch_result(
+            Result(uid_task=uid, value={"raw_result": "done"})
+        )
+
+        r = await self.appearance._publish_batch(self.act, [{}])
+
+        self.assertEqual([uid], r["uids"])
+        self.assertEqual(1, len(self.tasks))
+        progress = await self.appearance._batch_progress(r["uid_batch"])
+        self.assertEqual(100.0, progress["progress"])
+
+    async def test_failed_batch_isnt_in_flight(self):
+        async def push(message, queue):
+            raise Exception("The broker is gone.")
+
+        self.appearance.push = push  # type: ignore[method-assign]
+        with self.assertRaises(Exception):
+            await self.appearance._publish_batch(self.act, [{}, {"text": "other"}])
+
+        self.assertEqual({}, self.appearance._in_flight)
+        self.assertEqual({}, self.appearance._published)
+
+
+class TestAppearanceContextSnapshots(_AppearanceTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.snapshots = ContextSnapshots(self.appearance.inner_memo.broker)
+        self.appearance.context_snapshots = self.snapshots
+
+    async def test_task_carries_ref(self):
+        await self.appearance._publish_task(self.act)
+        await self.appearance._publish_batch(self.act, [{"text": "other"}])
+
+        for task, context in zip(self.tasks, ({"text": "same"}, {"text": "other"})):
+            self.assertEqual({}, task.context)
+            self.assertEqual(context, await self.snapshots.aget(task.context_ref))
+
+
+class TestAppearanceClaimCheck(_AppearanceTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        store = LocalBlobStore(os.path.join(self.temp.name, "blobs"))
+        self.claim_check = ClaimCheck(store, threshold=32)
+        self.appearance.claim_check = self.claim_check
+
+    async def test_result_is_checked_out(self):
+        value = {"raw_result": "x" * 100}
+        result = await self.claim_check.check_in(Result(uid_task="task", value=value))
+        await self.appearance._catch_response_result(result)
+
+        memo_value = await self.appearance.inner_memo.aget("task.response_result")
+        self.assertEqual(value, memo_value)
+
+    async def test_absent_value_is_answered(self):
+        waiter, _ = await self._wait()
+        uid = self.tasks[0].uid
+        await self.appearance._catch_result(
+            Result(uid_task=uid, value=None, value_ref="0" * 64)
+        )
+
+        self.assertTrue(is_error_answer(await waiter))
+        self.assertEqual({}, self.appearance._in_flight)
+
+
+class TestAppearanceAdmission(_AppearanceTestCase):
+    act = _act("act", admission=ActAdmission(max_depth=3, retry_after=7))
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.depth = (0, 1)
+
+        async def depth(queue):
+            return self.depth
+
+        self.appearance.queue_depths.depth = depth  # type: ignore[method-assign]
+
+    async def test_deep_queue_rejects_task(self):
+        await self.appearance._publish_task(self.act)
+
+        self.depth = (3, 1)
+        await self.appearance._catch_result(
+            Result(uid_task=self.tasks[0].uid, value="done")
+        )
+        with self.assertRaises(HTTPException) as raised:
+            await self.appearance._publish_task(self.act)
+
+        self.assertEqual(429, raised.exception.status_code)
+        self.assertEqual("7", raised.exception.headers["Retry-After"])
+        self.assertEqual({}, self.appearance._in_flight)
+        self.assertEqual(1, len(self.tasks))
+
+    async def test_unknown_depth_admits_task(self):
+        self.depth = None
+
+        await self.appearance._publish_task(self.act)
+        self.assertEqual(1, len(self.tasks))
+
+    async def test_batch_is_admitted_whole(self):
+        self.depth = (1, 1)
+        with self.assertRaises(HTTPException) as raised:
+            await self.appearance._publish_batch(
+                self.act, [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+            )
+
+        self.assertEqual(429, raised.exception.status_code)
+        self.assertEqual([], self.tasks)
+        self.assertEqual({}, self.appearance._in_flight)
+
+        # the tasks in flight aren't counted
+        await self.appearance._publish_task(self.act)
+        await self.appearance._publish_batch(self.act, [{}, {"text": "a"}])
+        self.assertEqual(2, len(self.tasks))
+
+    async def test_dropped_task_is_answered(self):
+        results = []
+
+        async def push(message, queue):
+            results.append((message, queue))
+
+        self.appearance.push = push  # type: ignore[method-assign]
+        await self.appearance._catch_dropped_task(
+            Task(uid="task", hid_act="act", context={})
+        )
+
+        result, _ = results[0]
+        self.assertEqual("task", result.uid_task)
+        self.assertTrue(is_error_answer(result.value))
+
+
+if __name__ == "__main__":
+    unittest.main()
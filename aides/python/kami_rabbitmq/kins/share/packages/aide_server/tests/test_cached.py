@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from typing import Any, Dict, List
+import unittest
+from unittest import mock
+
+from ..src.aide_server.memo_brokers import cached
+from ..src.aide_server.memo_brokers.cached import CachedMemoBroker
+from ..src.aide_server.memo_brokers.memo_broker import MemoBroker
+
+
+class _DictMemoBroker(MemoBroker):
+    def __init__(self):
+        super().__init__()
+        self.values: Dict[str, Any] = {}
+        self.reads: List[str] = []
+        # set to block the reads
+        self.read_started = threading.Event()
+        self.read_released = threading.Event()
+        self.read_released.set()
+
+    def get(self, key: str) -> Any:
+        self.reads.append(key)
+        value = self.values[key]
+        self.read_started.set()
+        self.read_released.wait()
+        return value
+
+    def put(self, key: str, value: Any):
+        self.values[key] = value
+
+    def delete(self, key: str):
+        del self.values[key]
+
+
+class TestCachedMemoBroker(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.broker = _DictMemoBroker()
+
+    async def test_hit_after_miss(self):
+        memo = CachedMemoBroker(self.broker)
+        self.broker.put("a", {"value": 1})
+
+        self.assertEqual({"value": 1}, await memo.aget("a"))
+        self.assertEqual({"value": 1}, await memo.aget("a"))
+
+        self.assertEqual(["a"], self.broker.reads)
+        self.assertEqual(1, memo.stats["hits"])
+        self.assertEqual(1, memo.stats["misses"])
+
+    async def test_write_replaces_cached_value(self):
+        memo = CachedMemoBroker(self.broker)
+
+        await memo.aput("a", 1)
+        await memo.aput("a", 2)
+
+        self.assertEqual(2, await memo.aget("a"))
+        self.assertEqual([], self.broker.reads)
+
+        await memo.adelete("a")
+        with self.assertRaises(KeyError):
+            await memo.aget("a")
+
+    async def test_ttls_zero_is_not_cached(self):
+        memo = CachedMemoBroker(self.broker, ttls={".progress": 0.0})
+
+        await memo.aput("task.progress", 10)
+        self.assertEqual(10, await memo.aget("task.progress"))
+        self.assertEqual(10, await memo.aget("task.progress"))
+
+        self.assertEqual(["task.progress"] * 2, self.broker.reads)
+        self.assertEqual(0, memo.stats["entries"])
+
+    async def test_size_is_measured_off_the_loop(self):
+        memo = CachedMemoBroker(self.broker, ttls={".progress": 0.0})
+        threads = []
+
+        def size(value: Any):
+            threads.append(threading.get_ident())
+            return 1
+
+        self.broker.put("b", 2)
+        with mock.patch.object(cached, "_size", size):
+            await memo.aput("a", 1)
+            await memo.aget("b")
+            await memo.aput("task.progress", 10)
+
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_read_before_write_is_not_cached(self):
+        memo = CachedMemoBroker(self.broker)
+        self.broker.put("a", "old")
+        self.broker.read_released.clear()
+
+        read = asyncio.create_task(memo.aget("a"))
+        await asyncio.to_thread(self.broker.read_started.wait)
+        await memo.aput("a", "new")
+        self.broker.read_released.set()
+
+        self.assertEqual("old", await read)
+        self.assertEqual("new", await memo.aget("a"))
+
+    async def test_eviction(self):
+        memo = CachedMemoBroker(self.broker, max_entries=2)
+
+        for key in ("a", "b", "c"):
+            await memo.aput(key, key)
+
+        self.assertEqual(2, memo.stats["entries"])
+        self.assertEqual(1, memo.stats["evictions"])
+        self.assertEqual("a", await memo.aget("a"))
+        self.assertEqual(["a"], self.broker.reads)
+
+
+if __name__ == "__main__":
+    unittest.main()
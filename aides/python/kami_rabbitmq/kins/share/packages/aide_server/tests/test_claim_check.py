@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+import unittest
+
+from ..src.aide_server.blob_stores.local import LocalBlobStore
+from ..src.aide_server.claim_check import ClaimCheck
+from ..src.aide_server.task_progress_result import Result
+
+
+class TestClaimCheck(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.store = LocalBlobStore(self.temp.name)
+        self.claim_check = ClaimCheck(self.store, threshold=32, max_age=60)
+
+    async def asyncTearDown(self):
+        await self.claim_check.aclose()
+        self.temp.cleanup()
+
+    async def test_small_value_stays_in_message(self):
+        result = Result(uid_task="task", value={"raw_result": "done"})
+
+        self.assertIs(result, await self.claim_check.check_in(result))
+
+    async def test_big_value_is_moved(self):
+        value = {"raw_result": "тест" * 100}
+        result = await self.claim_check.check_in(Result(uid_task="task", value=value))
+
+        self.assertIsNone(result.value)
+        self.assertIsNotNone(result.value_ref)
+        # checked in once
+        self.assertIs(result, await self.claim_check.check_in(result))
+
+        for _ in range(2):
+            checked_out = await self.claim_check.check_out(result)
+            self.assertEqual(value, checked_out.value)
+            self.assertIsNone(checked_out.value_ref)
+
+    async def test_same_values_share_blob(self):
+        value = "x" * 100
+        first = await self.claim_check.check_in(Result(uid_task="a", value=value))
+        second = await self.claim_check.check_in(Result(uid_task="b", value=value))
+
+        self.assertEqual(first.value_ref, second.value_ref)
+        self.assertEqual(1, len(await self.store.ascan()))
+
+    async def test_absent_value(self):
+        with self.assertRaises(KeyError):
+            await self.claim_check.check_out(
+                Result(uid_task="task", value=None, value_ref="0" * 64)
+            )
+        with self.assertRaises(KeyError):
+            await self.claim_check.check_out(
+                Result(uid_task="task", value=None, value_ref="../outside")
+            )
+
+    async def test_sweep_deletes_old_blobs(self):
+        old = await self.claim_check.check_in(Result(uid_task="a", value="x" * 100))
+        new = await self.claim_check.check_in(Result(uid_task="b", value="y" * 100))
+        touched_at = time.time() - 120
+        os.utime(self.store.path(old.value_ref), (touched_at, touched_at))
+
+        self.assertEqual(1, await self.claim_check.sweep())
+        with self.assertRaises(KeyError):
+            await self.claim_check.check_out(old)
+        self.assertEqual("y" * 100, (await self.claim_check.check_out(new)).value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Request
+import json
+from typing import Optional
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.configure import Configure
+from ..src.aide_server.routes import about
+from ..src.aide_server.routes.etag import RenderedResponses
+
+
+def _request(if_none_match: Optional[str] = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode("latin-1")))
+    return Request({"type": "http", "headers": headers})
+
+
+class TestRenderedResponses(unittest.TestCase):
+    def setUp(self):
+        self.rendered = RenderedResponses()
+        self.renders = 0
+
+    def _render(self):
+        self.renders += 1
+        return {"name": "тест"}
+
+    def test_rendered_once(self):
+        first = self.rendered.respond(_request(), "key", self._render)
+        second = self.rendered.respond(_request(), "key", self._render)
+
+        self.assertEqual(1, self.renders)
+        self.assertEqual(200, first.status_code)
+        self.assertEqual({"name": "тест"}, json.loads(first.body))
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.assertEqual("no-cache", first.headers["cache-control"])
+
+    def test_not_modified(self):
+        etag = self.rendered.respond(_request(), "key", self._render).headers["etag"]
+
+        for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.rendered.respond(
+                _request(if_none_match), "key", self._render
+            )
+            self.assertEqual(304, response.status_code)
+            self.assertEqual(b"", response.body)
+            self.assertEqual(etag, response.headers["etag"])
+
+        response = self.rendered.respond(_request('"other"'), "key", self._render)
+        self.assertEqual(200, response.status_code)
+
+    def test_invalidate(self):
+        etag = self.rendered.respond(_request(), "key", self._render).headers["etag"]
+        self.rendered.invalidate()
+        response = self.rendered.respond(_request(etag), "key", self._render)
+
+        self.assertEqual(2, self.renders)
+        self.assertEqual(304, response.status_code)
+
+
+class TestAboutRoutes(unittest.TestCase):
+    def setUp(self):
+        act = Act(
+            hid="act",
+            name={"en": "Act", "uk": "Дія"},
+            summary={"en": "act"},
+            description={"en": "act"},
+            tags=[],
+        )
+        self.router = APIRouter()
+        about.add_routes(
+            self.router,
+            configure=Configure(
+                name={"en": "test"},
+                hid="test",
+                savant_connector="amqp://localhost",
+                acts=[act],
+            ),
+            sidename="appearance",
+        )
+
+    def _endpoint(self, path: str):
+        for route in self.router.routes:
+            if route.path == path:  # type: ignore[attr-defined]
+                return route.endpoint  # type: ignore[attr-defined]
+        raise KeyError(path)
+
+    def test_acts_by_language(self):
+        acts_lang = self._endpoint("/acts/{lang}")
+
+        uk = json.loads(acts_lang(_request(), "uk").body)
+        self.assertEqual("Дія", uk[0]["name"])
+
+        # unknown language falls back to English
+        en = acts_lang(_request(), "en")
+        unknown = acts_lang(_request(), "xx")
+        self.assertEqual(en.headers["etag"], unknown.headers["etag"])
+
+        response = acts_lang(_request(en.headers["etag"]), "en")
+        self.assertEqual(304, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+from ..src.aide_server.memo_brokers.log_structured import LogStructuredMemoBroker
+
+
+class TestLogStructuredMemoBroker(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = self.temp.name
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_put_get_delete(self):
+        broker = LogStructuredMemoBroker(self.path)
+        broker.put("a", {"value": 1})
+        broker.put("a", {"value": 2})
+        broker.put("b", [1, 2, 3])
+        broker.delete("b")
+
+        self.assertEqual({"value": 2}, broker.get("a"))
+        with self.assertRaises(KeyError):
+            broker.get("b")
+        with self.assertRaises(KeyError):
+            broker.delete("b")
+
+        broker.close()
+
+    def test_recover_from_hints(self):
+        broker = LogStructuredMemoBroker(self.path, segment_size=64)
+        for i in range(10):
+            broker.put(f"key{i}", "x" * 32)
+        broker.put("key0", "new")
+        broker.delete("key1")
+        broker.close()
+
+        segments = [name for name in os.listdir(self.path) if name.endswith(".log")]
+        hints = [name for name in os.listdir(self.path) if name.endswith(".hint")]
+        self.assertGreater(len(segments), 1)
+        self.assertEqual(len(segments), len(hints))
+
+        broker = LogStructuredMemoBroker(self.path, segment_size=64)
+        self.assertEqual("new", broker.get("key0"))
+        with self.assertRaises(KeyError):
+            broker.get("key1")
+        for i in range(2, 10):
+            self.assertEqual("x" * 32, broker.get(f"key{i}"))
+        broker.close()
+
+    def test_recover_unsealed_segment_with_torn_tail(self):
+        broker = LogStructuredMemoBroker(self.path)
+        broker.put("a", "first")
+        broker.put("b", "second")
+        broker.delete("a")
+        segment = broker._active
+        # a crash: the segment isn't sealed
+        broker._active_file.close()  # type: ignore
+        size = os.path.getsize(segment.path)
+        with open(segment.path, "ab") as file:
+            file.write(b"\x01\x02\x03torn")
+
+        broker = LogStructuredMemoBroker(self.path)
+        self.assertEqual(size, os.path.getsize(segment.path))
+        self.assertTrue(os.path.exists(segment.hint_path))
+        self.assertEqual("second", broker.get("b"))
+        with self.assertRaises(KeyError):
+            broker.get("a")
+
+        broker.put("c", "third")
+        self.assertEqual("third", broker.get("c"))
+        broker.close()
+
+    def test_compact_keeps_live_records(self):
+        broker = LogStructuredMemoBroker(
+            self.path,
+            segment_size=256,
+            compact_garbage_ratio=0.5,
+        )
+        for n in range(5):
+            for i in range(4):
+                broker.put(f"key{i}", f"{n}" * 32)
+        count_segments = len(broker._segments)
+
+        self.assertGreater(broker.compact(), 0)
+        self.assertLess(len(broker._segments), count_segments)
+        for i in range(4):
+            self.assertEqual("4" * 32, broker.get(f"key{i}"))
+        broker.close()
+
+        broker = LogStructuredMemoBroker(self.path, segment_size=256)
+        for i in range(4):
+            self.assertEqual("4" * 32, broker.get(f"key{i}"))
+        broker.close()
+
+    def test_compact_drops_unneeded_tombstones(self):
+        broker = LogStructuredMemoBroker(
+            self.path,
+            segment_size=128,
+            compact_garbage_ratio=0.1,
+        )
+        for i in range(20):
+            broker.put(f"key{i}", "x" * 32)
+            broker.delete(f"key{i}")
+        broker.put("live", "value")
+
+        for _ in range(5):
+            broker.compact()
+        tombstones = sum(len(s.tombstones) for s in broker._segments.values())
+        self.assertEqual(0, tombstones)
+        broker.close()
+
+        broker = LogStructuredMemoBroker(self.path, segment_size=128)
+        self.assertEqual("value", broker.get("live"))
+        for i in range(20):
+            with self.assertRaises(KeyError):
+                broker.get(f"key{i}")
+        broker.close()
+
+    def test_compact_keeps_tombstone_hiding_older_record(self):
+        broker = LogStructuredMemoBroker(
+            self.path,
+            segment_size=128,
+            compact_garbage_ratio=0.5,
+        )
+        # the segment of `old` is mostly live and isn't compacted
+        broker.put("old", "o" * 16)
+        broker.put("keep", "k" * 128)
+        broker.delete("old")
+        broker.put("temp", "t" * 128)
+        # the segment of tombstone is garbage now
+        broker.put("temp", "u" * 128)
+
+        self.assertEqual(1, broker.compact())
+        self.assertIn("old", broker._active.tombstones)  # type: ignore
+        broker.close()
+
+        broker = LogStructuredMemoBroker(self.path, segment_size=128)
+        with self.assertRaises(KeyError):
+            broker.get("old")
+        self.assertEqual("k" * 128, broker.get("keep"))
+        self.assertEqual("u" * 128, broker.get("temp"))
+        broker.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
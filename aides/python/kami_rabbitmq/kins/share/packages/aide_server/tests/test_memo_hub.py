@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+from typing import Any, Dict
+import unittest
+
+from ..src.aide_server.inner_memo import InnerMemo
+from ..src.aide_server.memo_brokers.memo_broker import MemoBroker
+from ..src.aide_server.memo_hub import UnixSocketMemoHub
+
+
+class _DictMemoBroker(MemoBroker):
+    def __init__(self):
+        super().__init__()
+        self.values: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Any:
+        return self.values[key]
+
+    def put(self, key: str, value: Any):
+        self.values[key] = value
+
+    def delete(self, key: str):
+        del self.values[key]
+
+
+class TestWatch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.memo = InnerMemo(_DictMemoBroker())
+
+    async def test_wait_for_present_key(self):
+        await self.memo.aput("task.result", "done")
+
+        self.assertEqual("done", await self.memo.wait_for("task.result", 1.0))
+
+    async def test_wait_for_put(self):
+        waiter = asyncio.create_task(self.memo.wait_for("task.result", 1.0))
+        await asyncio.sleep(0)
+        await self.memo.aput("task.result", "done")
+
+        self.assertEqual("done", await waiter)
+        self.assertEqual({}, self.memo.hub._watchers)
+
+    async def test_wait_for_timeout(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.memo.wait_for("task.result", 0.01)
+
+        self.assertEqual({}, self.memo.hub._watchers)
+
+    async def test_watch(self):
+        await self.memo.aput("task.progress", 10)
+
+        values = []
+
+        async def watch():
+            async for value in self.memo.watch("task.progress"):
+                values.append(value)
+                if value == 30:
+                    return
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.sleep(0)
+        await self.memo.aput("task.progress", 20)
+        # put from other thread
+        await asyncio.to_thread(self.memo.put, "task.progress", 30)
+        await asyncio.wait_for(watcher, 1.0)
+
+        self.assertEqual([10, 20, 30], values)
+        self.assertEqual({}, self.memo.hub._watchers)
+
+
+class TestUnixSocketMemoHub(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.peer = self._bind("peer.sock")
+        self.hub = UnixSocketMemoHub(
+            self.temp.name,
+            max_inline_bytes=64,
+            peers_interval=0.01,
+        )
+        self.broker = _DictMemoBroker()
+        self.memo = InnerMemo(self.broker, hub=self.hub)
+        await self.memo.astart()
+
+    async def asyncTearDown(self):
+        await self.memo.aclose()
+        self.peer.close()
+        self.temp.cleanup()
+
+    def _bind(self, filename: str) -> socket.socket:
+        peer = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        peer.bind(os.path.join(self.temp.name, filename))
+        peer.settimeout(1.0)
+        return peer
+
+    async def test_sends_small_value(self):
+        await self.memo.aput("task.progress", 10)
+
+        message = json.loads(self.peer.recv(1024))
+        self.assertEqual({"key": "task.progress", "value": 10}, message)
+
+    async def test_sends_key_of_big_value(self):
+        await self.memo.aput("task.result", "x" * 1000)
+        await self.memo.aput("task.result", {"a": list(range(1000))})
+
+        for _ in range(2):
+            message = json.loads(self.peer.recv(1024))
+            self.assertEqual({"key": "task.result"}, message)
+
+    async def test_receives_changed_key(self):
+        waiter = asyncio.create_task(self.memo.wait_for("task.absent", 1.0))
+        await asyncio.sleep(0)
+
+        self.peer.sendto(
+            json.dumps({"key": "task.absent", "value": "done"}).encode("utf-8"),
+            self.hub.address,
+        )
+        self.assertEqual("done", await waiter)
+
+        waiter = asyncio.create_task(self.memo.wait_for("task.changed", 1.0))
+        await asyncio.sleep(0)
+        self.broker.put("task.changed", "read")
+        self.peer.sendto(
+            json.dumps({"key": "task.changed"}).encode("utf-8"),
+            self.hub.address,
+        )
+        self.assertEqual("read", await waiter)
+
+    async def test_peers_are_listed(self):
+        self.assertEqual([self.peer.getsockname()], self.hub._peers)
+
+        # a gone process is forgotten on send
+        self.peer.close()
+        await self.memo.aput("task.progress", 10)
+        self.assertEqual([], self.hub._peers)
+
+        # a new process is listed by timer
+        self.peer = self._bind("new.sock")
+        await asyncio.sleep(0.05)
+        self.assertEqual([self.peer.getsockname()], self.hub._peers)
+
+    async def test_listing_is_off_the_loop(self):
+        threads = []
+        list_peers = self.hub._list_peers
+
+        def spy():
+            threads.append(threading.get_ident())
+            return list_peers()
+
+        self.hub._list_peers = spy
+        await asyncio.sleep(0.05)
+        await self.memo.aput("task.progress", 10)
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from typing import Any, Dict, Iterator, Tuple
+import unittest
+from unittest import mock
+
+from ..src.aide_server.memo_brokers import retention
+from ..src.aide_server.memo_brokers.memo_broker import MemoBroker
+from ..src.aide_server.memo_brokers.retention import (
+    RetentionMemoBroker,
+    RetentionPolicy,
+)
+
+
+class _DictMemoBroker(MemoBroker):
+    def __init__(self):
+        super().__init__()
+        self.values: Dict[str, Any] = {}
+        # key: created_at
+        self.created: Dict[str, float] = {}
+
+    def get(self, key: str) -> Any:
+        return self.values[key]
+
+    def put(self, key: str, value: Any):
+        self.values[key] = value
+
+    def delete(self, key: str):
+        del self.values[key]
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        for key, value in self.values.items():
+            yield key, self.created.get(key, 0.0), len(str(value))
+
+
+class TestRetentionMemoBroker(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.broker = _DictMemoBroker()
+
+    async def test_max_count_deletes_least_recently_used(self):
+        memo = RetentionMemoBroker(self.broker, RetentionPolicy(max_count=2))
+
+        for key in ("a", "b", "c"):
+            await memo.aput(key, key)
+        await memo.aget("a")
+
+        self.assertEqual(1, await memo.sweep())
+        self.assertEqual(["a", "c"], sorted(self.broker.values))
+
+    async def test_max_age(self):
+        memo = RetentionMemoBroker(self.broker, RetentionPolicy(max_age=10.0))
+
+        with mock.patch.object(retention.time, "time", return_value=100.0):
+            await memo.aput("old", 1)
+        with mock.patch.object(retention.time, "time", return_value=105.0):
+            await memo.aput("new", 2)
+
+        with mock.patch.object(retention.time, "time", return_value=112.0):
+            self.assertEqual(1, await memo.sweep())
+
+        self.assertEqual(["new"], list(self.broker.values))
+
+    async def test_max_bytes_measured_off_the_loop(self):
+        memo = RetentionMemoBroker(self.broker, RetentionPolicy(max_bytes=10))
+        threads = []
+
+        def size(value: Any) -> int:
+            threads.append(threading.get_ident())
+            return len(value)
+
+        with mock.patch.object(retention, "_size", size):
+            await memo.aput("a", "xxxxxx")
+            await memo.aput("b", "yyyyyy")
+
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(threading.get_ident(), threads)
+
+        self.assertEqual(1, await memo.sweep())
+        self.assertEqual(["b"], list(self.broker.values))
+
+    async def test_start_indexes_existing_keys(self):
+        self.broker.values = {"old": 1, "older": 2}
+        self.broker.created = {"old": 2.0, "older": 1.0}
+        memo = RetentionMemoBroker(self.broker, RetentionPolicy(max_count=2))
+
+        await memo.aput("new", 3)
+        await memo.astart()
+        try:
+            self.assertEqual(1, await memo.sweep())
+        finally:
+            await memo.aclose()
+
+        self.assertEqual(["new", "old"], sorted(self.broker.values))
+
+    async def test_close_awaits_sweeper(self):
+        memo = RetentionMemoBroker(
+            self.broker,
+            RetentionPolicy(max_count=1, sweep_interval=0.01),
+        )
+        await memo.astart()
+        sweeper = memo._sweeper
+
+        await memo.aput("a", 1)
+        await memo.aput("b", 2)
+        await asyncio.sleep(0.05)
+        await memo.aclose()
+
+        self.assertEqual(["b"], list(self.broker.values))
+        self.assertTrue(sweeper.done())
+        self.assertIsNone(memo._sweeper)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,10 @@ from typing import Any, Dict
 
 from ..config import fake_response, improve_answer, open_api_key, map_answer
 from ..context import Context
+from ..packages.aide_server.src.aide_server.act_pools import blocking
 from ..packages.aide_server.src.aide_server.helpers import (
+    BlockingPublishProgressFn,
+    BlockingPublishResultFn,
     construct_and_publish,
     PublishProgressFn,
     PublishResultFn,
@@ -38,10 +41,12 @@ async def phrasal_verbs(
     )
 
 
-async def _construct_raw_result(
+# the client of OpenAI is sync
+@blocking
+def _construct_raw_result(
     task: Task,
-    publish_progress: PublishProgressFn,
-    publish_result: PublishResultFn,
+    publish_progress: BlockingPublishProgressFn,
+    publish_result: BlockingPublishResultFn,
     start_progress: NonNegativeFloat,
     stop_progress: NonNegativeFloat,
 ):
@@ -10,7 +10,10 @@ from .sentence import Sentence
 
 from ...config import *
 from ...context import Context
+from ...packages.aide_server.src.aide_server.act_pools import blocking
 from ...packages.aide_server.src.aide_server.helpers import (
+    BlockingPublishProgressFn,
+    BlockingPublishResultFn,
     construct_and_publish,
     PublishProgressFn,
     PublishResultFn,
@@ -33,10 +36,12 @@ async def translate_caption(
     )
 
 
-async def _construct_raw_result(
+# the translator is sync, a request per sentence
+@blocking
+def _construct_raw_result(
     task: Task,
-    publish_progress: PublishProgressFn,
-    publish_result: PublishResultFn,
+    publish_progress: BlockingPublishProgressFn,
+    publish_result: BlockingPublishResultFn,
     start_progress: NonNegativeFloat,
     stop_progress: NonNegativeFloat,
 ):
@@ -60,7 +65,8 @@ async def _construct_raw_result(
 
         progress = round(100 * i / (len(sentences) + 1), 2)
         logger.info(f"{i} {progress}% {sentence}")
-        await publish_progress(task, progress)
+        # waits for the publish on the loop of Brain
+        publish_progress(task, progress)
 
     r = {
         "sentences_count": len(sentences),
@@ -0,0 +1,167 @@
+import aio_pika
+import asyncio
+from faststream.rabbit import RabbitQueue
+from pydantic import BaseModel, Field, NonNegativeInt, PositiveFloat, PositiveInt
+import time
+from typing import Any, Dict, Literal, Optional, Tuple
+
+from .log import logger
+
+
+class ActAdmission(BaseModel):
+    """
+    Backpressure on the tasks of act, see `Act.admission`.
+    A task is rejected with 429 while the queue of Brain is too deep.
+    """
+
+    max_depth: Optional[PositiveInt] = Field(
+        default=None,
+        title="Max Depth",
+        description="Reject the tasks while the task queue has as many ready messages.",
+    )
+
+    max_depth_per_consumer: Optional[PositiveInt] = Field(
+        default=None,
+        title="Max Depth per Consumer",
+        description="The same as `max_depth` for each consumer of task queue, at least 1 consumer is counted.",
+    )
+
+    retry_after: PositiveInt = Field(
+        default=5,
+        title="Retry After",
+        description="The value of `Retry-After` header for rejected tasks, in seconds.",
+    )
+
+    max_length: Optional[PositiveInt] = Field(
+        default=None,
+        title="Max Length",
+        description="`x-max-length` of the task queue: the broker applies `overflow` above. Every side should use the same value.",
+    )
+
+    overflow: Literal["reject-publish", "drop-head"] = Field(
+        default="reject-publish",
+        title="Overflow",
+        description="`x-overflow` of the task queue with `max_length`. The tasks dropped by `drop-head` are answered with an error by Appearance.",
+    )
+
+    @property
+    def drops_tasks(self) -> bool:
+        return self.max_length is not None and self.overflow == "drop-head"
+
+    # The dropped tasks are dead-lettered by `dead_letter_routing_key`.
+    def queue_arguments(
+        self,
+        dead_letter_exchange: str,
+        dead_letter_routing_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        if self.max_length is None:
+            return None
+
+        arguments: Dict[str, Any] = {
+            "x-max-length": self.max_length,
+            "x-overflow": self.overflow,
+        }
+        if self.drops_tasks:
+            arguments["x-dead-letter-exchange"] = dead_letter_exchange
+            arguments["x-dead-letter-routing-key"] = dead_letter_routing_key
+
+        return arguments
+
+    # Returns a count of tasks which can be admitted to the queue.
+    def room(self, messages: int, consumers: int) -> float:
+        limits = []
+        if self.max_depth is not None:
+            limits.append(self.max_depth)
+        if self.max_depth_per_consumer is not None:
+            limits.append(self.max_depth_per_consumer * max(consumers, 1))
+
+        return min(limits, default=float("inf")) - messages
+
+
+class QueueDepths:
+    """
+    The count of ready messages and consumers of queues read by a passive
+    declare and cached for `interval` seconds.
+    Declares on its own channel: a failed passive declare closes a channel.
+    """
+
+    def __init__(
+        self,
+        broker: Any,
+        interval: PositiveFloat = 1.0,
+    ):
+        self.name = type(self).__name__
+        self.broker = broker
+        self.interval = interval
+
+        # name of queue: (messages, consumers, expires_at)
+        self._depths: Dict[str, Tuple[int, int, float]] = {}
+        self._channel: Optional[aio_pika.abc.AbstractChannel] = None
+        self._lock = asyncio.Lock()
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of depths. Set by class.",
+    )
+
+    interval: PositiveFloat = Field(
+        default=1.0,
+        title="Interval",
+        description="How long a depth of queue is cached, in seconds.",
+    )
+
+    # Returns (messages, consumers) or `None` when the broker can't tell.
+    async def depth(
+        self,
+        queue: RabbitQueue,
+    ) -> Optional[Tuple[NonNegativeInt, NonNegativeInt]]:
+        found = self._fresh(queue.name)
+        if found is not None:
+            return found
+
+        async with self._lock:
+            # refreshed by a concurrent call
+            found = self._fresh(queue.name)
+            if found is not None:
+                return found
+
+            try:
+                channel = await self._ensure_channel()
+                declared = await channel.declare_queue(queue.name, passive=True)
+            except Exception as ex:
+                logger.warning(f"Can't read the depth of queue `{queue.name}`: {ex}")
+                await self.aclose()
+                return None
+
+            result = declared.declaration_result
+            messages, consumers = result.message_count, result.consumer_count
+            self._depths[queue.name] = (
+                messages,
+                consumers,
+                time.monotonic() + self.interval,
+            )
+
+            return messages, consumers
+
+    # Called when the server shuts down.
+    async def aclose(self):
+        channel, self._channel = self._channel, None
+        if channel is not None and not channel.is_closed:
+            await channel.close()
+
+    def _fresh(self, name: str) -> Optional[Tuple[int, int]]:
+        depth = self._depths.get(name)
+        if depth is None or depth[2] < time.monotonic():
+            return None
+        return depth[0], depth[1]
+
+    async def _ensure_channel(self) -> aio_pika.abc.AbstractChannel:
+        if self._channel is None or self._channel.is_closed:
+            # the connection of started broker
+            connection = await self.broker.connect()
+            self._channel = await connection.channel(publisher_confirms=False)
+        return self._channel
+
+    def __str__(self):
+        return self.name
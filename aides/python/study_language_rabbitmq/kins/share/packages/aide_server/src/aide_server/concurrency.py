@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field, PositiveInt
+from typing import Optional
+
+
+class ActConcurrency(BaseModel):
+    """
+    The limits of running tasks of act on one Brain, see `Act.concurrency`.
+    """
+
+    max_running: PositiveInt = Field(
+        default=1,
+        title="Max Running",
+        description="The count of tasks of act which run at once.",
+    )
+
+    prefetch: Optional[PositiveInt] = Field(
+        default=None,
+        title="Prefetch",
+        description="The count of unacked tasks delivered to the consumer of task queue. Twice `max_running` when `None`.",
+    )
+
+    @property
+    def prefetch_count(self) -> int:
+        return self.prefetch or self.max_running * 2
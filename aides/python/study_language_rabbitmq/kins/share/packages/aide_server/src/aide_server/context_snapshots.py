@@ -0,0 +1,118 @@
+from collections import OrderedDict
+import hashlib
+import json
+from pydantic import Field, PositiveFloat, PositiveInt
+import time
+from typing import Any, Dict
+
+from .log import logger
+from .memo_brokers.memo_broker import MemoBroker
+from .task_progress_result import Task
+
+
+class ContextSnapshots:
+    """
+    The contexts of tasks stored once by their hash in a memo shared by
+    Appearance and Brain: a `Task` carries `context_ref` only, so its size
+    doesn't depend on the size of context.
+    Put a cache in front of `broker` on Brain, the snapshots never change.
+    The answers carry `context_ref` for such tasks, see `construct_answer()`.
+    """
+
+    def __init__(
+        self,
+        broker: MemoBroker,
+        max_known: PositiveInt = 10000,
+        known_ttl: PositiveFloat = 60 * 60,
+    ):
+        self.name = type(self).__name__
+        self.broker = broker
+        self.max_known = max_known
+        self.known_ttl = known_ttl
+
+        # ref: expires_at, the refs stored by this process
+        self._known: OrderedDict[str, float] = OrderedDict()
+
+        logger.info(f"🏳️‍🌈 Initialized `{self.name}` with broker `{self.broker}`.")
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of snapshots. Set by class.",
+    )
+
+    broker: MemoBroker = Field(
+        ...,
+        title="Memo Broker",
+        description="The shared storage of snapshots.",
+    )
+
+    max_known: PositiveInt = Field(
+        default=10000,
+        title="Max Known",
+        description="The count of refs remembered as stored, they aren't written again.",
+    )
+
+    known_ttl: PositiveFloat = Field(
+        default=60 * 60,
+        title="Known TTL",
+        description="A ref is written again after, so the retention of broker doesn't sweep a used snapshot. In seconds.",
+    )
+
+    async def aput(self, context: Dict[str, Any]) -> str:
+        """
+        Returns the ref of `context`.
+        """
+        ref = context_hash(context)
+        expires_at = self._known.get(ref)
+        if expires_at is not None and expires_at > time.monotonic():
+            return ref
+
+        await self.broker.aput(ref, context)
+        self._known.pop(ref, None)
+        self._known[ref] = time.monotonic() + self.known_ttl
+        while len(self._known) > self.max_known:
+            self._known.popitem(last=False)
+
+        return ref
+
+    async def aget(self, ref: str) -> Dict[str, Any]:
+        """
+        Raises `KeyError` when the snapshot is absent.
+        """
+        return await self.broker.aget(ref)
+
+    # Returns the task with `context` resolved from `context_ref`.
+    async def aresolve(self, task: Task) -> Task:
+        if not task.context_ref or task.context:
+            return task
+
+        context = await self.aget(task.context_ref)
+
+        return task.model_copy(update={"context": context})
+
+    # Called when the server starts.
+    async def astart(self) -> None:
+        await self.broker.astart()
+
+    # Called when the server shuts down.
+    async def aclose(self) -> None:
+        await self.broker.aclose()
+
+    def __str__(self):
+        return self.name
+
+
+def context_hash(context: Dict[str, Any]) -> str:
+    """
+    The same for equal contexts regardless of the order of keys.
+    """
+    canonical = json.dumps(
+        context,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
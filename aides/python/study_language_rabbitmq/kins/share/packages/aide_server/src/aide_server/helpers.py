@@ -2,8 +2,9 @@ import asyncio
 from fastapi import routing
 from pydantic import NonNegativeFloat, NonNegativeInt
 import traceback
-from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
+from .act_pools import act_pools, blocking_publishers, is_blocking
 from .log import logger
 from .task_progress_result import Result, Task
 
@@ -16,47 +17,114 @@ PublishProgressFn = Callable[[Task, NonNegativeFloat], Awaitable[NonNegativeFloa
 # (task, result)
 PublishResultFn = Callable[[Task, Any], Awaitable[Any]]
 
+# The publishers of a blocking stage or run wait for the publish on the loop,
+# see `blocking()`. They publish nothing and return `None` for a CPU-bound one.
+BlockingPublishProgressFn = Callable[
+    [Task, NonNegativeFloat], Optional[NonNegativeFloat]
+]
+BlockingPublishResultFn = Callable[[Task, Any], Any]
+
 # (task, publish_progress, publish_result, start_progress, stop_progress)
-ConstructRawResult = Callable[
-    [
-        Task,
-        PublishProgressFn,
-        PublishResultFn,
-        NonNegativeFloat,
-        NonNegativeFloat,
+ConstructRawResult = Union[
+    Callable[
+        [
+            Task,
+            PublishProgressFn,
+            PublishResultFn,
+            NonNegativeFloat,
+            NonNegativeFloat,
+        ],
+        Awaitable[Any],
+    ],
+    Callable[
+        [
+            Task,
+            BlockingPublishProgressFn,
+            BlockingPublishResultFn,
+            NonNegativeFloat,
+            NonNegativeFloat,
+        ],
+        Any,
     ],
-    Awaitable[Any],
 ]
 
 # (task, raw_result, publish_progress, publish_result, start_progress, stop_progress)
-ConstructImprovedResult = Callable[
-    [
-        Task,
+ConstructImprovedResult = Union[
+    Callable[
+        [
+            Task,
+            Any,
+            PublishProgressFn,
+            PublishResultFn,
+            NonNegativeFloat,
+            NonNegativeFloat,
+        ],
+        Awaitable[Any],
+    ],
+    Callable[
+        [
+            Task,
+            Any,
+            BlockingPublishProgressFn,
+            BlockingPublishResultFn,
+            NonNegativeFloat,
+            NonNegativeFloat,
+        ],
         Any,
-        PublishProgressFn,
-        PublishResultFn,
-        NonNegativeFloat,
-        NonNegativeFloat,
     ],
-    Awaitable[Any],
 ]
 
 # (task, raw_result, improved_result, publish_progress, publish_result, start_progress, stop_progress)
-ConstructMappedResult = Callable[
-    [
-        Task,
-        Any,
-        Any,
-        PublishProgressFn,
-        PublishResultFn,
-        NonNegativeFloat,
-        NonNegativeFloat,
+ConstructMappedResult = Union[
+    Callable[
+        [
+            Task,
+            Any,
+            Any,
+            PublishProgressFn,
+            PublishResultFn,
+            NonNegativeFloat,
+            NonNegativeFloat,
+        ],
+        Awaitable[Dict[str, Any]],
+    ],
+    Callable[
+        [
+            Task,
+            Any,
+            Any,
+            BlockingPublishProgressFn,
+            BlockingPublishResultFn,
+            NonNegativeFloat,
+            NonNegativeFloat,
+        ],
+        Dict[str, Any],
     ],
-    Awaitable[Dict[str, Any]],
 ]
 
 # (task, publish_progress, publish_result)
-RunFn = Callable[[Task, PublishProgressFn, PublishResultFn], Awaitable[None]]
+AsyncRunFn = Callable[[Task, PublishProgressFn, PublishResultFn], Awaitable[None]]
+BlockingRunFn = Callable[
+    [Task, BlockingPublishProgressFn, BlockingPublishResultFn], None
+]
+RunFn = Union[AsyncRunFn, BlockingRunFn]
+
+
+def act_run(hid_act: str):
+    """
+    Registers a run for the act explicitly, the Brain doesn't match
+    the name of run then.
+
+        @act_run("translate_caption")
+        async def translate(task, publish_progress, publish_result):
+            ...
+    """
+
+    def register(run: RunFn) -> RunFn:
+        run.__aide_act__ = hid_act  # type: ignore[attr-defined]
+        return run
+
+    return register
 
 
 def construct_answer(
@@ -65,6 +133,7 @@ def construct_answer(
     raw_result: Optional[Any] = None,
     context: Optional[Dict[str, Any]] = None,
     error: Optional[Exception] = None,
+    context_ref: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     The order keys into JSON-answer:
@@ -72,7 +141,7 @@ def construct_answer(
         - mapped_result
         - improved_result
         - raw_result
-        - context
+        - context or context_ref
     """
     o = {}
 
@@ -92,12 +161,24 @@ def construct_answer(
     if bool(raw_result) or (not bool(improved_result) and not bool(mapped_result)):
         o["raw_result"] = raw_result
 
-    if bool(context):
+    if context_ref:
+        o["context_ref"] = context_ref
+    elif bool(context):
         o["context"] = context
 
     return o
 
 
+# The answer of `construct_answer()` with error, also wrapped into `Result`.
+def is_error_answer(value: Any) -> bool:
+    if isinstance(value, Result):
+        value = value.value
+    if isinstance(value, dict) and "uid_task" in value and "value" in value:
+        value = value["value"]
+
+    return isinstance(value, dict) and bool(value.get("error"))
+
+
 async def construct_and_publish(
     act_hid: str,
     task: Task,
@@ -131,37 +212,40 @@ async def construct_and_publish(
     while True:
         try:
             await publish_progress(task, start_progress_raw_result)
-            raw_result = fake_raw_result or await construct_raw_result(
+            raw_result = fake_raw_result or await _construct(
+                construct_raw_result,
                 task,
-                publish_progress,
-                publish_result,
-                start_progress_raw_result,
-                stop_progress_raw_result,
+                publish_progress=publish_progress,
+                publish_result=publish_result,
+                start_progress=start_progress_raw_result,
+                stop_progress=stop_progress_raw_result,
             )
             await publish_progress(task, stop_progress_raw_result)
 
             if construct_improved_result:
                 await publish_progress(task, start_progress_improved_result)
-                improved_result = await construct_improved_result(
+                improved_result = await _construct(
+                    construct_improved_result,
                     task,
                     raw_result,
-                    publish_progress,
-                    publish_result,
-                    start_progress_improved_result,
-                    stop_progress_improved_result,
+                    publish_progress=publish_progress,
+                    publish_result=publish_result,
+                    start_progress=start_progress_improved_result,
+                    stop_progress=stop_progress_improved_result,
                 )
             await publish_progress(task, stop_progress_improved_result)
 
             if construct_mapped_result:
                 await publish_progress(task, start_progress_mapped_result)
-                mapped_result = await construct_mapped_result(
+                mapped_result = await _construct(
+                    construct_mapped_result,
                     task,
                     raw_result,
                     improved_result,
-                    publish_progress,
-                    publish_result,
-                    start_progress_mapped_result,
-                    stop_progress_mapped_result,
+                    publish_progress=publish_progress,
+                    publish_result=publish_result,
+                    start_progress=start_progress_mapped_result,
+                    stop_progress=stop_progress_mapped_result,
                 )
             await publish_progress(task, stop_progress_mapped_result)
 
@@ -182,6 +266,8 @@ async def construct_and_publish(
         raw_result=raw_result if include_raw_response_in_answer else None,
         context=task.context if include_context_in_answer else None,
         error=error,
+        # the task came without context, don't send it back
+        context_ref=task.context_ref if include_context_in_answer else None,
     )
 
     await publish_progress(task, 99 if error else 100)
@@ -192,6 +278,46 @@ async def construct_and_publish(
     )
 
 
+# Calls a blocking stage on the pool of act, see `blocking()`.
+# The progress and result are published on the loop anyway.
+async def _construct(
+    stage: Callable[..., Any],
+    task: Task,
+    *results: Any,
+    publish_progress: PublishProgressFn,
+    publish_result: PublishResultFn,
+    start_progress: NonNegativeFloat,
+    stop_progress: NonNegativeFloat,
+) -> Any:
+    if not is_blocking(stage):
+        return await stage(
+            task,
+            *results,
+            publish_progress,
+            publish_result,
+            start_progress,
+            stop_progress,
+        )
+
+    blocking_publish_progress, blocking_publish_result = blocking_publishers(
+        stage,
+        asyncio.get_running_loop(),
+        publish_progress,
+        publish_result,
+    )
+
+    return await act_pools.run(
+        task.hid_act,
+        stage,
+        task,
+        *results,
+        blocking_publish_progress,
+        blocking_publish_result,
+        start_progress,
+        stop_progress,
+    )
+
+
 # T = TypeVar("T")
 
 
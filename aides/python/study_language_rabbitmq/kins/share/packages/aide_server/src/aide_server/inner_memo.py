@@ -1,17 +1,21 @@
+import asyncio
 from pydantic import Field
-from typing import Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from .log import logger
 from .memo_brokers.memo_broker import MemoBroker, NoneMemoBroker
+from .memo_hub import CHANGED, MemoHub
 
 
 class InnerMemo:
     def __init__(
         self,
         broker: MemoBroker,
+        hub: Optional[MemoHub] = None,
     ):
         self.name = type(self).__name__
         self.broker = broker
+        self.hub = hub or MemoHub()
 
     def get(self, key: str) -> Any:
         try:
@@ -21,7 +25,98 @@ class InnerMemo:
             return ""
 
     def put(self, key: str, value: Any) -> None:
-        return self.broker.put(key, value)
+        self.broker.put(key, value)
+        self.hub.notify(key, value)
+
+    def delete(self, key: str) -> None:
+        try:
+            return self.broker.delete(key)
+        except KeyError:
+            logger.warning(f"`{self.name}`: the key `{key}` is absent.")
+
+    # Use the methods below from the event loop.
+
+    async def aget(self, key: str) -> Any:
+        try:
+            return await self._aget(key)
+        except KeyError:
+            logger.warning(f"`{self.name}`: the key `{key}` is absent.")
+            return ""
+
+    async def aput(self, key: str, value: Any) -> None:
+        await self.broker.aput(key, value)
+        self.hub.notify(key, value)
+
+    # Returns the values of present keys only.
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        return await self.broker.aget_many(keys)
+
+    async def adelete(self, key: str) -> None:
+        try:
+            return await self.broker.adelete(key)
+        except KeyError:
+            logger.warning(f"`{self.name}`: the key `{key}` is absent.")
+
+    async def wait_for(self, key: str, timeout: float) -> Any:
+        """
+        Returns the value of `key`. Waits until it's put when the key is absent.
+        Raises `asyncio.TimeoutError`.
+        """
+        # subscribe before the read, so a put between them isn't lost
+        queue = self.hub.subscribe(key)
+        try:
+            found, value = await self._afind(key)
+            if found:
+                return value
+
+            return await asyncio.wait_for(self._anext(key, queue), timeout)
+        finally:
+            self.hub.unsubscribe(key, queue)
+
+    async def watch(self, key: str) -> AsyncIterator[Any]:
+        """
+        Yields the value of `key` when present and then every value put.
+        """
+        queue = self.hub.subscribe(key)
+        try:
+            found, value = await self._afind(key)
+            if found:
+                yield value
+
+            while True:
+                yield await self._anext(key, queue)
+        finally:
+            self.hub.unsubscribe(key, queue)
+
+    # Called when the server starts.
+    async def astart(self) -> None:
+        await self.broker.astart()
+        await self.hub.astart()
+
+    # Called when the server shuts down.
+    async def aclose(self) -> None:
+        await self.hub.aclose()
+        await self.broker.aclose()
+
+    # Raises `KeyError` when the key is absent.
+    async def _aget(self, key: str) -> Any:
+        return await self.broker.aget(key)
+
+    async def _afind(self, key: str) -> Tuple[bool, Any]:
+        try:
+            return True, await self._aget(key)
+        except KeyError:
+            return False, None
+
+    async def _anext(self, key: str, queue: asyncio.Queue) -> Any:
+        while True:
+            value = await queue.get()
+            if value is not CHANGED:
+                return value
+
+            found, value = await self._afind(key)
+            if found:
+                return value
 
     name: str = Field(
         ...,
@@ -35,6 +130,12 @@ class InnerMemo:
         description="Broker this inner memory.",
     )
 
+    hub: MemoHub = Field(
+        ...,
+        title="Memo Hub",
+        description="Notifies the watchers of keys about put values.",
+    )
+
     def __str__(self):
         return self.name
 
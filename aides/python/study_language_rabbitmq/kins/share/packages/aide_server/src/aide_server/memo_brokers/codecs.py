@@ -0,0 +1,147 @@
+from abc import ABC, abstractmethod
+import json
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# A stored value starts with the tag of its codec: `\0msgpack\n...`.
+# The values without tag are JSON, so the stores written before
+# the codecs appeared are readable.
+_TAG_MARK = b"\0"
+_TAG_END = b"\n"
+
+
+class Codec(ABC):
+    # The codecs with an empty tag write plain JSON.
+    name: str = ""
+
+    @property
+    def tag(self) -> bytes:
+        return _TAG_MARK + self.name.encode("ascii") + _TAG_END
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        pass
+
+    # Encodes with a tag, see `unpack()`.
+    def pack(self, value: Any) -> bytes:
+        return self.tag + self.encode(value)
+
+    def __str__(self):
+        return self.name
+
+
+class JsonCodec(Codec):
+    name = "json"
+
+    @property
+    def tag(self) -> bytes:
+        return b""
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON by https://github.com/ijl/orjson
+    The stored values are readable by `JsonCodec` and vice versa.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("Install `orjson` to use `OrjsonCodec`.")
+
+    def encode(self, value: Any) -> bytes:
+        # `json` converts the non-string keys too
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """
+    https://msgpack.org
+    """
+
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("Install `msgpack` to use `MsgpackCodec`.")
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class RawCodec(Codec):
+    """
+    Stores `bytes` as is. Other values are rejected.
+    """
+
+    name = "raw"
+
+    def encode(self, value: Any) -> bytes:
+        if not isinstance(value, (bytes, bytearray)):
+            raise TypeError(f"`{self.name}` codec stores bytes only, got {type(value)}.")
+        return bytes(value)
+
+    def decode(self, data: bytes) -> Any:
+        return bytes(data)
+
+
+def default_codec() -> Codec:
+    """
+    The fastest JSON codec available.
+    """
+    return JsonCodec() if orjson is None else OrjsonCodec()
+
+
+_json = default_codec()
+_codec_types: Dict[str, type] = {
+    c.name: c for c in [JsonCodec, OrjsonCodec, MsgpackCodec, RawCodec]
+}
+_codecs: Dict[str, Codec] = {}
+
+
+def unpack(data: Union[bytes, str]) -> Any:
+    """
+    Decodes the `data` by the codec from its tag, JSON when there is no tag.
+    """
+    if isinstance(data, str):
+        return _json.decode(data.encode("utf-8"))
+
+    if not data.startswith(_TAG_MARK):
+        return _json.decode(data)
+
+    end = data.index(_TAG_END)
+    name = data[len(_TAG_MARK) : end].decode("ascii")
+    codec = _codecs.get(name)
+    if codec is None:
+        if name not in _codec_types:
+            raise ValueError(f"Unknown codec `{name}`.")
+        codec = _codecs[name] = _codec_types[name]()
+
+    return codec.decode(data[end + len(_TAG_END) :])
@@ -1,20 +1,43 @@
+from contextlib import contextmanager
 import os
 import shelve
-from pydantic import Field
+from pydantic import Field, PositiveFloat
 import shutil
-from typing import Any
+import threading
+import time
+from typing import Any, Iterator, Optional, Tuple
 
 from ..memo_brokers.memo_broker import MemoBroker
 from ..log import logger
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 # Use https://docs.python.org/3/library/shelve.html
 class ShelveMemoBroker(MemoBroker):
+    """
+    By default opens the shelf for each operation.
+
+    With `persistent` keeps one open shelf per process and syncs it
+    every `sync_interval` seconds. Use it when only one process works with
+    the storage: the dbm modules cache an index or lock the file per handle.
+
+    With `interprocess_lock` each operation takes an exclusive lock on
+    the file `{storage}.lock`, so several workers can share the path.
+    The shelf is reopened for each operation then, even if `persistent`.
+    """
+
     def __init__(
         self,
         path_prefix: str,
         filename: str = "storage",
         clear: bool = False,
+        persistent: bool = False,
+        sync_interval: PositiveFloat = 1.0,
+        interprocess_lock: bool = False,
     ):
         assert path_prefix
         assert filename
@@ -23,6 +46,27 @@ class ShelveMemoBroker(MemoBroker):
 
         self.path_prefix = path_prefix
         self.filename = filename
+        self.persistent = persistent and not interprocess_lock
+        self.sync_interval = sync_interval
+        self.interprocess_lock = interprocess_lock
+
+        self._lock = threading.Lock()
+        self._shelf: Optional[shelve.Shelf] = None
+        self._dirty = False
+        self._closed = threading.Event()
+        self._syncer: Optional[threading.Thread] = None
+
+        if persistent and interprocess_lock:
+            logger.warning(
+                f"`{self.name}`: the shelf is reopened for each operation"
+                " because of the interprocess lock."
+            )
+
+        if interprocess_lock and fcntl is None:
+            logger.warning(
+                f"`{self.name}`: the interprocess lock isn't supported"
+                " on this platform, use the lock between threads only."
+            )
 
         if clear and os.path.exists(self.path_prefix):
             logger.info(f"🔥 Purging the storage `{self}`...")
@@ -45,17 +89,105 @@ class ShelveMemoBroker(MemoBroker):
         description="The filename of storage.",
     )
 
+    persistent: bool = Field(
+        default=False,
+        title="Persistent",
+        description="Keep one open shelf per process.",
+    )
+
+    sync_interval: PositiveFloat = Field(
+        default=1.0,
+        title="Sync Interval",
+        description="How often the persistent shelf is synced to disk, in seconds.",
+    )
+
+    interprocess_lock: bool = Field(
+        default=False,
+        title="Interprocess Lock",
+        description="Lock the storage file for each operation, so several processes can share it.",
+    )
+
     @property
     def storage(self):
         return os.path.join(self.path_prefix, self.filename)
 
+    # `shelve` doesn't support concurrent access, and `aget` / `aput` run
+    # the methods below from different threads
     def get(self, key: str) -> Any:
-        with shelve.open(self.storage) as s:
+        with self._open() as s:
             return s[key]
 
     def put(self, key: str, value: Any):
-        with shelve.open(self.storage) as s:
+        with self._open() as s:
             s[key] = value
+            self._dirty = True
+
+    def delete(self, key: str):
+        with self._open() as s:
+            del s[key]
+            self._dirty = True
+
+    # The shelf doesn't know when a key was created and how large it is.
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        now = time.time()
+        with self._open() as s:
+            keys = list(s.keys())
+
+        return ((key, now, 0) for key in keys)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+                self._dirty = False
+                logger.info(f"🏁 Closed the storage `{self}`.")
+
+    @contextmanager
+    def _open(self) -> Iterator[shelve.Shelf]:
+        with self._lock, self._lock_file():
+            if not self.persistent:
+                with shelve.open(self.storage) as s:
+                    yield s
+                return
+
+            if self._shelf is None:
+                self._shelf = shelve.open(self.storage)
+                self._closed.clear()
+                self._start_syncer()
+            yield self._shelf
+
+    @contextmanager
+    def _lock_file(self) -> Iterator[None]:
+        if not self.interprocess_lock or fcntl is None:
+            yield
+            return
+
+        with open(f"{self.storage}.lock", "a") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _start_syncer(self):
+        if self._syncer is not None and self._syncer.is_alive():
+            return
+
+        self._syncer = threading.Thread(
+            target=self._sync_periodically,
+            name=f"{self.name}-sync",
+            daemon=True,
+        )
+        self._syncer.start()
+
+    def _sync_periodically(self):
+        while not self._closed.wait(self.sync_interval):
+            with self._lock:
+                if self._shelf is not None and self._dirty:
+                    self._shelf.sync()
+                    self._dirty = False
 
     def __str__(self):
         return f"{self.name} : {self.storage}"
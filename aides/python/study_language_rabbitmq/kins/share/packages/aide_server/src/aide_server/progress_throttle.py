@@ -0,0 +1,144 @@
+import asyncio
+from collections import OrderedDict
+from pydantic import BaseModel, Field, NonNegativeFloat, PositiveInt
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+from .task_progress_result import Task
+
+
+class ActProgress(BaseModel):
+    """
+    How often the progress of act is published, see `Act.progress`.
+    """
+
+    min_delta: NonNegativeFloat = Field(
+        default=1.0,
+        title="Min Delta",
+        description="A smaller change of progress isn't published, in percents.",
+    )
+
+    min_interval: NonNegativeFloat = Field(
+        default=0.25,
+        title="Min Interval",
+        description="A progress isn't published more often, in seconds.",
+    )
+
+
+class ProgressThrottle:
+    """
+    Drops the progresses of task changed less than `min_delta` or arrived
+    sooner than `min_interval` after the published one. The latest dropped
+    progress with enough delta is published when the interval passes, so
+    a slow stage doesn't hide it. 0 and 100 are always published.
+    """
+
+    def __init__(
+        self,
+        acts: List[Any],
+        publish: Callable[[Task, float], Awaitable[Any]],
+        max_tasks: PositiveInt = 10000,
+    ):
+        self.name = type(self).__name__
+        self.publish = publish
+        self.max_tasks = max_tasks
+
+        self._settings: Dict[str, ActProgress] = {
+            act.hid: act.progress for act in acts if act.progress
+        }
+        self._default = ActProgress()
+
+        # uid_task: (progress, published_at)
+        self._published: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        # uid_task: (task, progress, timer)
+        self._pending: Dict[str, Tuple[Task, float, asyncio.TimerHandle]] = {}
+        # keep the references, see `asyncio.create_task()`, named by uid_task
+        self._flushing: Set[asyncio.Task] = set()
+
+    name: str = Field(
+        ...,
+        title="Name",
+        description="The name of throttle. Set by class.",
+    )
+
+    max_tasks: PositiveInt = Field(
+        default=10000,
+        title="Max Tasks",
+        description="The count of tasks which published progresses are remembered.",
+    )
+
+    # Returns `True` when the progress is published right away.
+    async def progress(self, task: Task, progress: float) -> bool:
+        settings = self._settings.get(task.hid_act, self._default)
+        now = time.monotonic()
+        published = self._published.get(task.uid)
+
+        if progress <= 0 or progress >= 100 or published is None:
+            await self._publish(task, progress, now)
+            return True
+
+        value, published_at = published
+        if progress - value < settings.min_delta:
+            return False
+
+        elapsed = now - published_at
+        if elapsed >= settings.min_interval:
+            await self._publish(task, progress, now)
+            return True
+
+        self._defer(task, progress, delay=settings.min_interval - elapsed)
+
+        return False
+
+    def forget(self, uid_task: str):
+        self._published.pop(uid_task, None)
+        pending = self._pending.pop(uid_task, None)
+        if pending is not None:
+            pending[2].cancel()
+
+        # a flushed progress mustn't follow the result
+        for flushing in self._flushing:
+            if flushing.get_name() == uid_task:
+                flushing.cancel()
+
+    async def _publish(self, task: Task, progress: float, now: float):
+        pending = self._pending.pop(task.uid, None)
+        if pending is not None:
+            pending[2].cancel()
+
+        if progress >= 100:
+            # the task is done
+            self._published.pop(task.uid, None)
+        else:
+            self._published[task.uid] = (progress, now)
+            self._published.move_to_end(task.uid)
+            while len(self._published) > self.max_tasks:
+                self._published.popitem(last=False)
+
+        await self.publish(task, progress)
+
+    def _defer(self, task: Task, progress: float, delay: float):
+        pending = self._pending.get(task.uid)
+        if pending is not None:
+            # the timer is already set, publish the latest progress
+            self._pending[task.uid] = (task, progress, pending[2])
+            return
+
+        timer = asyncio.get_running_loop().call_later(delay, self._flush, task.uid)
+        self._pending[task.uid] = (task, progress, timer)
+
+    def _flush(self, uid_task: str):
+        pending = self._pending.pop(uid_task, None)
+        if pending is None or uid_task not in self._published:
+            return
+
+        task, progress, _ = pending
+        flushing = asyncio.get_running_loop().create_task(
+            self._publish(task, progress, time.monotonic()),
+            name=uid_task,
+        )
+        self._flushing.add(flushing)
+        flushing.add_done_callback(self._flushing.discard)
+
+    def __str__(self):
+        return self.name
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import FileResponse
 
+from .etag import RenderedResponses
+
 from ..configure import Configure
 
 
@@ -17,21 +19,40 @@ def add_routes(
             "sidename": sidename,
         }
 
+    # the configure doesn't change after startup: render once per language
+    rendered = RenderedResponses()
+    langs = _langs(configure)
+
     @router.get("/acts", include_in_schema=False)
-    def acts():
-        return acts_lang("en")
+    def acts(request: Request):
+        return acts_lang(request, "en")
 
     @router.get("/acts/{lang}", include_in_schema=False)
-    def acts_lang(lang: str):
-        return [act.unwrapped_multilang_texts(lang) for act in configure.acts]
+    def acts_lang(request: Request, lang: str):
+        # unknown language falls back to English
+        lang = lang if lang in langs else "en"
+        return rendered.respond(
+            request,
+            key=("acts", lang),
+            render=lambda: [
+                act.unwrapped_multilang_texts(lang) for act in configure.acts
+            ],
+        )
 
     @router.get("/brief-acts", include_in_schema=False)
-    def brief_acts():
-        return brief_acts_lang("en")
+    def brief_acts(request: Request):
+        return brief_acts_lang(request, "en")
 
     @router.get("/brief-acts/{lang}", include_in_schema=False)
-    def brief_acts_lang(lang: str):
-        return [act.brief_unwrapped_multilang_texts(lang) for act in configure.acts]
+    def brief_acts_lang(request: Request, lang: str):
+        lang = lang if lang in langs else "en"
+        return rendered.respond(
+            request,
+            key=("brief-acts", lang),
+            render=lambda: [
+                act.brief_unwrapped_multilang_texts(lang) for act in configure.acts
+            ],
+        )
 
     if configure.path_to_face:
 
@@ -40,6 +61,16 @@ def add_routes(
             return FileResponse(configure.path_to_face)
 
 
+def _langs(configure: Configure):
+    r = {"en"}
+    for act in configure.acts:
+        r.update(act.name, act.summary, act.description)
+        for tag in act.tags:
+            r.update(tag)
+
+    return r
+
+
 # You can declare any public info about Aide.
 # For example, how to declare an image of aide's place that
 # accesed from `http://127.0.0.1:8000/place`:
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
-from typing import Any, List
+from typing import Any, List, Optional
 
 from .side import Side
 from .type_side import TypeSide
 
 from ..act import Act
+from ..claim_check import ClaimCheck
 from ..inner_memo import InnerMemo, NoneInnerMemo
 from ..log import logger
 from ..savant_router import SavantRouter
@@ -18,6 +19,7 @@ class KeeperSide(Side):
         savant_router: SavantRouter,
         acts: List[Act],
         inner_memo: InnerMemo,
+        claim_check: Optional[ClaimCheck] = None,
     ):
         assert not isinstance(
             self.inner_memo, NoneInnerMemo
@@ -28,6 +30,7 @@ class KeeperSide(Side):
             savant_router=savant_router,
             acts=acts,
             inner_memo=inner_memo,
+            claim_check=claim_check,
         )
 
         self._register_catchers_for_acts()
@@ -57,7 +60,7 @@ class KeeperSide(Side):
             if isinstance(progress, dict):
                 progress = Progress.model_validate(progress)
             key = f"{progress.uid_task}.progress"
-            self.inner_memo.put(key, progress.value)
+            await self.inner_memo.aput(key, progress.value)
 
         n += 1
 
@@ -70,8 +73,13 @@ class KeeperSide(Side):
             logger.info(f"Catched a result `{result}`.")
             if isinstance(result, dict):
                 result = Result.model_validate(result)
+            if result.value_ref is not None:
+                # the Keeper doesn't need the value, keep the ref only
+                key = f"{result.uid_task}.result_ref"
+                await self.inner_memo.aput(key, result.value_ref)
+                return
             key = f"{result.uid_task}.result"
-            self.inner_memo.put(key, result.value)
+            await self.inner_memo.aput(key, result.value)
 
         n += 1
 
@@ -82,7 +90,7 @@ class KeeperSide(Side):
         async def request_progress_catcher(uid_task: str):
             logger.info(f"Catched a request progress for task `{uid_task}`.")
             key = f"{uid_task}.progress"
-            value = self.inner_memo.get(key)
+            value = await self.inner_memo.aget(key)
             await self._publish_response_progress(uid_task, value=float(value))
 
         n += 1
@@ -94,7 +102,14 @@ class KeeperSide(Side):
         async def request_result_catcher(uid_task: str):
             logger.info(f"Catched a request result for task `{uid_task}`.")
             key = f"{uid_task}.result"
-            value = self.inner_memo.get(key)
+            key_ref = f"{uid_task}.result_ref"
+            found = await self.inner_memo.aget_many([key_ref])
+            if key_ref in found:
+                await self._publish_response_result(
+                    uid_task, value=None, value_ref=found[key_ref]
+                )
+                return
+            value = await self.inner_memo.aget(key)
             await self._publish_response_result(uid_task, value=value)
 
         logger.info(f"🪶 Registered {n} catchers for act `{act.hid}`.")
@@ -117,7 +132,12 @@ class KeeperSide(Side):
         return True
 
     # catcher: Appearance
-    async def _publish_response_result(self, uid_task: str, value: Any):
+    async def _publish_response_result(
+        self,
+        uid_task: str,
+        value: Any,
+        value_ref: Optional[str] = None,
+    ):
         queue = self.savant_router.responseResultQueue(
             pusher_side=TypeSide.KEEPER,
             catcher_side=TypeSide.APPEARANCE,
@@ -127,7 +147,7 @@ class KeeperSide(Side):
             f" queue `{queue.name}`."
         )
         await self.push(
-            Result(uid_task=uid_task, value=value),
+            Result(uid_task=uid_task, value=value, value_ref=value_ref),
             queue=queue,
         )
 
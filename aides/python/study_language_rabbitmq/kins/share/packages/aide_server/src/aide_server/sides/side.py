@@ -1,17 +1,20 @@
 from abc import ABC
 import aio_pika
+import asyncio
 from fastapi import APIRouter
 from faststream.broker.types import P_HandlerParams, T_HandlerReturn
 from faststream.broker.wrapper import HandlerCallWrapper
 from faststream.rabbit import RabbitQueue
 from pydantic import BaseModel, Field
-from typing import Any, Callable, Dict, List, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 from .type_side import TypeSide
 
 from ..act import Act
+from ..claim_check import ClaimCheck
 from ..inner_memo import InnerMemo, NoneInnerMemo
 from ..savant_router import SavantRouter
+from ..task_progress_result import Result
 
 
 CatcherReturn = Callable[
@@ -32,6 +35,7 @@ class Side(ABC):
         savant_router: SavantRouter,
         acts: List[Act],
         inner_memo: InnerMemo,
+        claim_check: Optional[ClaimCheck] = None,
     ):
         name = type(self).__name__.replace("Side", "").upper()
         self.type = TypeSide[name]
@@ -40,6 +44,7 @@ class Side(ABC):
         self.savant_router = savant_router
         self.acts = acts
         self.inner_memo = inner_memo
+        self.claim_check = claim_check
 
     type: TypeSide = Field(
         ...,
@@ -71,11 +76,24 @@ class Side(ABC):
         description="The inner memory.",
     )
 
+    claim_check: Optional[ClaimCheck] = Field(
+        default=None,
+        title="Claim Check",
+        description="Moves the big values of pushed results to the blob store.",
+    )
+
+    # Called when the server shuts down.
+    async def aclose(self) -> None:
+        pass
+
     async def push(
         self,
         message: Union[BaseModel, Dict[str, Any], str],
         queue: Union[str, RabbitQueue],
     ):
+        if isinstance(message, Result):
+            message = await self.check_in(message)
+
         return await self.savant_router.broker.publish(
             message,
             queue=queue,
@@ -84,17 +102,55 @@ class Side(ABC):
             timeout=6,
         )
 
+    # The messages are published at once and share the round trips
+    # of the channel, the order of delivery isn't guaranteed.
+    async def push_many(
+        self,
+        messages: Sequence[Union[BaseModel, Dict[str, Any], str]],
+        queue: Union[str, RabbitQueue],
+    ):
+        return await asyncio.gather(
+            *(self.push(message, queue=queue) for message in messages)
+        )
+
+    async def check_in(self, result: Result) -> Result:
+        if self.claim_check is None:
+            return result
+        return await self.claim_check.check_in(result)
+
+    # Takes back the value moved to the blob store by other side.
+    async def check_out(self, result: Result) -> Result:
+        if result.value_ref is None:
+            return result
+        if self.claim_check is None:
+            raise KeyError(result.value_ref)
+        return await self.claim_check.check_out(result)
+
     def taskCatcher(
         self,
         hid_act: str,
         pusher_side: TypeSide,
         catcher_side: TypeSide,
+        prefetch: Optional[int] = None,
     ) -> CatcherReturn:
         return self.catcher(
             self.savant_router.taskQueue(
                 hid_act,
                 pusher_side=pusher_side,
                 catcher_side=catcher_side,
+            ),
+            prefetch=prefetch,
+        )
+
+    def droppedTaskCatcher(
+        self,
+        hid_act: str,
+        catcher_side: TypeSide,
+    ) -> CatcherReturn:
+        return self.catcher(
+            self.savant_router.droppedTaskQueue(
+                hid_act,
+                catcher_side=catcher_side,
             )
         )
 
@@ -174,18 +230,28 @@ class Side(ABC):
             )
         )
 
-    def catcher(self, queue: Union[str, RabbitQueue]) -> CatcherReturn:
+    def catcher(
+        self,
+        queue: Union[str, RabbitQueue],
+        prefetch: Optional[int] = None,
+    ) -> CatcherReturn:
         """
         Decorator to define a message catcher (a subscriber in the FastAPI terminology).
 
         Args:
             queue (Union[str, RabbitQueue]): The name of the RabbitMQ queue.
-            exchange (Union[str, RabbitExchange, None], optional): The name of the RabbitMQ exchange.
+            prefetch (Optional[int], optional): The limit of unacked messages for the catcher.
 
         Returns:
             Callable: A decorator function for defining message catcher.
         """
-        return self.savant_router.broker.subscriber(
+        broker = (
+            self.savant_router.prefetchBroker(prefetch)
+            if prefetch
+            else self.savant_router.broker
+        )
+
+        return broker.subscriber(
             queue=queue,
             exchange=self.savant_router.exchange(),
         )
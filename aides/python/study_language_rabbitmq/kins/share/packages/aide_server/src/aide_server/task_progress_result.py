@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, NonNegativeFloat
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class Task(BaseModel):
@@ -21,8 +21,14 @@ class Task(BaseModel):
         description="Context as key-value of act aide. Can be declared as concrete class for acts.",
     )
 
+    context_ref: Optional[str] = Field(
+        default=None,
+        title="Context Ref",
+        description="Hash of context stored in `ContextSnapshots`. The task carries it instead of `context`.",
+    )
+
     def __str__(self):
-        return f"{self.uid} : {self.hid_act} : {self.context}"
+        return f"{self.uid} : {self.hid_act} : {self.context_ref or self.context}"
 
 
 class Progress(BaseModel):
@@ -55,5 +61,11 @@ class Result(BaseModel):
         description="Result of task.",
     )
 
+    value_ref: Optional[str] = Field(
+        default=None,
+        title="Value Ref",
+        description="Ref of value moved to the blob store by `ClaimCheck`. The result carries it instead of `value`.",
+    )
+
     def __str__(self):
-        return f"{self.uid_task} : {self.value}"
+        return f"{self.uid_task} : {self.value_ref or self.value}"
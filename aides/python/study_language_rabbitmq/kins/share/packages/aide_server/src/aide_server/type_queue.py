@@ -9,4 +9,5 @@ class TypeQueue(Enum):
     RESPONSE_RESULT = 5
     PROGRESS = 6
     RESULT = 7
+    DROPPED_TASK = 8
     LOG = 12
@@ -0,0 +1,96 @@
+from faststream.rabbit import RabbitQueue
+from types import SimpleNamespace
+import unittest
+
+from ..src.aide_server.admission import ActAdmission, QueueDepths
+
+
+# Answers the passive declares with `depth` and counts them.
+class _Broker:
+    def __init__(self):
+        self.depth = (0, 0)
+        self.declares = 0
+        self.fails = False
+        self.closed_channels = 0
+
+    async def connect(self):
+        return self
+
+    async def channel(self, publisher_confirms: bool):
+        broker = self
+        channel = SimpleNamespace(is_closed=False)
+
+        async def declare_queue(name: str, passive: bool):
+            assert passive
+            broker.declares += 1
+            if broker.fails:
+                raise Exception("NOT_FOUND")
+            messages, consumers = broker.depth
+            return SimpleNamespace(
+                declaration_result=SimpleNamespace(
+                    message_count=messages,
+                    consumer_count=consumers,
+                )
+            )
+
+        async def close():
+            channel.is_closed = True
+            broker.closed_channels += 1
+
+        channel.declare_queue = declare_queue
+        channel.close = close
+
+        return channel
+
+
+class TestActAdmission(unittest.TestCase):
+    def test_room(self):
+        admission = ActAdmission(max_depth=10, max_depth_per_consumer=3)
+
+        self.assertEqual(3, admission.room(messages=0, consumers=0))
+        self.assertEqual(4, admission.room(messages=2, consumers=2))
+        self.assertEqual(-5, admission.room(messages=15, consumers=10))
+        self.assertEqual(float("inf"), ActAdmission().room(100, 0))
+
+    def test_queue_arguments(self):
+        self.assertIsNone(ActAdmission().queue_arguments("dlx", "dropped"))
+
+        arguments = ActAdmission(max_length=5).queue_arguments("dlx", "dropped")
+        self.assertEqual({"x-max-length": 5, "x-overflow": "reject-publish"}, arguments)
+
+        admission = ActAdmission(max_length=5, overflow="drop-head")
+        self.assertTrue(admission.drops_tasks)
+        arguments = admission.queue_arguments("dlx", "dropped")
+        self.assertEqual("dlx", arguments["x-dead-letter-exchange"])
+        self.assertEqual("dropped", arguments["x-dead-letter-routing-key"])
+
+
+class TestQueueDepths(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.broker = _Broker()
+        self.depths = QueueDepths(self.broker, interval=60)
+        self.queue = RabbitQueue("tasks")
+
+    async def asyncTearDown(self):
+        await self.depths.aclose()
+
+    async def test_depth_is_cached(self):
+        self.broker.depth = (7, 2)
+
+        self.assertEqual((7, 2), await self.depths.depth(self.queue))
+        self.broker.depth = (8, 2)
+        self.assertEqual((7, 2), await self.depths.depth(self.queue))
+        self.assertEqual(1, self.broker.declares)
+
+    async def test_failed_declare_is_unknown_depth(self):
+        self.broker.fails = True
+
+        self.assertIsNone(await self.depths.depth(self.queue))
+        self.assertEqual(1, self.broker.closed_channels)
+
+        self.broker.fails = False
+        self.assertEqual((0, 0), await self.depths.depth(self.queue))
+
+
+if __name__ == "__main__":
+    unittest.main()
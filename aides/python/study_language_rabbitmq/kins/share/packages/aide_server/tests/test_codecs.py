@@ -0,0 +1,66 @@
+import unittest
+
+from ..src.aide_server.memo_brokers.codecs import (
+    JsonCodec,
+    MsgpackCodec,
+    OrjsonCodec,
+    RawCodec,
+    msgpack,
+    orjson,
+    unpack,
+)
+
+
+VALUE = {
+    "text": "Abs, you ready? — Так.",
+    "count": 42,
+    "ratio": 0.5,
+    "done": True,
+    "missing": None,
+    "items": [1, "two", {"three": 3}],
+}
+
+
+class TestCodecs(unittest.TestCase):
+    def test_json_round_trip(self):
+        codec = JsonCodec()
+        data = codec.pack(VALUE)
+
+        self.assertFalse(data.startswith(b"\0"))
+        self.assertEqual(VALUE, unpack(data))
+
+    @unittest.skipIf(orjson is None, "`orjson` isn't installed")
+    def test_orjson_round_trip(self):
+        codec = OrjsonCodec()
+        data = codec.pack(VALUE)
+
+        self.assertEqual(VALUE, unpack(data))
+        # the plain JSON is readable by other JSON codec
+        self.assertEqual(VALUE, JsonCodec().decode(data))
+
+    @unittest.skipIf(msgpack is None, "`msgpack` isn't installed")
+    def test_msgpack_round_trip(self):
+        codec = MsgpackCodec()
+        data = codec.pack(VALUE)
+
+        self.assertTrue(data.startswith(b"\0msgpack\n"))
+        self.assertEqual(VALUE, unpack(data))
+
+    def test_raw_round_trip(self):
+        codec = RawCodec()
+        value = b"\0\n\xff binary"
+
+        self.assertEqual(value, unpack(codec.pack(value)))
+        with self.assertRaises(TypeError):
+            codec.pack("text")
+
+    def test_unpack_old_text(self):
+        self.assertEqual(VALUE, unpack(JsonCodec().encode(VALUE).decode("utf-8")))
+
+    def test_unpack_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            unpack(b"\0unknown\n...")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from ..src.aide_server.inner_memo import InnerMemo
+from ..src.aide_server.memo_brokers.cached import CachedMemoBroker
+from ..src.aide_server.memo_brokers.filesystem import FilesystemMemoBroker
+
+
+class TestFilesystemMemoBroker(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = self.temp.name
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_reshard_moves_flat_files(self):
+        flat = FilesystemMemoBroker(self.path)
+        for i in range(10):
+            flat.put(f"key{i}", {"value": i})
+
+        broker = FilesystemMemoBroker(self.path, shard_levels=2)
+        # the flat files are readable before resharding
+        self.assertEqual({"value": 3}, broker.get("key3"))
+
+        self.assertEqual(10, broker.reshard())
+        for i in range(10):
+            self.assertTrue(os.path.exists(broker.path(f"key{i}")))
+            self.assertFalse(os.path.exists(broker.flat_path(f"key{i}")))
+            self.assertEqual({"value": i}, broker.get(f"key{i}"))
+
+        self.assertEqual(0, broker.reshard())
+
+    def test_reshard_keeps_newer_value(self):
+        FilesystemMemoBroker(self.path).put("key", "old")
+
+        broker = FilesystemMemoBroker(self.path, shard_levels=2)
+        broker.put("key", "new")
+        broker.reshard()
+
+        self.assertEqual("new", broker.get("key"))
+        self.assertFalse(os.path.exists(broker.flat_path("key")))
+
+    def test_start_reshards_through_wrappers(self):
+        flat = FilesystemMemoBroker(self.path)
+        for i in range(3):
+            flat.put(f"key{i}", i)
+
+        broker = FilesystemMemoBroker(self.path, shard_levels=2)
+        memo = InnerMemo(CachedMemoBroker(broker))
+
+        async def run():
+            await memo.astart()
+            await memo.aclose()
+
+        asyncio.run(run())
+
+        for i in range(3):
+            self.assertTrue(os.path.exists(broker.path(f"key{i}")))
+            self.assertFalse(os.path.exists(broker.flat_path(f"key{i}")))
+
+    def test_delete_flat_and_sharded(self):
+        FilesystemMemoBroker(self.path).put("key", "old")
+
+        broker = FilesystemMemoBroker(self.path, shard_levels=2)
+        broker.put("key", "new")
+        broker.delete("key")
+
+        with self.assertRaises(KeyError):
+            broker.get("key")
+        with self.assertRaises(KeyError):
+            broker.delete("key")
+
+
+if __name__ == "__main__":
+    unittest.main()
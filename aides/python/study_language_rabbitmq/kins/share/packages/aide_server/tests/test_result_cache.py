@@ -0,0 +1,44 @@
+import time
+import unittest
+
+from ..src.aide_server.result_cache import ActCache, ResultCache, result_key
+
+
+class TestResultCache(unittest.TestCase):
+    def test_key_ignores_order_of_context(self):
+        self.assertEqual(
+            result_key("act", "1", {"a": 1, "b": 2}),
+            result_key("act", "1", {"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(
+            result_key("act", "1", {"a": 1}),
+            result_key("act", "2", {"a": 1}),
+        )
+
+    def test_ttl(self):
+        cache = ResultCache()
+        cache.put("key", "uid", "done", ActCache(ttl=0.01))
+
+        self.assertEqual("uid", cache.get("key"))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(0, cache.stats["bytes"])
+
+    def test_big_result_is_not_cached(self):
+        cache = ResultCache()
+        cache.put("key", "uid", "x" * 100, ActCache(max_result_bytes=10))
+
+        self.assertIsNone(cache.get("key"))
+
+    def test_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, f"uid_{key}", "done", ActCache())
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual("uid_c", cache.get("c"))
+        self.assertEqual(2, cache.stats["entries"])
+
+
+if __name__ == "__main__":
+    unittest.main()
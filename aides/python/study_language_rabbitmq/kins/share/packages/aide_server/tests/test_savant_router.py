@@ -0,0 +1,138 @@
+from fastapi import APIRouter
+from faststream.rabbit import RabbitExchange, RabbitQueue
+from types import SimpleNamespace
+from typing import List, Tuple
+import unittest
+
+from ..src.aide_server.act import Act
+from ..src.aide_server.savant_router import SavantRouter
+from ..src.aide_server.sides.brain_side import BrainSide
+from ..src.aide_server.sides.type_side import TypeSide
+from ..src.aide_server.task_progress_result import Progress, Result, Task
+
+
+def _act(hid: str) -> Act:
+    return Act(
+        hid=hid,
+        name={"en": hid},
+        summary={"en": hid},
+        description={"en": hid},
+        tags=[],
+    )
+
+
+# Records the declared queues and their bindings.
+class _Broker:
+    def __init__(self):
+        self.declared: List[str] = []
+        # (queue, exchange, routing key)
+        self.bindings: List[Tuple[str, str, str]] = []
+
+    async def declare_exchange(self, exchange: RabbitExchange):
+        return SimpleNamespace(name=exchange.name)
+
+    async def declare_queue(self, queue: RabbitQueue):
+        broker = self
+        broker.declared.append(queue.name)
+
+        async def bind(exchange, routing_key: str):
+            broker.bindings.append((queue.name, exchange.name, routing_key))
+
+        return SimpleNamespace(bind=bind)
+
+
+class TestRoutingKeys(unittest.TestCase):
+    def setUp(self):
+        self.router = SavantRouter("amqp://localhost", "test", "brain", [_act("act")])
+
+    def test_catchers_share_key_of_pusher(self):
+        for queue, key in (
+            (self.router.progressQueue, self.router.progressKey),
+            (self.router.resultQueue, self.router.resultKey),
+        ):
+            keeper = queue(
+                "act",
+                pusher_side=TypeSide.BRAIN,
+                catcher_side=TypeSide.KEEPER,
+            )
+            appearance = queue(
+                "act",
+                pusher_side=TypeSide.BRAIN,
+                catcher_side=TypeSide.APPEARANCE,
+            )
+
+            self.assertNotEqual(keeper.name, appearance.name)
+            self.assertEqual(keeper.routing_key, appearance.routing_key)
+            self.assertEqual(
+                key("act", pusher_side=TypeSide.BRAIN), keeper.routing_key
+            )
+
+        self.assertEqual(
+            "progress.act.brain.test",
+            self.router.progressKey("act", pusher_side=TypeSide.BRAIN),
+        )
+
+    def test_task_queue_isnt_fanned_out(self):
+        queue = self.router.taskQueue(
+            "act",
+            pusher_side=TypeSide.APPEARANCE,
+            catcher_side=TypeSide.BRAIN,
+        )
+
+        self.assertEqual("", queue.routing_key)
+
+
+class TestDeclareQueues(unittest.IsolatedAsyncioTestCase):
+    async def test_fan_out_queues_are_bound(self):
+        router = SavantRouter("amqp://localhost", "test", "brain", [_act("act")])
+        broker = _Broker()
+        router.broker = broker  # type: ignore[assignment]
+
+        await router.declare_acts_queues()
+
+        self.assertIn("task.act.appearance.brain.test", broker.declared)
+        self.assertEqual(
+            [
+                ("progress.act.brain.keeper.test", "aide", "progress.act.brain.test"),
+                (
+                    "progress.act.brain.appearance.test",
+                    "aide",
+                    "progress.act.brain.test",
+                ),
+                ("result.act.brain.keeper.test", "aide", "result.act.brain.test"),
+                ("result.act.brain.appearance.test", "aide", "result.act.brain.test"),
+            ],
+            broker.bindings,
+        )
+
+
+class TestBrainFanOut(unittest.IsolatedAsyncioTestCase):
+    async def test_progress_and_result_are_published_once(self):
+        async def act(task, publish_progress, publish_result):
+            await publish_progress(task, 50)
+            await publish_result(task, {"raw_result": "done"})
+
+        acts = [_act("act")]
+        router = SavantRouter("amqp://localhost", "test", "brain", acts)
+        brain = BrainSide(APIRouter(), router, acts, [act])
+
+        pushed = []
+
+        async def push(message, queue):
+            pushed.append((type(message), queue))
+
+        brain.push = push  # type: ignore[method-assign]
+
+        await brain._run_task(Task(uid="task", hid_act="act", context={}))
+
+        progress_key = router.progressKey("act", pusher_side=TypeSide.BRAIN)
+        result_key = router.resultKey("act", pusher_side=TypeSide.BRAIN)
+        self.assertEqual([(Result, result_key)], [p for p in pushed if p[0] is Result])
+        self.assertTrue(pushed)
+        for message_type, queue in pushed:
+            if message_type is Progress:
+                self.assertEqual(progress_key, queue)
+
+
+if __name__ == "__main__":
+    unittest.main()
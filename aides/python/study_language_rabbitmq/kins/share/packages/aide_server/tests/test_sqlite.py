@@ -0,0 +1,64 @@
+import asyncio
+import sqlite3
+import tempfile
+import unittest
+
+from ..src.aide_server.memo_brokers.sqlite import SqliteMemoBroker
+
+
+class TestSqliteMemoBroker(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.broker = SqliteMemoBroker(self.temp.name, pool_size=2)
+
+    def tearDown(self):
+        self.broker.close()
+        self.temp.cleanup()
+
+    def test_put_get_delete(self):
+        self.broker.put("a", {"value": 1})
+        self.broker.put("a", {"value": 2})
+
+        self.assertEqual({"value": 2}, self.broker.get("a"))
+        self.broker.delete("a")
+        with self.assertRaises(KeyError):
+            self.broker.get("a")
+        with self.assertRaises(KeyError):
+            self.broker.delete("a")
+
+    def test_many_keys(self):
+        values = {f"key{i}": i for i in range(2500)}
+        self.broker.put_many(values)
+
+        keys = list(values) + ["absent"]
+        self.assertEqual(values, self.broker.get_many(keys))
+        self.assertEqual({}, self.broker.get_many([]))
+
+    def test_scan(self):
+        self.broker.put_many({"a": "x", "b": "yy"})
+
+        entries = {key: size for key, _, size in self.broker.scan()}
+        self.assertEqual(["a", "b"], sorted(entries))
+        self.assertLess(entries["a"], entries["b"])
+
+    def test_read_old_text_value(self):
+        with sqlite3.connect(self.broker.storage) as connection:
+            connection.execute(
+                "INSERT INTO memo VALUES (?, ?, ?, ?)",
+                ("old", '{"value": 1}', 0.0, 0.0),
+            )
+
+        self.assertEqual({"value": 1}, self.broker.get("old"))
+
+    def test_closed_broker_raises(self):
+        self.broker.put("a", 1)
+        self.broker.close()
+
+        with self.assertRaises(Exception):
+            self.broker.get("a")
+        with self.assertRaises(Exception):
+            asyncio.run(self.broker.aput("a", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+from fastapi import WebSocketDisconnect
+from typing import Any, List
+import unittest
+
+from ..src.aide_server.sides.task_events import TaskEvents
+from ..src.aide_server.sides.task_socket import TaskSocket
+from ..src.aide_server.task_progress_result import Progress, Result
+
+
+# Receives the messages put into `received`, `None` disconnects.
+class _WebSocket:
+    def __init__(self):
+        self.received: asyncio.Queue = asyncio.Queue()
+        self.sent: List[Any] = []
+        self.frame = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def receive_json(self) -> Any:
+        message = await self.received.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, data: Any):
+        self.sent.append(data)
+        self.frame.set()
+
+
+class TestTaskSocket(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.websocket = _WebSocket()
+        self.task_events = TaskEvents()
+        self.socket = TaskSocket(
+            self.websocket,  # type: ignore[arg-type]
+            task_events=self.task_events,
+            max_subscriptions=2,
+            batch_interval=0.01,
+        )
+        self.server = asyncio.create_task(self.socket.serve())
+
+    async def asyncTearDown(self):
+        await self.websocket.received.put(None)
+        await asyncio.wait_for(self.server, 1.0)
+
+        self.assertEqual(0, self.task_events.listeners_count)
+
+    async def _send(self, message: Any):
+        await self.websocket.received.put(message)
+        await asyncio.sleep(0)
+
+    async def _frame(self) -> Any:
+        await asyncio.wait_for(self.websocket.frame.wait(), 1.0)
+        self.websocket.frame.clear()
+        return self.websocket.sent.pop(0)
+
+    async def test_events_of_subscribed_tasks(self):
+        await self._send({"subscribe": ["a", "b"]})
+        self.task_events.publish(Progress(uid_task="a", value=10))
+        self.task_events.publish(Progress(uid_task="c", value=10))
+        self.task_events.publish(Result(uid_task="b", value="done"))
+
+        frame = await self._frame()
+        self.assertEqual(
+            [
+                {"type": "progress", "uid_task": "a", "value": 10.0},
+                {"type": "result", "uid_task": "b", "value": "done", "value_ref": None},
+            ],
+            frame["events"],
+        )
+        # a task is unsubscribed after its result
+        self.assertEqual({"a"}, self.socket._subscriptions)
+
+    async def test_latest_event_of_task_is_sent(self):
+        await self._send({"subscribe": ["a"]})
+        for value in (10, 20, 30):
+            self.task_events.publish(Progress(uid_task="a", value=value))
+        self.task_events.publish(Result(uid_task="a", value="done"))
+        self.task_events.publish(Progress(uid_task="a", value=90))
+
+        frame = await self._frame()
+        self.assertEqual(["result"], [event["type"] for event in frame["events"]])
+
+    async def test_last_event_is_replayed(self):
+        self.task_events.publish(Result(uid_task="a", value="done"))
+        await self._send({"subscribe": ["a"]})
+
+        frame = await self._frame()
+        self.assertEqual("done", frame["events"][0]["value"])
+
+    async def test_unsubscribe(self):
+        await self._send({"subscribe": ["a"]})
+        await self._send({"unsubscribe": ["a"]})
+
+        self.assertEqual(set(), self.socket._subscriptions)
+        self.assertEqual(0, self.task_events.listeners_count)
+
+    async def test_errors(self):
+        await self._send(["a"])
+        self.assertIn("error", await self._frame())
+
+        await self._send({"subscribe": "a"})
+        self.assertIn("error", await self._frame())
+
+        await self._send({"subscribe": ["a", "b", "c"]})
+        self.assertIn("error", await self._frame())
+        self.assertEqual(set(), self.socket._subscriptions)
+
+
+if __name__ == "__main__":
+    unittest.main()